@@ -11,29 +11,39 @@ from utils.config import (
     initial_rewards_duration_sec
 )
 
+# rpc_cassette, local_dao and the setup timing hooks
+pytest_plugins = ['tooling.pytest_plugin']
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_module_setup(module_isolation):
+    # module-scoped fixtures deploy after the reset and are reverted with it
+    pass
+
+
 @pytest.fixture(scope="function", autouse=True)
 def shared_setup(fn_isolation):
     pass
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def rewards_manager(ape, farming_rewards, ldo_token, rewards_initializer):
     rewards_manager_contract = RewardsManager.deploy(farming_rewards, rewards_initializer, {"from": ape})
     assert farming_rewards.addGift(ldo_token, initial_rewards_duration_sec, rewards_manager_contract, scale, {"from": ape})
     return rewards_manager_contract
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def mooniswap_factory(ape):
     return MooniswapFactoryGovernance.deploy(ZERO_ADDRESS, {"from": ape})
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def mooniswap(ape, mooniswap_factory):
     return Mooniswap.deploy(steth_token_address, dai_address, "stETH-DAI Liquidity Pool Token", "LP", mooniswap_factory, {"from": ape})
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def farming_rewards(ape, mooniswap, one_inch_token):
     farming_rewards_contract = FarmingRewards.deploy(mooniswap, one_inch_token, initial_rewards_duration_sec, ape, scale, {"from": ape})
     return farming_rewards_contract
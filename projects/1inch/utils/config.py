@@ -1,7 +1,5 @@
 import os
 import sys
-from brownie import network, accounts
-from brownie.convert.datatypes import Wei
 
 ldo_token_address = "0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32"
 dai_address = "0x6b175474e89094c44da98b954eedeac495271d0f"
@@ -16,22 +14,27 @@ mooniswap_address = "0xC1A900Ae76dB21dC5aa8E418Ac0F4E888A4C7431"
 
 gift_index = 1
 gas_price = "90 gwei"
-rewards_amount = Wei("200000 ether")
-scale = Wei("1000000000000000000")
+rewards_amount = 200_000 * 10 ** 18
+scale = 10 ** 18
 initial_rewards_duration_sec = 60 * 60 * 24 * 30 # one month
 
 
 def get_is_live():
+    from brownie import network
+
     return network.show_active() != "development"
 
 
 def get_deployer_account(is_live):
+    from brownie import accounts
+    from tooling.signing_agent import load_account
+
     if is_live and "DEPLOYER" not in os.environ:
         raise EnvironmentError(
             "Please set DEPLOYER env variable to the deployer account name"
         )
 
-    return accounts.load(os.environ["DEPLOYER"]) if is_live else accounts[0]
+    return load_account(os.environ["DEPLOYER"]) if is_live else accounts[0]
 
 
 def get_env(name, is_required=True, message=None, default=None):
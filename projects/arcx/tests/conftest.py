@@ -1,5 +1,26 @@
+import os
+import sys
+
 import pytest
 
+# arcx has no utils package putting the repo root on sys.path for `tooling`
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+# rpc_cassette, local_dao and the setup timing hooks
+pytest_plugins = ['tooling.pytest_plugin']
+
+
+@pytest.fixture(scope='module', autouse=True)
+def shared_module_setup(module_isolation):
+    # module-scoped fixtures deploy after the reset and are reverted with it
+    pass
+
+
+@pytest.fixture(scope='function', autouse=True)
+def shared_setup(fn_isolation):
+    pass
+
+
 @pytest.fixture(scope='module')
 def stranger(accounts):
     return accounts[0]
@@ -34,11 +55,11 @@ def staking_token(interface):
 def staking_token_whale(accounts):
     return accounts.at('0x890f4e345b1daed0367a877a1612f86a1f86985f', {'force': True})
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='module')
 def rewards_manager(RewardsManager, lido_rewards_manager_deployer):
     return RewardsManager.deploy({"from": lido_rewards_manager_deployer})
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='module')
 def joint_campaign(JointCampaignMock, arcx_deployer, rewards_manager, ldo_token_address, staking_token):
     contract = JointCampaignMock.deploy({"from": arcx_deployer})
     arc_dao_address = '0x1DEBBC50322150EB44DE3b663d5faA89c12b07ff'
@@ -2,7 +2,13 @@ import time
 import pytest
 from brownie import MerkleMock, chain, accounts
 from scripts.deploy import deploy_manager
-from utils.config import lido_dao_voting_address
+from utils.config import lido_dao_voting_address, lido_dao_token_manager_address
+from utils.evm_script import decode_call_script, encode_call_script, format_address, to_bytes
+from utils.voting import create_vote, encode_new_vote_script
+from tooling.gas import assert_script_fits
+
+# rpc_cassette, local_dao and the setup timing hooks
+pytest_plugins = ['tooling.pytest_plugin']
 
 
 from utils.config import (
@@ -11,6 +17,27 @@ from utils.config import (
 )
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        '--full-vote',
+        action='store_true',
+        help='run governance tests through the full DAO voting path'
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'full_vote: run the test through the full DAO voting path (slow)'
+    )
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_module_setup(module_isolation):
+    # module-scoped fixtures deploy after the reset and are reverted with it
+    pass
+
+
 @pytest.fixture(scope="function", autouse=True)
 def shared_setup(fn_isolation):
     pass
@@ -58,6 +85,7 @@ def dao_treasury():
 
 @pytest.fixture(scope='module')
 def program_start_date():
+    # from the wall clock, so the suite can't replay an rpc cassette
     beging_of_the_day = int(time.time()/86400)*86400
     return beging_of_the_day + 604800
 
@@ -108,9 +136,51 @@ class Helpers:
         chain.mine()
 
         assert dao_voting.canExecute(vote_id)
-        dao_voting.executeVote(vote_id, {'from': accounts[0]})
+        tx = dao_voting.executeVote(vote_id, {'from': accounts[0]})
 
         print(f'vote executed')
+        return tx
+
+    @staticmethod
+    def agent_forward_script(evm_script, agent):
+        """
+        Merges a script made only of `Agent.forward` calls into the single
+        script the Agent runs for them, or returns None for any other script.
+        """
+        _, actions = decode_call_script(evm_script)
+        agent_actions = []
+        for to, calldata in actions:
+            calldata = bytes(calldata)
+            if format_address(to) != agent.address.lower() or calldata[:4].hex() != agent.forward.signature[2:]:
+                return None
+            (forwarded_script,) = agent.forward.decode_input(calldata)
+            _, forwarded_actions = decode_call_script(forwarded_script)
+            agent_actions += [(format_address(to), bytes(calldata)) for to, calldata in forwarded_actions]
+        return encode_call_script(agent_actions)
+
+    @staticmethod
+    def execute_vote_script(accounts, vote_desc, evm_script, dao_voting, agent):
+        """
+        Runs a script of `Agent.forward` calls as a single `Agent.forward`
+        from the Voting app, the transaction `executeVote` would make, while
+        skipping vote creation, voting and the voting period. Returns the
+        transaction, or None if the script does something else.
+        """
+        # the script has to survive the exact encoding create_vote would send
+        assert_script_fits(evm_script)
+        new_vote_script = encode_new_vote_script(dao_voting, vote_desc, evm_script)
+        _, new_vote_actions = decode_call_script(new_vote_script)
+        [(to, calldata)] = list(new_vote_actions)
+        assert format_address(to) == dao_voting.address.lower()
+        vote_args = dao_voting.newVote['bytes,string,bool,bool'].decode_input(bytes(calldata))
+        assert to_bytes(vote_args[0]) == to_bytes(evm_script)
+        assert vote_args[1] == vote_desc
+
+        agent_script = Helpers.agent_forward_script(evm_script, agent)
+        if agent_script is None:
+            return None
+        voting_account = accounts.at(dao_voting.address, force=True)
+        return agent.forward(agent_script, {'from': voting_account})
 
     @staticmethod
     def assert_no_events_named(evt_name, tx):
@@ -119,3 +189,34 @@ class Helpers:
 @pytest.fixture(scope='module')
 def helpers():
     return Helpers
+
+
+@pytest.fixture
+def run_vote(request, accounts, dao_voting, ldo_holder, interface):
+    """
+    Executes a vote script and returns the executing transaction. By default
+    a script of `Agent.forward` calls is run directly from the Voting app;
+    other scripts, tests marked `full_vote` and every test with --full-vote
+    create the vote, vote on it, wait and execute it.
+    """
+    full_vote = (
+        request.config.getoption('--full-vote')
+        or request.node.get_closest_marker('full_vote') is not None
+    )
+    agent = interface.Agent(lido_dao_agent_address)
+
+    def run(vote_desc, evm_script):
+        if not full_vote:
+            tx = Helpers.execute_vote_script(accounts, vote_desc, evm_script, dao_voting, agent)
+            if tx is not None:
+                return tx
+
+        (vote_id, _) = create_vote(
+            voting=dao_voting,
+            token_manager=interface.TokenManager(lido_dao_token_manager_address),
+            vote_desc=vote_desc,
+            evm_script=evm_script,
+            tx_params={"from": ldo_holder})
+        return Helpers.execute_vote(accounts=accounts, vote_id=vote_id, dao_voting=dao_voting)
+
+    return run
@@ -1,37 +1,36 @@
 import pytest
 
-from brownie import interface, RewardsManager, Contract
+from brownie import interface
 
-from utils.voting import create_vote
-from utils.config import (lido_dao_voting_address,
-                          lido_dao_agent_address,
-                          balancer_deployed_manager,
-                          lido_dao_token_manager_address,
+from utils.config import (lido_dao_agent_address,
                           ldo_token_address)
 from utils.evm_script import encode_call_script
 
-def test_erc_20_recover_via_voting(ldo_holder, rewards_manager, helpers, accounts, dao_voting, ldo_token, stranger):
-    
-    # manager_contract = Contract.from_abi('RewardsManager', balancer_deployed_manager, RewardsManager.abi)
-    agent_contract = interface.Agent(lido_dao_agent_address)
 
+@pytest.fixture
+def funded_rewards_manager(rewards_manager, ldo_holder, ldo_token):
     ldo_token.transfer(rewards_manager, 10**18, {"from": ldo_holder})
     assert ldo_token.balanceOf(rewards_manager) == 10**18
+    return rewards_manager
+
+
+def recover_via_voting(rewards_manager, run_vote, ldo_token, stranger):
+    agent_contract = interface.Agent(lido_dao_agent_address)
 
     encoded_recover_calldata = rewards_manager.recover_erc20.encode_input(ldo_token_address, 10**18, stranger)
     recover_script = encode_call_script([(rewards_manager.address, encoded_recover_calldata)])
     forwrded_script = encode_call_script([(lido_dao_agent_address, agent_contract.forward.encode_input(recover_script))])
-    
-    (vote_id, _) = create_vote(
-        voting=interface.Voting(lido_dao_voting_address),
-        token_manager=interface.TokenManager(lido_dao_token_manager_address),
-        vote_desc='',
-        evm_script=forwrded_script,
-        tx_params={"from": ldo_holder})
-    
-    helpers.execute_vote(vote_id=vote_id,
-                         accounts=accounts,
-                         dao_voting=dao_voting)
-    
+
+    run_vote(vote_desc='', evm_script=forwrded_script)
+
     assert ldo_token.balanceOf(rewards_manager) == 0
     assert ldo_token.balanceOf(stranger) == 10**18
+
+
+def test_erc_20_recover_via_voting(funded_rewards_manager, run_vote, ldo_token, stranger):
+    recover_via_voting(funded_rewards_manager, run_vote, ldo_token, stranger)
+
+
+@pytest.mark.full_vote
+def test_erc_20_recover_via_full_voting(funded_rewards_manager, run_vote, ldo_token, stranger):
+    recover_via_voting(funded_rewards_manager, run_vote, ldo_token, stranger)
@@ -0,0 +1,39 @@
+import pytest
+from brownie import chain, reverts, web3
+from scripts.deploy import deploy_manager
+from tooling.protocol_mocks import MAINNET_ADDRESSES, UnsupportedNode, install_stand_ins
+
+
+rewards_limit = 25 * 1000 * 10**18
+
+
+@pytest.fixture(scope='module')
+def stand_ins(deployer):
+    if len(web3.eth.get_code(MAINNET_ADDRESSES['merkle_redeem'])) > 0:
+        pytest.skip('the stand-ins are installed on a fresh chain, run with --network stand-ins')
+    try:
+        return install_stand_ins(deployer, ['ldo', 'merkle_redeem'])
+    except UnsupportedNode as err:
+        pytest.skip(str(err))
+
+
+def test_seeded_allocations_are_claimable(stand_ins, deployer, balancer_allocator, stranger):
+    ldo_token = stand_ins.ldo
+    merkle_contract = stand_ins.merkle_redeem
+
+    rewards_manager = deploy_manager(balancer_allocator, chain.time(), {'from': deployer})
+    merkle_contract.transferOwnership(rewards_manager, {'from': deployer})
+    ldo_token.mint(rewards_manager, rewards_limit, {'from': deployer})
+    assert rewards_manager.available_allocations() == rewards_limit
+
+    # a single claim is a tree of one leaf, the leaf is the root
+    merkle_root = web3.solidityKeccak(['address', 'uint256'], [stranger.address, rewards_limit])
+    rewards_manager.seed_allocations(1, merkle_root, rewards_limit, {'from': balancer_allocator})
+    assert ldo_token.balanceOf(merkle_contract) == rewards_limit
+    assert rewards_manager.available_allocations() == 0
+
+    merkle_contract.claimWeek(stranger, 1, rewards_limit, [], {'from': stranger})
+    assert ldo_token.balanceOf(stranger) == rewards_limit
+
+    with reverts('cannot claim twice'):
+        merkle_contract.claimWeek(stranger, 1, rewards_limit, [], {'from': stranger})
@@ -1,6 +1,5 @@
 import os
 import sys
-from brownie import network, accounts
 
 
 ldo_token_address = '0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32'
@@ -9,8 +8,18 @@ lido_dao_voting_address = '0x2e59A20f205bB85a89C53f1936454680651E618e'
 balancer_deployed_manager = '0x18ff3bd97739bf910cdcdb8d138976c6afdb4449'
 lido_dao_token_manager_address = '0xf73a1260d222f447210581DDf212D915c09a3249'
 
+if os.environ.get('LIDO_DAO_APPS') == 'local':
+    # stand-ins deployed by tooling.aragon_mocks, for governance tests without a fork
+    from tooling.aragon_mocks import LOCAL_DAO_ADDRESSES
+    ldo_token_address = LOCAL_DAO_ADDRESSES['token']
+    lido_dao_agent_address = LOCAL_DAO_ADDRESSES['agent']
+    lido_dao_voting_address = LOCAL_DAO_ADDRESSES['voting']
+    lido_dao_token_manager_address = LOCAL_DAO_ADDRESSES['token_manager']
+
 
 def get_is_live():
+    from brownie import network
+
     return network.show_active() != 'development'
 
 
@@ -24,11 +33,14 @@ def get_env(name, is_required=True, message=None, default=None):
 
 
 def get_deployer_account(is_live):
+    from brownie import accounts
+    from tooling.signing_agent import load_account
+
     if is_live and 'DEPLOYER' not in os.environ:
         raise EnvironmentError(
             'Please set DEPLOYER env variable to the deployer account name')
 
-    deployer = accounts.load(os.environ['DEPLOYER']) \
+    deployer = load_account(os.environ['DEPLOYER']) \
         if is_live or 'DEPLOYER' in  os.environ \
         else accounts[0]
     
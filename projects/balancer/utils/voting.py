@@ -1,14 +1,23 @@
 from utils.evm_script import encode_call_script, EMPTY_CALLSCRIPT
+from tooling.gas import assert_script_fits
 from utils.config import ldo_token_address
 
 
-def create_vote(voting, token_manager, vote_desc, evm_script, tx_params):
-    new_vote_script = encode_call_script([
+def encode_new_vote_script(voting, vote_desc, evm_script):
+    return encode_call_script([
         (voting.address,
          voting.newVote.encode_input(
              evm_script if evm_script is not None else EMPTY_CALLSCRIPT,
              vote_desc, False, False))
     ])
+
+
+def create_vote(voting, token_manager, vote_desc, evm_script, tx_params):
+    if evm_script is not None:
+        # fail before wasting a vote on a script that can't be executed
+        assert_script_fits(evm_script)
+
+    new_vote_script = encode_new_vote_script(voting, vote_desc, evm_script)
     tx = token_manager.forward(new_vote_script, tx_params)
     vote_id = tx.events['StartVote']['voteId']
-    return (vote_id, tx)
\ No newline at end of file
+    return (vote_id, tx)
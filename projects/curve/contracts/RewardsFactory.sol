@@ -0,0 +1,68 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity 0.5.17;
+
+import "./StakingRewards.sol";
+
+
+interface IRewardsManager {
+    function set_rewards_contract(address _rewards_contract) external;
+    function transfer_ownership(address _to) external;
+}
+
+
+/// @notice Deploys a RewardsManager and its StakingRewards contract at CREATE2
+/// addresses, wires them and hands the manager over to the Lido DAO Agent
+/// in a single transaction.
+/// @dev The RewardsManager is a Vyper contract, so its creation code is passed
+/// by the caller and checked against the hash fixed at the factory deployment.
+contract RewardsFactory {
+    address public constant LDO_TOKEN = 0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32;
+    address public constant LIDO_DAO_AGENT = 0x3e40D73EB977Dc6a537aF587D48316feE66E9C8c;
+
+    bytes32 public managerCodeHash;
+
+    event RewardsDeployed(
+        address indexed manager,
+        address indexed rewards,
+        address indexed stakingToken,
+        bytes32 salt
+    );
+
+    constructor(bytes32 _managerCodeHash) public {
+        managerCodeHash = _managerCodeHash;
+    }
+
+    function deployRewards(
+        bytes calldata _managerCode,
+        address _stakingToken,
+        uint256 _rewardsDuration,
+        bytes32 _salt
+    ) external returns (address manager, address rewards) {
+        require(keccak256(_managerCode) == managerCodeHash, "unknown manager code");
+
+        // binding the salt to the caller keeps others from taking the addresses
+        bytes32 salt = keccak256(abi.encodePacked(msg.sender, _salt));
+
+        manager = _create2(_managerCode, salt);
+        rewards = _create2(
+            abi.encodePacked(
+                type(StakingRewards).creationCode,
+                abi.encode(LIDO_DAO_AGENT, manager, LDO_TOKEN, _stakingToken, _rewardsDuration)
+            ),
+            salt
+        );
+
+        IRewardsManager(manager).set_rewards_contract(rewards);
+        IRewardsManager(manager).transfer_ownership(LIDO_DAO_AGENT);
+
+        emit RewardsDeployed(manager, rewards, _stakingToken, salt);
+    }
+
+    function _create2(bytes memory _code, bytes32 _salt) internal returns (address addr) {
+        assembly {
+            addr := create2(0, add(_code, 0x20), mload(_code), _salt)
+        }
+        require(addr != address(0), "deployment failed");
+    }
+}
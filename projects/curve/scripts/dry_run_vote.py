@@ -0,0 +1,35 @@
+import os
+from utils.evm_script import strip_byte_prefix
+from tooling.abi_index import SelectorIndex
+from tooling.dry_run import dry_run_script, format_report
+
+from utils.config import (
+    lido_dao_voting_address,
+    get_is_live,
+    get_env
+)
+
+
+def dry_run_vote(evm_script, executor=lido_dao_voting_address, cache_dir=None):
+    """
+    Runs a vote's EVM script on the local fork as the Voting app would execute it.
+    """
+    kwargs = {} if cache_dir is None else {'cache_dir': cache_dir}
+    return dry_run_script(evm_script, executor, index=SelectorIndex.load(), **kwargs)
+
+
+def main():
+    if get_is_live():
+        raise EnvironmentError('Vote scripts can only be dry-run on a local fork')
+
+    evm_script = get_env(
+        'SCRIPT',
+        message='Please set the SCRIPT env variable to the hex EVM script or a file containing it'
+    )
+    if os.path.isfile(evm_script):
+        with open(evm_script) as f:
+            evm_script = f.read().strip()
+
+    executor = get_env('EXECUTOR', is_required=False, default=lido_dao_voting_address)
+    report = dry_run_vote('0x' + strip_byte_prefix(evm_script), executor)
+    print(format_report(report))
@@ -0,0 +1,56 @@
+import sys
+from brownie import web3, accounts, interface, Wei, RewardsManager
+from utils.evm_script import encode_call_script
+from tooling.gas import (
+    GAS_TABLE_PATH,
+    measure_gas_table,
+    estimate_script_gas,
+    format_estimate
+)
+
+from utils.config import (
+    ldo_token_address,
+    lido_dao_agent_address,
+    lido_dao_finance_address,
+    lido_dao_voting_address,
+    get_is_live
+)
+
+
+def main():
+    if get_is_live():
+        print('Gas has to be measured on a local mainnet fork')
+        sys.exit(1)
+
+    source = f'mainnet fork at block {web3.eth.block_number}'
+    finance = interface.Finance(lido_dao_finance_address)
+    manager = RewardsManager.deploy({'from': accounts[0]})
+    manager.transfer_ownership(lido_dao_agent_address, {'from': accounts[0]})
+
+    # recover_erc20 only transfers a non-zero balance, fund the manager so
+    # the LDO transfer is part of the measurement
+    agent = accounts.at(lido_dao_agent_address, force=True)
+    accounts[0].transfer(agent, Wei('1 ether'))
+    interface.ERC20(ldo_token_address).transfer(manager, Wei('1 ether'), {'from': agent})
+
+    payment_calldata = finance.newImmediatePayment.encode_input(
+        ldo_token_address, accounts[1], Wei('1 ether'), 'gas measurement')
+
+    measure_gas_table(web3, lido_dao_voting_address, [(
+        finance.address,
+        payment_calldata,
+        'newImmediatePayment(address,address,uint256,string)'
+    )], source)
+    table = measure_gas_table(web3, lido_dao_agent_address, [
+        (manager.address, manager.set_rewards_contract.encode_input(accounts[2]),
+         'set_rewards_contract(address)'),
+        (manager.address, manager.transfer_ownership.encode_input(accounts[2]),
+         'transfer_ownership(address)'),
+        (manager.address, manager.recover_erc20['address,address'].encode_input(
+            ldo_token_address, accounts[2]),
+         'recover_erc20(address,address)'),
+    ], source)
+
+    print(f'Gas table measured on {source} written to {GAS_TABLE_PATH}')
+    sample_script = encode_call_script([(finance.address, payment_calldata)] * 10)
+    print(format_estimate(estimate_script_gas(sample_script, table)))
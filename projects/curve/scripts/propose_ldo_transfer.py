@@ -1,7 +1,12 @@
 import os
 import sys
+import csv
 from brownie import network, accounts, Wei, interface
-from utils.evm_script import encode_call_script
+from brownie.convert import to_address
+from utils.evm_script import encode_call_script, EMPTY_CALLSCRIPT
+from tooling.gas import assert_script_fits
+from tooling.calldata import CalldataTemplate
+from tooling.vote_planner import create_votes
 
 from utils.config import (
     lido_dao_voting_address,
@@ -15,10 +20,14 @@ from utils.config import (
 )
 
 
-EMPTY_CALLSCRIPT = '0x00000001'
+new_immediate_payment = CalldataTemplate('newImmediatePayment(address,address,uint256,string)')
 
 
 def create_vote(voting, token_manager, vote_desc, evm_script, tx_params):
+    if evm_script is not None:
+        # fail before wasting a vote on a script that can't be executed
+        assert_script_fits(evm_script)
+
     new_vote_script = encode_call_script([(
         voting.address,
         voting.newVote.encode_input(
@@ -33,6 +42,17 @@ def create_vote(voting, token_manager, vote_desc, evm_script, tx_params):
     return (vote_id, tx)
 
 
+def encode_payments_script(finance_address, token_address, payments):
+    """
+    Encodes a `Finance.newImmediatePayment` call per `(recipient, amount, reference)`
+    into a single EVM script.
+    """
+    return encode_call_script(new_immediate_payment.actions(
+        finance_address,
+        ((token_address, recipient, amount, reference) for recipient, amount, reference in payments)
+    ))
+
+
 def propose_payment(
     voting,
     token_manager,
@@ -43,15 +63,11 @@ def propose_payment(
     reference,
     tx_params
 ):
-    payment_script = encode_call_script([(
-        finance.address,
-        finance.newImmediatePayment.encode_input(
-            token_address,
-            recipient,
-            amount,
-            reference
-        )
-    )])
+    payment_script = encode_payments_script(
+        finance_address=finance.address,
+        token_address=token_address,
+        payments=[(recipient, amount, reference)]
+    )
     return create_vote(
         voting=voting,
         token_manager=token_manager,
@@ -75,10 +91,112 @@ def propose_ldo_transfer(recipient, amount, reference, tx_params):
     )
 
 
+def read_payouts_csv(path):
+    """
+    Reads `recipient,amount,reference` rows (with a header line) and validates
+    all of them before returning, so a typo can't produce a partial vote.
+    Amounts accept the same units as the AMOUNT env variable, e.g. "10 ether".
+    """
+    payouts = []
+    errors = []
+
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = [column.strip().lower() for column in next(reader, [])]
+        if header != ['recipient', 'amount', 'reference']:
+            raise ValueError(f'{path}: expected a "recipient,amount,reference" header')
+
+        for line_number, row in enumerate(reader, start=2):
+            if not row or not ''.join(row).strip():
+                continue
+            if len(row) != 3:
+                errors.append(f'line {line_number}: expected 3 columns, got {len(row)}')
+                continue
+            recipient, amount, reference = (column.strip() for column in row)
+            try:
+                recipient = to_address(recipient)
+            except ValueError as err:
+                errors.append(f'line {line_number}: invalid recipient {recipient!r}: {err}')
+                continue
+            try:
+                amount = Wei(amount)
+            except (TypeError, ValueError) as err:
+                errors.append(f'line {line_number}: invalid amount {amount!r}: {err}')
+                continue
+            if amount <= 0:
+                errors.append(f'line {line_number}: amount must be positive')
+                continue
+            payouts.append((recipient, amount, reference))
+
+    if errors:
+        raise ValueError(f'{path}: invalid payouts\n' + '\n'.join(errors))
+    if not payouts:
+        raise ValueError(f'{path}: no payouts found')
+
+    return payouts
+
+
+def payout_actions(payouts):
+    return new_immediate_payment.actions(
+        lido_dao_finance_address,
+        ((ldo_token_address, recipient, amount, reference) for recipient, amount, reference in payouts)
+    )
+
+
+def propose_ldo_payouts(payouts, tx_params, manifest_path):
+    """
+    Proposes all `(recipient, amount, reference)` payouts, split into as few
+    votes as fit into a block. Returns the `tooling.vote_planner` manifest
+    that is also written to `manifest_path`.
+    """
+    total = sum(amount for _, amount, _ in payouts)
+    return create_votes(
+        create_vote=create_vote,
+        voting=interface.Voting(lido_dao_voting_address),
+        token_manager=interface.TokenManager(lido_dao_token_manager_address),
+        vote_desc=f'Send {total} LDO token-wei to {len(payouts)} recipients',
+        actions=payout_actions(payouts),
+        tx_params=tx_params,
+        manifest_path=manifest_path
+    )
+
+
+def payouts_manifest_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.votes.json'
+
+
+def main_payouts_csv(deployer, path):
+    payouts = read_payouts_csv(path)
+    total = sum(amount for _, amount, _ in payouts)
+
+    print(f"You're going to propose sending {total} LDO token-wei in total to {len(payouts)} recipients:")
+    for recipient, amount, reference in payouts:
+        print(f'  {recipient}: {amount} (reference: \'{reference}\')')
+    sys.stdout.write('Are you sure (y/n)? ')
+
+    if not prompt_bool():
+        print('Aborting')
+        return
+
+    manifest_path = payouts_manifest_path(path)
+    manifest = propose_ldo_payouts(
+        payouts=payouts,
+        tx_params={"from": deployer, "gas_price": Wei(gas_price), "required_confs": 1},
+        manifest_path=manifest_path
+    )
+
+    for vote in manifest['votes']:
+        print(f'Vote ID: {vote["vote_id"]} (payouts {vote["start"] + 1}-{vote["end"]})')
+    print(f'Votes are listed in {manifest_path}')
+
+
 def main():
     is_live = get_is_live()
     deployer = get_deployer_account(True)
 
+    if 'PAYOUTS_CSV' in os.environ:
+        return main_payouts_csv(deployer, os.environ['PAYOUTS_CSV'])
+
     if 'TO' not in os.environ:
         raise EnvironmentError('Please set the TO env variable to the recipient address')
 
@@ -89,7 +207,8 @@ def main():
         raise EnvironmentError('Please set the REFERENCE env variable')
 
     amount = Wei(os.environ['AMOUNT'])
-    recipient = os.environ['TO']
+    # the calldata template encodes any 20 bytes, a typo has to fail here
+    recipient = to_address(os.environ['TO'])
     reference = os.environ['REFERENCE']
 
     print(f"You're going to propose sending {amount} LDO token-wei to {recipient} (reference: '{reference}').")
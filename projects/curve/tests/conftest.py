@@ -1,6 +1,12 @@
 import pytest
+import brownie
 from brownie import Wei, ZERO_ADDRESS
-from scripts.deploy import deploy_manager_and_rewards
+from scripts.deploy import (
+    deploy_manager,
+    deploy_manager_and_rewards,
+    deploy_manager_clone,
+    deploy_manager_factory
+)
 from utils.config import (
     lp_token_address,
     ldo_token_address,
@@ -10,17 +16,42 @@ from utils.config import (
     lido_dao_token_manager_address
 )
 
+# rpc_cassette, local_dao and the setup timing hooks
+pytest_plugins = ['tooling.pytest_plugin']
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_module_setup(module_isolation):
+    # module-scoped fixtures deploy after the reset and are reverted with it
+    pass
+
 
 @pytest.fixture(scope="function", autouse=True)
 def shared_setup(fn_isolation):
     pass
 
 
+@pytest.fixture(scope='session')
+def reverts():
+    # a fixture rather than `brownie.reverts`, so that tests_inprocess can
+    # run the same test modules with its own
+    return brownie.reverts
+
+
 @pytest.fixture(scope='module')
 def ape(accounts):
     return accounts[0]
 
 
+@pytest.fixture(scope='module', params=['deployed', 'clone'])
+def new_rewards_manager(request, ape):
+    # RewardsManager tests run against both a regular deployment and a clone
+    if request.param == 'deployed':
+        return lambda: deploy_manager({"from": ape})
+    manager_factory = deploy_manager_factory({"from": ape})
+    return lambda: deploy_manager_clone(manager_factory, {"from": ape})
+
+
 @pytest.fixture()
 def steth_whale(accounts, steth_token, lido, lp_token):
     acct = accounts[1]
@@ -0,0 +1,83 @@
+import brownie
+from brownie import Wei, chain
+from scripts.propose_ldo_transfer import create_vote, encode_payments_script
+from utils.evm_script import encode_call_script
+from tooling.aragon_mocks import deploy_local_dao, VOTE_TIME
+
+
+def deploy_dao(accounts):
+    # holders 0 and 1 together decide a vote early, holder 2 alone doesn't
+    return deploy_local_dao(
+        accounts[0],
+        holders=[(accounts[1], Wei('400000 ether')), (accounts[2], Wei('400000 ether')), (accounts[3], Wei('100000 ether'))],
+        treasury=Wei('100000 ether')
+    )
+
+
+def test_payment_vote_executes_once_decided(accounts):
+    dao = deploy_dao(accounts)
+    recipient = accounts[5]
+    balance_before = dao.token.balanceOf(recipient)
+
+    script = encode_payments_script(dao.finance.address, dao.token.address, [(recipient, Wei('1 ether'), 'local')])
+    vote_id, tx = create_vote(dao.voting, dao.token_manager, 'Pay 1 LDO', script, {'from': accounts[1]})
+    assert tx.events['StartVote']['creator'] == dao.token_manager
+
+    dao.voting.vote(vote_id, True, False, {'from': accounts[1]})
+    assert not dao.voting.canExecute(vote_id)
+    dao.voting.vote(vote_id, True, False, {'from': accounts[2]})
+    assert dao.voting.canExecute(vote_id)
+
+    tx = dao.voting.executeVote(vote_id, {'from': accounts[0]})
+    assert tx.events['NewTransaction']['entity'] == recipient
+    assert dao.token.balanceOf(recipient) == balance_before + Wei('1 ether')
+    assert dao.voting.getVote(vote_id)['executed']
+
+    with brownie.reverts('VOTING_CAN_NOT_EXECUTE'):
+        dao.voting.executeVote(vote_id, {'from': accounts[0]})
+
+
+def test_vote_passes_on_quorum_after_vote_time(accounts):
+    dao = deploy_dao(accounts)
+    vote_id, _ = create_vote(dao.voting, dao.token_manager, 'Empty', None, {'from': accounts[3]})
+
+    dao.voting.vote(vote_id, True, False, {'from': accounts[1]})
+    dao.voting.vote(vote_id, False, False, {'from': accounts[3]})
+    assert not dao.voting.canExecute(vote_id)
+
+    chain.sleep(VOTE_TIME)
+    chain.mine()
+
+    assert not dao.voting.canVote(vote_id, accounts[2])
+    assert dao.voting.canExecute(vote_id)
+
+
+def test_agent_forwards_scripts_of_the_voting_app(accounts):
+    dao = deploy_dao(accounts)
+    recipient = accounts[5]
+    balance_before = dao.token.balanceOf(recipient)
+
+    transfer = dao.token.transfer.encode_input(recipient, Wei('2 ether'))
+    script = encode_call_script([(dao.agent.address, dao.agent.forward.encode_input(
+        encode_call_script([(dao.token.address, transfer)])
+    ))])
+    vote_id, _ = create_vote(dao.voting, dao.token_manager, 'Agent transfer', script, {'from': accounts[1]})
+    dao.voting.vote(vote_id, True, False, {'from': accounts[1]})
+    dao.voting.vote(vote_id, True, True, {'from': accounts[2]})
+
+    assert dao.voting.getVote(vote_id)['executed']
+    assert dao.token.balanceOf(recipient) == balance_before + Wei('2 ether')
+
+
+def test_apps_are_only_reachable_through_the_dao(accounts):
+    dao = deploy_dao(accounts)
+    stranger = accounts[9]
+
+    with brownie.reverts('TM_CAN_NOT_FORWARD'):
+        dao.token_manager.forward(encode_call_script([]), {'from': stranger})
+    with brownie.reverts('APP_AUTH_FAILED'):
+        dao.voting.newVote(encode_call_script([]), '', False, False, {'from': accounts[1]})
+    with brownie.reverts('AGENT_CAN_NOT_FORWARD'):
+        dao.agent.forward(encode_call_script([]), {'from': stranger})
+    with brownie.reverts('APP_AUTH_FAILED'):
+        dao.finance.newImmediatePayment(dao.token, stranger, 1, '', {'from': stranger})
@@ -0,0 +1,84 @@
+import brownie
+from scripts.deploy import (
+    deploy_manager,
+    deploy_manager_and_rewards,
+    deploy_manager_clone,
+    deploy_manager_factory
+)
+from utils.config import lido_dao_agent_address
+
+# EIP-1167 minimal proxy runtime code
+CLONE_CODE_SIZE = 45
+rewards_period = 60 * 60 * 24 * 7
+
+
+def test_clone_is_a_minimal_proxy(ape, web3):
+    manager_factory = deploy_manager_factory({"from": ape})
+    clone = deploy_manager_clone(manager_factory, {"from": ape})
+
+    assert len(web3.eth.get_code(clone.address)) == CLONE_CODE_SIZE
+    assert manager_factory.implementation()[2:].lower() in web3.eth.get_code(clone.address).hex()
+
+
+def test_clone_is_cheaper_than_a_deployment(ape, history):
+    deploy_manager({"from": ape})
+    full_gas = history[-1].gas_used
+
+    deploy_manager_clone(deploy_manager_factory({"from": ape}), {"from": ape})
+    clone_gas = history[-1].gas_used
+
+    assert clone_gas < full_gas // 3
+
+
+def test_clones_have_separate_state(ape, stranger):
+    manager_factory = deploy_manager_factory({"from": ape})
+    clone = deploy_manager_clone(manager_factory, {"from": ape})
+    another_clone = deploy_manager_clone(manager_factory, {"from": stranger})
+
+    assert clone.owner() == ape
+    assert another_clone.owner() == stranger
+    clone.set_rewards_contract(another_clone, {"from": ape})
+    assert another_clone.rewards_contract() == brownie.ZERO_ADDRESS
+
+
+def test_clone_can_not_be_initialized_again(ape, stranger):
+    clone = deploy_manager_clone(deploy_manager_factory({"from": ape}), {"from": ape})
+
+    with brownie.reverts("already initialized"):
+        clone.initialize(stranger, {"from": stranger})
+
+    # renouncing the ownership doesn't make a clone initializable
+    clone.transfer_ownership(brownie.ZERO_ADDRESS, {"from": ape})
+    with brownie.reverts("already initialized"):
+        clone.initialize(stranger, {"from": stranger})
+
+
+def test_implementation_can_not_be_initialized(ape, stranger, RewardsManager):
+    manager_factory = deploy_manager_factory({"from": ape})
+    implementation = RewardsManager.at(manager_factory.implementation())
+
+    with brownie.reverts("already initialized"):
+        implementation.initialize(stranger, {"from": stranger})
+
+
+def test_deployed_manager_can_not_be_initialized(ape, stranger):
+    manager = deploy_manager({"from": ape})
+
+    with brownie.reverts("already initialized"):
+        manager.initialize(stranger, {"from": stranger})
+    assert manager.owner() == ape
+
+
+def test_deploy_with_cloned_manager(ape, RewardsManager):
+    manager_factory = deploy_manager_factory({"from": ape})
+
+    (manager, rewards) = deploy_manager_and_rewards(
+        rewards_duration=rewards_period,
+        tx_params={"from": ape},
+        publish_source=False,
+        manager_factory=manager_factory
+    )
+
+    assert manager.owner() == lido_dao_agent_address
+    assert manager.rewards_contract() == rewards
+    assert rewards.rewardsDistribution() == manager
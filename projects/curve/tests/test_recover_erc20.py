@@ -2,9 +2,9 @@ import pytest
 import brownie
 
 
-@pytest.fixture()
-def rewards_manager(RewardsManager, ape):
-    return RewardsManager.deploy({"from": ape})
+@pytest.fixture(scope='module')
+def rewards_manager(new_rewards_manager):
+    return new_rewards_manager()
 
 
 def test_owner_recovers_erc20_without_balance(rewards_manager, ldo_token, ape):
@@ -0,0 +1,75 @@
+import brownie
+from scripts.deploy import (
+    deploy_factory,
+    deploy_manager_and_rewards,
+    deploy_manager_and_rewards_via_factory,
+    predict_manager_and_rewards
+)
+from utils.config import (
+    lp_token_address,
+    ldo_token_address,
+    lido_dao_agent_address
+)
+
+rewards_period = 60 * 60 * 24 * 7
+salt = '0x' + '01' * 32
+
+
+def test_factory_deploys_wired_contracts_at_predicted_addresses(ape):
+    factory = deploy_factory({"from": ape})
+    predicted = predict_manager_and_rewards(factory, ape, salt, rewards_period)
+    nonce = ape.nonce
+
+    (manager, rewards) = deploy_manager_and_rewards_via_factory(
+        factory=factory,
+        rewards_duration=rewards_period,
+        salt=salt,
+        tx_params={"from": ape},
+        publish_source=False
+    )
+
+    assert ape.nonce == nonce + 1
+    assert (manager.address, rewards.address) == predicted
+    assert manager.owner() == lido_dao_agent_address
+    assert manager.rewards_contract() == rewards
+    assert rewards.owner() == lido_dao_agent_address
+    assert rewards.rewardsDistribution() == manager
+    assert rewards.rewardsToken() == ldo_token_address
+    assert rewards.stakingToken() == lp_token_address
+    assert rewards.rewardsDuration() == rewards_period
+
+
+def test_factory_uses_less_gas_than_separate_deployments(ape, history):
+    factory = deploy_factory({"from": ape})
+
+    start = len(history)
+    deploy_manager_and_rewards(rewards_period, {"from": ape}, publish_source=False)
+    separate_gas = sum(tx.gas_used for tx in history[start:])
+
+    start = len(history)
+    deploy_manager_and_rewards_via_factory(factory, rewards_period, salt, {"from": ape}, publish_source=False)
+    factory_gas = sum(tx.gas_used for tx in history[start:])
+
+    assert factory_gas < separate_gas
+
+
+def test_salt_is_bound_to_the_caller(ape, stranger):
+    factory = deploy_factory({"from": ape})
+    deploy_manager_and_rewards_via_factory(factory, rewards_period, salt, {"from": ape}, publish_source=False)
+
+    with brownie.reverts("deployment failed"):
+        factory.deployRewards(
+            '0x' + brownie.RewardsManager.bytecode, lp_token_address, rewards_period, salt, {"from": ape}
+        )
+
+    (manager, _) = deploy_manager_and_rewards_via_factory(
+        factory, rewards_period, salt, {"from": stranger}, publish_source=False
+    )
+    assert manager.owner() == lido_dao_agent_address
+
+
+def test_factory_rejects_unknown_manager_code(ape):
+    factory = deploy_factory({"from": ape})
+
+    with brownie.reverts("unknown manager code"):
+        factory.deployRewards('0x00', lp_token_address, rewards_period, salt, {"from": ape})
@@ -0,0 +1,47 @@
+import pytest
+from brownie import Wei, chain, web3
+from tooling.protocol_mocks import MAINNET_ADDRESSES, UnsupportedNode, install_stand_ins
+
+ONE_WEEK = 60 * 60 * 24 * 7
+
+
+@pytest.fixture(scope='module')
+def stand_ins(ape):
+    if len(web3.eth.get_code(MAINNET_ADDRESSES['curve_gauge'])) > 0:
+        pytest.skip('the stand-ins are installed on a fresh chain, run with --network stand-ins')
+    try:
+        return install_stand_ins(ape, ['ldo', 'steth', 'steth_pool_lp', 'steth_pool', 'curve_gauge'])
+    except UnsupportedNode as err:
+        pytest.skip(str(err))
+
+
+def test_gauge_stand_in_pays_rewards(stand_ins, ape, accounts, stranger, rewards_helpers):
+    whale = accounts[1]
+    ldo_token, steth_token, lp_token = stand_ins.ldo, stand_ins.steth, stand_ins.steth_pool_lp
+    gauge = stand_ins.curve_gauge
+
+    (rewards_manager, rewards_contract) = rewards_helpers.deploy_rewards(rewards_period=ONE_WEEK, deployer=ape)
+    rewards_helpers.install_rewards(gauge=gauge, gauge_admin=ape, rewards_token=ldo_token, rewards=rewards_contract)
+
+    ldo_token.mint(rewards_manager, Wei('1 ether'), {'from': ape})
+    rewards_manager.start_next_rewards_period({'from': stranger})
+
+    steth_token.submit(ape, {'from': whale, 'value': '10 ether'})
+    steth_token.approve(stand_ins.steth_pool, Wei('10 ether'), {'from': whale})
+    stand_ins.steth_pool.add_liquidity([Wei('1 ether'), Wei('10 ether')], 0, {'from': whale, 'value': '1 ether'})
+    assert lp_token.balanceOf(whale) == Wei('11 ether')
+
+    lp_token.approve(gauge, Wei('11 ether'), {'from': whale})
+    gauge.deposit(Wei('11 ether'), {'from': whale})
+    assert gauge.balanceOf(whale) == Wei('11 ether')
+    assert rewards_contract.balanceOf(gauge) == Wei('11 ether')
+
+    chain.sleep(ONE_WEEK // 2)
+    gauge.claim_rewards({'from': whale})
+    claimed = ldo_token.balanceOf(whale)
+    assert claimed > 0
+
+    chain.sleep(ONE_WEEK)
+    gauge.withdraw(Wei('11 ether'), {'from': whale})
+    assert ldo_token.balanceOf(whale) > claimed
+    assert lp_token.balanceOf(whale) == Wei('11 ether')
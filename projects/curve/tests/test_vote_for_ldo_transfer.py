@@ -1,5 +1,23 @@
-from brownie import Wei
-from scripts.propose_ldo_transfer import propose_ldo_transfer
+import pytest
+from brownie import Wei, ZERO_ADDRESS, web3
+from scripts.propose_ldo_transfer import (
+    propose_ldo_transfer,
+    propose_ldo_payouts,
+    payout_actions,
+    read_payouts_csv,
+    encode_payments_script,
+    new_immediate_payment
+)
+from scripts.dry_run_vote import dry_run_vote
+from tooling.dry_run import cache_key
+from tooling.gas import load_gas_table
+from tooling.vote_planner import plan_votes
+from utils.evm_script import encode_call_script
+from utils.config import (
+    lido_dao_agent_address,
+    lido_dao_finance_address,
+    lido_dao_voting_address
+)
 
 dao_holders = [
     '0x3e40d73eb977dc6a537af587d48316fee66e9c8c',
@@ -47,3 +65,125 @@ def test_vote_for_ldo_transfer(dao_voting, ldo_token, accounts):
     dao_voting.executeVote(vote_id, {'from': accounts[0]})
 
     assert ldo_token.balanceOf(recipient) == amount
+
+
+def test_vote_for_ldo_payouts(dao_voting, ldo_token, accounts, tmp_path):
+    recipients = accounts[1:4]
+    csv_path = tmp_path / 'payouts.csv'
+    csv_path.write_text(
+        'recipient,amount,reference\n'
+        + ''.join(f'{r.address},{i + 1} ether,program #{i}\n' for i, r in enumerate(recipients))
+    )
+    balances_before = [ldo_token.balanceOf(r) for r in recipients]
+
+    payouts = read_payouts_csv(str(csv_path))
+    assert [amount for _, amount, _ in payouts] == [Wei(f'{i + 1} ether') for i in range(3)]
+
+    manifest = propose_ldo_payouts(
+        payouts=payouts,
+        tx_params={'from': dao_holders[0]},
+        manifest_path=str(tmp_path / 'payouts.votes.json')
+    )
+    assert len(manifest['votes']) == 1
+    vote_id = manifest['votes'][0]['vote_id']
+
+    for holder_addr in dao_holders:
+        accounts[0].transfer(holder_addr, "0.1 ether")
+        dao_voting.vote(vote_id, True, False, {'from': accounts.at(holder_addr, force=True)})
+
+    assert dao_voting.canExecute(vote_id)
+    dao_voting.executeVote(vote_id, {'from': accounts[0]})
+
+    for i, recipient in enumerate(recipients):
+        assert ldo_token.balanceOf(recipient) == balances_before[i] + Wei(f'{i + 1} ether')
+
+
+def test_payouts_csv_plans_into_few_votes(tmp_path):
+    csv_path = tmp_path / 'payouts.csv'
+    csv_path.write_text(
+        'recipient,amount,reference\n'
+        + ''.join(f'0x{0x1000 + i:040x},{i + 1} ether,Curve stETH LP incentives #{i}\n' for i in range(300))
+    )
+    table = load_gas_table()
+    # the default stands in for newImmediatePayment until it's measured
+    table['selectors'].setdefault('0xf6364846', {
+        'signature': 'newImmediatePayment(address,address,uint256,string)',
+        'gas': table['default_action_gas'],
+    })
+
+    plans = plan_votes(payout_actions(read_payouts_csv(str(csv_path))), table=table)
+
+    # ~220 bytes per payment, the script size allows ~80 payments per vote
+    assert len(plans) == 4
+    assert plans[-1].end == 300
+
+
+def test_payouts_csv_is_validated_up_front(tmp_path):
+    csv_path = tmp_path / 'payouts.csv'
+    csv_path.write_text(
+        'recipient,amount,reference\n'
+        '0x32199f1fFD5C9a5745A98FE492570a8D1601Dc4C,1 ether,ok\n'
+        '0x1234,1 ether,bad address\n'
+        '0x32199f1fFD5C9a5745A98FE492570a8D1601Dc4C,0,zero amount\n'
+        '0x32199f1fFD5C9a5745A98FE492570a8D1601Dc4C,1 ether\n'
+    )
+
+    with pytest.raises(ValueError) as exc_info:
+        read_payouts_csv(str(csv_path))
+
+    message = str(exc_info.value)
+    assert 'line 3' in message
+    assert 'line 4' in message
+    assert 'line 5' in message
+    assert 'line 2' not in message
+
+
+def test_dry_run_of_ldo_payment(ldo_token, accounts, tmp_path):
+    recipient = accounts[1]
+    amount = Wei('1 ether')
+    balance_before = ldo_token.balanceOf(recipient)
+
+    evm_script = encode_payments_script(
+        finance_address=lido_dao_finance_address,
+        token_address=ldo_token.address,
+        payments=[(recipient, amount, 'dry run')]
+    )
+    report = dry_run_vote(evm_script, cache_dir=str(tmp_path))
+
+    [call] = report['calls']
+    assert call['success']
+    assert call['function'] == 'newImmediatePayment(address,address,uint256,string)'
+    assert report['balance_deltas'][ldo_token.address][recipient.address.lower()] == amount
+    # the chain is reverted after the dry run
+    assert ldo_token.balanceOf(recipient) == balance_before
+    # and the same script against the same state comes from the cache
+    assert dry_run_vote(evm_script, cache_dir=str(tmp_path)) == report
+
+
+def test_dry_run_of_ldo_and_eth_payments(ldo_token, accounts, tmp_path):
+    recipient = accounts[1]
+    ldo_amount = Wei('1 ether')
+    eth_amount = Wei('0.5 ether')
+    # the Agent is the Finance app's vault
+    accounts[0].transfer(lido_dao_agent_address, Wei('1 ether'))
+    ldo_before = ldo_token.balanceOf(recipient)
+    eth_before = recipient.balance()
+
+    evm_script = encode_call_script(new_immediate_payment.actions(lido_dao_finance_address, [
+        (ldo_token.address, recipient.address, ldo_amount, 'dry run LDO'),
+        (ZERO_ADDRESS, recipient.address, eth_amount, 'dry run ETH'),
+    ]))
+    state_root = '0x' + bytes(web3.eth.get_block('latest')['stateRoot']).hex()
+    report = dry_run_vote(evm_script, cache_dir=str(tmp_path))
+
+    assert [call['success'] for call in report['calls']] == [True, True]
+    assert report['balance_deltas'][ldo_token.address][recipient.address.lower()] == ldo_amount
+    assert report['eth_deltas'][recipient.address.lower()] == eth_amount
+    assert report['eth_deltas'][lido_dao_agent_address.lower()] == -eth_amount
+    # the chain is reverted after the dry run
+    assert ldo_token.balanceOf(recipient) == ldo_before
+    assert recipient.balance() == eth_before
+    # and the report is cached under the script, executor and state root
+    key = cache_key(evm_script, lido_dao_voting_address, state_root)
+    assert (tmp_path / f'{key}.json').exists()
+    assert dry_run_vote(evm_script, cache_dir=str(tmp_path)) == report
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+import utils  # noqa: F401, puts the repo root on sys.path
+from tooling.inprocess_evm import InProcessEVM, reverts as inprocess_reverts, to_wei
+from tooling.protocol_mocks import compile_mocks
+
+
+PROJECT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+
+@pytest.fixture(scope='session')
+def project():
+    # compiles (or reuses build/) without connecting to a network
+    from brownie import project
+    return project.load(PROJECT_PATH, name='CurveInProcess')
+
+
+@pytest.fixture(scope='session')
+def chain():
+    pytest.importorskip('eth_tester')
+    return InProcessEVM()
+
+
+@pytest.fixture(scope='function', autouse=True)
+def isolation(chain):
+    snapshot = chain.snapshot()
+    yield
+    chain.revert(snapshot)
+
+
+@pytest.fixture(scope='session')
+def reverts():
+    return inprocess_reverts
+
+
+@pytest.fixture(scope='session')
+def ape(chain):
+    return chain.accounts[0]
+
+
+@pytest.fixture(scope='session')
+def stranger(chain):
+    return chain.accounts[9]
+
+
+@pytest.fixture(scope='module', params=['deployed', 'clone'])
+def new_rewards_manager(request, chain, project, ape):
+    # same as tests/conftest.py: a regular deployment and a clone
+    if request.param == 'deployed':
+        return lambda: chain.deploy(project.RewardsManager, {"from": ape})
+    implementation = chain.deploy(project.RewardsManager, {"from": ape})
+    manager_factory = chain.deploy(project.RewardsManagerFactory, implementation, {"from": ape})
+
+    def new_clone():
+        tx = manager_factory.create_manager({"from": ape})
+        return chain.at(project.RewardsManager, tx.events['ManagerCreated']['manager'])
+    return new_clone
+
+
+@pytest.fixture(scope='session')
+def dao_agent(chain):
+    # holds the LDO stand-in, as the agent holds LDO on the fork
+    return chain.accounts[8]
+
+
+@pytest.fixture(scope='session')
+def ldo_token(chain, project, dao_agent):
+    # stands in for LDO, which only exists on the fork; attached with the
+    # same ERC20 interface as tests/conftest.py, so events decode the same
+    token = chain.deploy(compile_mocks().MockERC20, {"from": dao_agent})
+    token.initialize('Lido DAO Token', 'LDO', dao_agent, {"from": dao_agent})
+    token.mint(dao_agent, to_wei('1000000 ether'), {"from": dao_agent})
+    return chain.at(project.interface.ERC20, token.address)
+
+
+class RewardsHelpers:
+    def __init__(self, chain, project, ldo_token, dao_agent):
+        self.chain = chain
+        self.project = project
+        self.ldo_token = ldo_token
+        self.dao_agent = dao_agent
+
+    def deploy_rewards(self, rewards_period, deployer):
+        # same as scripts.deploy.deploy_manager_and_rewards, with the
+        # stand-ins; the staking token is only stored by the constructor
+        tx_params = {"from": deployer}
+        manager = self.chain.deploy(self.project.RewardsManager, tx_params)
+        rewards = self.chain.deploy(
+            self.project.StakingRewards,
+            self.dao_agent, # _owner
+            manager, # _rewardsDistribution
+            self.ldo_token, # _rewardsToken
+            ZERO_ADDRESS, # _stakingToken
+            rewards_period, # _rewardsDuration
+            tx_params
+        )
+        manager.set_rewards_contract(rewards, tx_params)
+        assert manager.rewards_contract() == rewards
+        manager.transfer_ownership(self.dao_agent, tx_params)
+        return (manager, rewards)
+
+
+@pytest.fixture(scope='module')
+def rewards_helpers(chain, project, ldo_token, dao_agent):
+    return RewardsHelpers(chain, project, ldo_token, dao_agent)
@@ -0,0 +1,2 @@
+# tests/test_access.py against the in-process backend, see conftest.py
+from tests.test_access import *  # noqa: F401, F403
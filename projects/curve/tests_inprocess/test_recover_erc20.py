@@ -0,0 +1,14 @@
+# tests/test_recover_erc20.py against the in-process backend, see conftest.py
+from tests.test_recover_erc20 import *  # noqa: F401, F403
+
+
+def test_recover_erc20_accounting_over_many_transactions(rewards_manager, ldo_token, dao_agent, ape, stranger):
+    # cheap enough in-process to run a few hundred transactions
+    balance_before = ldo_token.balanceOf(stranger)
+    total = 0
+    for amount in range(1, 201):
+        ldo_token.transfer(rewards_manager, amount, {"from": dao_agent})
+        rewards_manager.recover_erc20(ldo_token, stranger, {"from": ape})
+        total += amount
+        assert ldo_token.balanceOf(rewards_manager) == 0
+    assert ldo_token.balanceOf(stranger) - balance_before == total
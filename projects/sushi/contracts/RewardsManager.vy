@@ -1,5 +1,8 @@
 # @version 0.2.14
-# @notice A manager contract for the StakingRewards contract.
+# @notice
+#     A manager contract for the StakingRewards contract. Also serves as the
+#     implementation behind the EIP-1167 clones created by RewardsManagerFactory,
+#     which are initialized by the factory instead of running the constructor.
 # @author skozin
 # @license MIT
 from vyper.interfaces import ERC20
@@ -12,12 +15,25 @@ interface StakingRewards:
 
 owner: public(address)
 rewards_contract: public(address)
+initialized: public(bool)
 ldo_token: constant(address) = 0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32
 
 
 @external
 def __init__():
+    # a deployed manager, the implementation included, can't be initialized
     self.owner = msg.sender
+    self.initialized = True
+
+
+@external
+def initialize(_owner: address):
+    """
+    @notice Sets the owner of a clone. Can only be called once.
+    """
+    assert not self.initialized, "already initialized"
+    self.initialized = True
+    self.owner = _owner
 
 
 @external
@@ -0,0 +1,35 @@
+# @version 0.2.14
+# @notice
+#     Creates RewardsManager instances as EIP-1167 minimal proxies delegating
+#     to a single RewardsManager implementation.
+# @license MIT
+
+
+interface RewardsManager:
+    def initialize(_owner: address): nonpayable
+
+
+event ManagerCreated:
+    manager: indexed(address)
+    owner: indexed(address)
+
+
+implementation: public(address)
+
+
+@external
+def __init__(_implementation: address):
+    self.implementation = _implementation
+
+
+@external
+def create_manager() -> address:
+    """
+    @notice
+        Creates a RewardsManager clone owned by the caller, like a
+        `RewardsManager` deployed by the caller would be.
+    """
+    manager: address = create_forwarder_to(self.implementation)
+    RewardsManager(manager).initialize(msg.sender)
+    log ManagerCreated(manager, msg.sender)
+    return manager
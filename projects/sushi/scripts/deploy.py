@@ -1,6 +1,13 @@
 import sys
 
-from brownie import RewardsManager, StakingRewardsSushi, Wei
+from brownie import (
+    RewardsFactory,
+    RewardsManager,
+    RewardsManagerFactory,
+    StakingRewardsSushi,
+    Wei,
+    web3,
+)
 
 from utils.config import (
     ldo_token_address,
@@ -9,16 +16,43 @@ from utils.config import (
     gas_price,
     get_is_live,
     get_deployer_account,
+    get_env,
+    get_env_flag,
     prompt_bool,
     lp_token_address,
 )
 
+from tooling.calldata import CalldataTemplate
+from tooling.create2 import caller_salt, create2_address
+from tooling.pipeline import PipelinedTx, contract_address, send_pipelined
+
+
+# calls to contracts deployed earlier in the same pipeline can't be estimated
+PIPELINED_CALL_GAS = 100_000
+
+set_rewards_contract = CalldataTemplate("set_rewards_contract(address)")
+transfer_ownership = CalldataTemplate("transfer_ownership(address)")
+
 
 def deploy_manager(tx_params):
     # Etherscan doesn't support Vyper verification yet
     return RewardsManager.deploy(tx_params, publish_source=False)
 
 
+def deploy_manager_factory(tx_params):
+    implementation = RewardsManager.deploy(tx_params, publish_source=False)
+    return RewardsManagerFactory.deploy(implementation, tx_params, publish_source=False)
+
+
+def deploy_manager_clone(manager_factory, tx_params):
+    """
+    Creates a manager behaving like `deploy_manager`'s as a minimal proxy
+    to the `manager_factory` implementation.
+    """
+    tx = manager_factory.create_manager(tx_params)
+    return RewardsManager.at(tx.events["ManagerCreated"]["manager"])
+
+
 def deploy_rewards(
     manager_contract, lp_token, rewards_duration, tx_params, publish_source=True
 ):
@@ -34,9 +68,12 @@ def deploy_rewards(
 
 
 def deploy_manager_and_rewards(
-    lp_token, rewards_duration, tx_params, publish_source=True
+    lp_token, rewards_duration, tx_params, publish_source=True, manager_factory=None
 ):
-    manager = deploy_manager(tx_params)
+    if manager_factory is None:
+        manager = deploy_manager(tx_params)
+    else:
+        manager = deploy_manager_clone(manager_factory, tx_params)
 
     rewards = deploy_rewards(
         manager_contract=manager,
@@ -53,6 +90,126 @@ def deploy_manager_and_rewards(
     return (manager, rewards)
 
 
+def deploy_manager_and_rewards_pipelined(
+    lp_token, rewards_duration, tx_params, publish_source=True
+):
+    """
+    Same as `deploy_manager_and_rewards`, but derives both contract addresses
+    from the deployer nonce, signs all four transactions up front and waits
+    for their confirmations together.
+    """
+    deployer = tx_params["from"]
+    nonce = deployer.nonce
+    manager_address = contract_address(deployer.address, nonce)
+    rewards_address = contract_address(deployer.address, nonce + 1)
+
+    manager_data = RewardsManager.deploy.encode_input()
+    rewards_data = StakingRewardsSushi.deploy.encode_input(
+        lido_dao_agent_address,  # _owner
+        manager_address,  # _rewardsDistribution
+        ldo_token_address,  # _rewardsToken
+        lp_token,  # _stakingToken
+        rewards_duration,  # _rewardsDuration
+    )
+
+    def estimate_deploy_gas(data):
+        return web3.eth.estimate_gas({"from": deployer.address, "data": data})
+
+    receipts = send_pipelined(
+        web3,
+        deployer.address,
+        [
+            PipelinedTx(None, manager_data, estimate_deploy_gas(manager_data)),
+            PipelinedTx(None, rewards_data, estimate_deploy_gas(rewards_data)),
+            PipelinedTx(
+                manager_address,
+                set_rewards_contract.encode_hex(rewards_address),
+                PIPELINED_CALL_GAS,
+            ),
+            PipelinedTx(
+                manager_address,
+                transfer_ownership.encode_hex(lido_dao_agent_address),
+                PIPELINED_CALL_GAS,
+            ),
+        ],
+        gas_price=Wei(tx_params.get("gas_price", web3.eth.gas_price)),
+        private_key=getattr(deployer, "private_key", None),
+        signer=getattr(deployer, "signer", None),
+        required_confs=tx_params.get("required_confs", 1),
+        nonce=nonce,
+    )
+
+    assert [r["contractAddress"] for r in receipts[:2]] == [
+        manager_address,
+        rewards_address,
+    ]
+
+    manager = RewardsManager.at(manager_address)
+    rewards = StakingRewardsSushi.at(rewards_address)
+    assert manager.rewards_contract() == rewards
+    assert manager.owner() == lido_dao_agent_address
+    assert rewards.rewardsDistribution() == manager
+
+    if publish_source:
+        StakingRewardsSushi.publish_source(rewards)
+
+    return (manager, rewards)
+
+
+def deploy_factory(tx_params):
+    # the factory only accepts the manager code compiled by this project
+    return RewardsFactory.deploy(web3.keccak(hexstr=RewardsManager.bytecode), tx_params)
+
+
+def predict_manager_and_rewards(factory, sender, salt, lp_token, rewards_duration):
+    """
+    Returns the addresses `factory.deployRewards` called by `sender` with
+    `salt` deploys the manager and rewards contracts at.
+    """
+    factory_salt = caller_salt(sender, salt)
+    manager_address = create2_address(factory, factory_salt, RewardsManager.bytecode)
+    rewards_address = create2_address(
+        factory,
+        factory_salt,
+        StakingRewardsSushi.deploy.encode_input(
+            lido_dao_agent_address,  # _owner
+            manager_address,  # _rewardsDistribution
+            ldo_token_address,  # _rewardsToken
+            lp_token,  # _stakingToken
+            rewards_duration,  # _rewardsDuration
+        ),
+    )
+    return (manager_address, rewards_address)
+
+
+def deploy_manager_and_rewards_via_factory(
+    factory, lp_token, rewards_duration, salt, tx_params, publish_source=True
+):
+    """
+    Same as `deploy_manager_and_rewards`, but deploys and wires both contracts
+    in a single `RewardsFactory` transaction.
+    """
+    (manager_address, rewards_address) = predict_manager_and_rewards(
+        factory, tx_params["from"], salt, lp_token, rewards_duration
+    )
+
+    tx = factory.deployRewards(
+        "0x" + RewardsManager.bytecode, lp_token, rewards_duration, salt, tx_params
+    )
+    assert tx.events["RewardsDeployed"]["manager"] == manager_address
+    assert tx.events["RewardsDeployed"]["rewards"] == rewards_address
+
+    manager = RewardsManager.at(manager_address)
+    rewards = StakingRewardsSushi.at(rewards_address)
+    assert manager.rewards_contract() == rewards
+    assert manager.owner() == lido_dao_agent_address
+
+    if publish_source:
+        StakingRewardsSushi.publish_source(rewards)
+
+    return (manager, rewards)
+
+
 def main():
     is_live = get_is_live()
     deployer = get_deployer_account(is_live)
@@ -69,9 +226,41 @@ def main():
         print("Aborting")
         return
 
-    deploy_manager_and_rewards(
+    tx_params = {"from": deployer, "gas_price": Wei(gas_price), "required_confs": 1}
+    factory_address = get_env("REWARDS_FACTORY", is_required=False)
+
+    if factory_address:
+        deploy_manager_and_rewards_via_factory(
+            factory=RewardsFactory.at(factory_address),
+            lp_token=lp_token_address,
+            rewards_duration=initial_rewards_duration_sec,
+            salt=get_env("SALT"),
+            tx_params=tx_params,
+            publish_source=is_live,
+        )
+        return
+
+    manager_factory_address = get_env("MANAGER_FACTORY", is_required=False)
+
+    if manager_factory_address:
+        deploy_manager_and_rewards(
+            lp_token=lp_token_address,
+            rewards_duration=initial_rewards_duration_sec,
+            tx_params=tx_params,
+            publish_source=is_live,
+            manager_factory=RewardsManagerFactory.at(manager_factory_address),
+        )
+        return
+
+    deploy = (
+        deploy_manager_and_rewards_pipelined
+        if get_env_flag("PIPELINED")
+        else deploy_manager_and_rewards
+    )
+
+    deploy(
         lp_token=lp_token_address,
         rewards_duration=initial_rewards_duration_sec,
-        tx_params={"from": deployer, "gas_price": Wei(gas_price), "required_confs": 1},
+        tx_params=tx_params,
         publish_source=is_live,
     )
@@ -1,6 +1,11 @@
 import pytest
 from brownie import Wei, ZERO_ADDRESS, DropToken, StakingRewardsSushi
-from scripts.deploy import deploy_manager_and_rewards
+from scripts.deploy import (
+    deploy_manager,
+    deploy_manager_and_rewards,
+    deploy_manager_clone,
+    deploy_manager_factory,
+)
 from utils.config import (
     ldo_token_address,
     lido_dao_agent_address,
@@ -15,6 +20,20 @@ from utils.config import (
     dai_address,
 )
 
+# rpc_cassette, local_dao and the setup timing hooks
+pytest_plugins = ["tooling.pytest_plugin"]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_module_setup(module_isolation):
+    # module-scoped fixtures deploy after the reset and are reverted with it
+    pass
+
+
+@pytest.fixture(scope="function", autouse=True)
+def shared_setup(fn_isolation):
+    pass
+
 
 @pytest.fixture
 def wsteth_token(interface):
@@ -31,7 +50,7 @@ def lp_token_sushi(interface):
     return interface.UniswapV2Pair(lp_token_address)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def lp_token_sushi_mock(ape):
     return DropToken.deploy("SUSHI LP", "SLP", 18, 1000000 * 10 ** 18, {"from": ape})
 
@@ -41,17 +60,17 @@ def sushiswap_router(interface):
     return interface.UniswapV2Router02(sushiswap_router_address)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def master_chef_v2(interface):
     return interface.MasterChefV2(sushi_master_chef_v2)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def master_chef_v2_owner(accounts):
     return accounts.at("0x19b3eb3af5d93b77a5619b047de0eed7115a19e7", force=True)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def staking_rewards_sushi(
     ape,
     rewards_manager,
@@ -121,9 +140,18 @@ def ldo_token(interface):
     return interface.ERC20(ldo_token_address)
 
 
-@pytest.fixture(scope="function")
-def rewards_manager(RewardsManager, ape):
-    return RewardsManager.deploy({"from": ape})
+@pytest.fixture(scope="module", params=["deployed", "clone"])
+def new_rewards_manager(request, ape):
+    # RewardsManager tests run against both a regular deployment and a clone
+    if request.param == "deployed":
+        return lambda: deploy_manager({"from": ape})
+    manager_factory = deploy_manager_factory({"from": ape})
+    return lambda: deploy_manager_clone(manager_factory, {"from": ape})
+
+
+@pytest.fixture(scope="module")
+def rewards_manager(ape):
+    return deploy_manager({"from": ape})
 
 
 @pytest.fixture
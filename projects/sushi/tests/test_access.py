@@ -5,6 +5,11 @@ from scripts.deploy import deploy_manager_and_rewards
 from utils.config import initial_rewards_duration_sec
 
 
+@pytest.fixture(scope="module")
+def rewards_manager(new_rewards_manager):
+    return new_rewards_manager()
+
+
 def test_owner_is_deployer(rewards_manager, ape):
     assert rewards_manager.owner() == ape
 
@@ -0,0 +1,24 @@
+from scripts.deploy import deploy_manager_and_rewards_pipelined
+from utils.config import ldo_token_address, lido_dao_agent_address
+
+rewards_period = 60 * 60 * 24 * 7
+
+
+def test_pipelined_deploy_wires_contracts(ape, lp_token_sushi_mock):
+    nonce = ape.nonce
+
+    (manager, rewards) = deploy_manager_and_rewards_pipelined(
+        lp_token=lp_token_sushi_mock,
+        rewards_duration=rewards_period,
+        tx_params={"from": ape},
+        publish_source=False,
+    )
+
+    assert ape.nonce == nonce + 4
+    assert manager.owner() == lido_dao_agent_address
+    assert manager.rewards_contract() == rewards
+    assert rewards.owner() == lido_dao_agent_address
+    assert rewards.rewardsDistribution() == manager
+    assert rewards.rewardsToken() == ldo_token_address
+    assert rewards.stakingToken() == lp_token_sushi_mock
+    assert rewards.rewardsDuration() == rewards_period
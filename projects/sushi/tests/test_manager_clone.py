@@ -0,0 +1,64 @@
+from brownie import reverts, ZERO_ADDRESS
+from scripts.deploy import (
+    deploy_manager,
+    deploy_manager_and_rewards,
+    deploy_manager_clone,
+    deploy_manager_factory,
+)
+from utils.config import lido_dao_agent_address
+
+# EIP-1167 minimal proxy runtime code
+CLONE_CODE_SIZE = 45
+rewards_period = 60 * 60 * 24 * 7
+
+
+def test_clone_is_a_cheap_minimal_proxy(ape, web3, history):
+    deploy_manager({"from": ape})
+    full_gas = history[-1].gas_used
+
+    clone = deploy_manager_clone(deploy_manager_factory({"from": ape}), {"from": ape})
+    clone_gas = history[-1].gas_used
+
+    assert len(web3.eth.get_code(clone.address)) == CLONE_CODE_SIZE
+    assert clone_gas < full_gas // 3
+
+
+def test_clone_can_not_be_initialized_again(ape, stranger):
+    clone = deploy_manager_clone(deploy_manager_factory({"from": ape}), {"from": ape})
+
+    with reverts("already initialized"):
+        clone.initialize(stranger, {"from": stranger})
+
+    clone.transfer_ownership(ZERO_ADDRESS, {"from": ape})
+    with reverts("already initialized"):
+        clone.initialize(stranger, {"from": stranger})
+
+
+def test_implementation_can_not_be_initialized(ape, stranger, RewardsManager):
+    manager_factory = deploy_manager_factory({"from": ape})
+    implementation = RewardsManager.at(manager_factory.implementation())
+
+    with reverts("already initialized"):
+        implementation.initialize(stranger, {"from": stranger})
+
+
+def test_deployed_manager_can_not_be_initialized(ape, stranger):
+    manager = deploy_manager({"from": ape})
+
+    with reverts("already initialized"):
+        manager.initialize(stranger, {"from": stranger})
+    assert manager.owner() == ape
+
+
+def test_deploy_with_cloned_manager(ape, lp_token_sushi_mock):
+    (manager, rewards) = deploy_manager_and_rewards(
+        lp_token=lp_token_sushi_mock,
+        rewards_duration=rewards_period,
+        tx_params={"from": ape},
+        publish_source=False,
+        manager_factory=deploy_manager_factory({"from": ape}),
+    )
+
+    assert manager.owner() == lido_dao_agent_address
+    assert manager.rewards_contract() == rewards
+    assert rewards.rewardsDistribution() == manager
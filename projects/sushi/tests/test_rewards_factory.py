@@ -0,0 +1,53 @@
+import brownie
+from scripts.deploy import (
+    deploy_factory,
+    deploy_manager_and_rewards_via_factory,
+    predict_manager_and_rewards,
+)
+from utils.config import ldo_token_address, lido_dao_agent_address
+
+rewards_period = 60 * 60 * 24 * 7
+salt = "0x" + "01" * 32
+
+
+def test_factory_deploys_wired_contracts_at_predicted_addresses(ape, lp_token_sushi_mock):
+    factory = deploy_factory({"from": ape})
+    predicted = predict_manager_and_rewards(
+        factory, ape, salt, lp_token_sushi_mock, rewards_period
+    )
+    nonce = ape.nonce
+
+    (manager, rewards) = deploy_manager_and_rewards_via_factory(
+        factory=factory,
+        lp_token=lp_token_sushi_mock,
+        rewards_duration=rewards_period,
+        salt=salt,
+        tx_params={"from": ape},
+        publish_source=False,
+    )
+
+    assert ape.nonce == nonce + 1
+    assert (manager.address, rewards.address) == predicted
+    assert manager.owner() == lido_dao_agent_address
+    assert manager.rewards_contract() == rewards
+    assert rewards.owner() == lido_dao_agent_address
+    assert rewards.rewardsDistribution() == manager
+    assert rewards.rewardsToken() == ldo_token_address
+    assert rewards.stakingToken() == lp_token_sushi_mock
+    assert rewards.rewardsDuration() == rewards_period
+
+
+def test_factory_rejects_reused_salt(ape, lp_token_sushi_mock):
+    factory = deploy_factory({"from": ape})
+    deploy_manager_and_rewards_via_factory(
+        factory, lp_token_sushi_mock, rewards_period, salt, {"from": ape}, publish_source=False
+    )
+
+    with brownie.reverts("deployment failed"):
+        factory.deployRewards(
+            "0x" + brownie.RewardsManager.bytecode,
+            lp_token_sushi_mock,
+            rewards_period,
+            salt,
+            {"from": ape},
+        )
@@ -0,0 +1,56 @@
+import pytest
+from brownie import DropToken, StakingRewardsSushi, chain, web3
+from tooling.protocol_mocks import MAINNET_ADDRESSES, UnsupportedNode, install_stand_ins
+from utils.config import initial_rewards_duration_sec
+
+DEPOSIT_AMOUNT = 1000 * 10 ** 18
+REWARD_AMOUNT = 100_000 * 10 ** 18
+
+
+@pytest.fixture(scope="module")
+def stand_ins(ape):
+    if len(web3.eth.get_code(MAINNET_ADDRESSES["master_chef_v2"])) > 0:
+        pytest.skip("the stand-ins are installed on a fresh chain, run with --network stand-ins")
+    try:
+        return install_stand_ins(ape, ["ldo", "master_chef_v2"])
+    except UnsupportedNode as err:
+        pytest.skip(str(err))
+
+
+def test_rewards_through_master_chef_stand_in(ape, accounts, stand_ins):
+    user = accounts[1]
+    distributor = accounts[2]
+    master_chef_v2 = stand_ins.master_chef_v2
+
+    lp_token = DropToken.deploy("SUSHI LP", "SLP", 18, 1000000 * 10 ** 18, {"from": ape})
+    staking_rewards_sushi = StakingRewardsSushi.deploy(
+        ape,
+        distributor,
+        stand_ins.ldo,
+        lp_token,
+        initial_rewards_duration_sec,
+        {"from": ape},
+    )
+    assert staking_rewards_sushi.MASTERCHEF_V2() == master_chef_v2
+    master_chef_v2.add(100, lp_token, staking_rewards_sushi, {"from": ape})
+    pid = master_chef_v2.poolLength() - 1
+
+    stand_ins.ldo.mint(distributor, REWARD_AMOUNT, {"from": ape})
+    stand_ins.ldo.approve(staking_rewards_sushi, REWARD_AMOUNT, {"from": distributor})
+    staking_rewards_sushi.notifyRewardAmount(REWARD_AMOUNT, distributor, {"from": distributor})
+
+    lp_token.transfer(user, DEPOSIT_AMOUNT, {"from": ape})
+    lp_token.approve(master_chef_v2, DEPOSIT_AMOUNT, {"from": user})
+    master_chef_v2.deposit(pid, DEPOSIT_AMOUNT, user, {"from": user})
+    assert staking_rewards_sushi.totalSupply() == DEPOSIT_AMOUNT
+    assert staking_rewards_sushi.balanceOf(user) == DEPOSIT_AMOUNT
+
+    chain.sleep(initial_rewards_duration_sec // 2)
+    chain.mine()
+    earned = staking_rewards_sushi.earned(user)
+    assert earned > 0
+
+    master_chef_v2.withdrawAndHarvest(pid, DEPOSIT_AMOUNT, user, {"from": user})
+    assert stand_ins.ldo.balanceOf(user) >= earned
+    assert lp_token.balanceOf(user) == DEPOSIT_AMOUNT
+    assert staking_rewards_sushi.balanceOf(user) == 0
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Make the monorepo-wide `tooling` package importable from project scripts and tests.
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if _repo_root not in sys.path:
+    sys.path.append(_repo_root)
@@ -1,6 +1,5 @@
 import os
 import sys
-from brownie import network, accounts
 
 wsteth_address = "0x7f39c581f595b53c5cb19bd0b3f8da6c935e2ca0"
 dai_address = "0x6b175474e89094c44da98b954eedeac495271d0f"
@@ -13,6 +12,15 @@ lido_dao_voting_address = "0x2e59A20f205bB85a89C53f1936454680651E618e"
 lido_dao_token_manager_address = "0xf73a1260d222f447210581DDf212D915c09a3249"
 sushi_master_chef_v2 = "0xEF0881eC094552b2e128Cf945EF17a6752B4Ec5d"
 
+if os.environ.get("LIDO_DAO_APPS") == "local":
+    # stand-ins deployed by tooling.aragon_mocks, for governance tests without a fork
+    from tooling.aragon_mocks import LOCAL_DAO_ADDRESSES
+    ldo_token_address = LOCAL_DAO_ADDRESSES["token"]
+    lido_dao_agent_address = LOCAL_DAO_ADDRESSES["agent"]
+    lido_dao_finance_address = LOCAL_DAO_ADDRESSES["finance"]
+    lido_dao_voting_address = LOCAL_DAO_ADDRESSES["voting"]
+    lido_dao_token_manager_address = LOCAL_DAO_ADDRESSES["token_manager"]
+
 initial_rewards_duration_sec = 60 * 60 * 24 * 30  # one month
 
 
@@ -20,16 +28,34 @@ gas_price = "90 gwei"
 
 
 def get_is_live():
+    from brownie import network
+
     return network.show_active() != "development"
 
 
+def get_env(name, is_required=True, message=None, default=None):
+    if name not in os.environ:
+        if is_required:
+            raise EnvironmentError(message or f"Please set {name} env variable")
+        else:
+            return default
+    return os.environ[name]
+
+
+def get_env_flag(name):
+    return get_env(name, is_required=False, default="").strip().lower() in ("1", "true", "yes")
+
+
 def get_deployer_account(is_live):
+    from brownie import accounts
+    from tooling.signing_agent import load_account
+
     if is_live and "DEPLOYER" not in os.environ:
         raise EnvironmentError(
             "Please set DEPLOYER env variable to the deployer account name"
         )
 
-    return accounts.load(os.environ["DEPLOYER"]) if is_live else accounts[0]
+    return load_account(os.environ["DEPLOYER"]) if is_live else accounts[0]
 
 
 def prompt_bool():
@@ -0,0 +1,231 @@
+"""
+Selector-to-ABI index built from the Brownie artifacts of every project.
+
+The index is persisted to disk and keyed by a hash of the artifacts it was
+built from, so it is only rebuilt when a project is recompiled or an
+interface changes. Decoding calldata with it needs neither a compiler nor
+a loaded Brownie project:
+
+    python -m tooling.abi_index decode <calldata or call script>
+"""
+import hashlib
+import json
+import os
+import sys
+from collections import namedtuple
+
+from tooling.evm_script import decode_call_script, format_address, to_bytes
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PROJECTS_ROOT = os.path.join(REPO_ROOT, 'projects')
+DEFAULT_CACHE_PATH = os.path.join(REPO_ROOT, '.cache', 'selector_index.json')
+
+ARTIFACT_DIRS = ('build/contracts', 'build/interfaces', 'interfaces')
+
+CALL_SCRIPT_SPEC_ID = 1
+SELECTOR_LENGTH = 4
+
+
+DecodedCall = namedtuple('DecodedCall', ['selector', 'signature', 'name', 'args'])
+DecodedArg = namedtuple('DecodedArg', ['name', 'type', 'value', 'script'])
+DecodedAction = namedtuple('DecodedAction', ['to', 'call', 'calldata'])
+
+
+def find_artifacts(projects_root=PROJECTS_ROOT):
+    paths = []
+    for project in sorted(os.listdir(projects_root)):
+        for artifact_dir in ARTIFACT_DIRS:
+            path = os.path.join(projects_root, project, artifact_dir)
+            if not os.path.isdir(path):
+                continue
+            paths += [
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.endswith('.json')
+            ]
+    return paths
+
+
+def hash_artifacts(paths, projects_root=PROJECTS_ROOT):
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.relpath(path, projects_root).encode())
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def canonical_type(abi_input):
+    abi_type = abi_input['type']
+    if not abi_type.startswith('tuple'):
+        return abi_type
+    components = ','.join(canonical_type(c) for c in abi_input['components'])
+    return f'({components}){abi_type[len("tuple"):]}'
+
+
+def function_signature(abi_entry):
+    types = ','.join(canonical_type(i) for i in abi_entry['inputs'])
+    return f'{abi_entry["name"]}({types})'
+
+
+def function_selector(signature):
+    from eth_utils import keccak
+    return '0x' + keccak(text=signature)[:SELECTOR_LENGTH].hex()
+
+
+def read_abi(path):
+    with open(path) as f:
+        artifact = json.load(f)
+    # build artifacts wrap the ABI, source interfaces are a bare list
+    return artifact['abi'] if isinstance(artifact, dict) else artifact
+
+
+def build_selectors(paths):
+    selectors = {}
+    for path in paths:
+        contract_name = os.path.splitext(os.path.basename(path))[0]
+        for abi_entry in read_abi(path):
+            if abi_entry.get('type') != 'function':
+                continue
+            signature = function_signature(abi_entry)
+            entries = selectors.setdefault(function_selector(signature), {})
+            entry = entries.setdefault(signature, {
+                'name': abi_entry['name'],
+                'inputs': abi_entry['inputs'],
+                'contracts': [],
+            })
+            if contract_name not in entry['contracts']:
+                entry['contracts'].append(contract_name)
+    return selectors
+
+
+class SelectorIndex:
+    def __init__(self, selectors, artifacts_hash=None):
+        self.selectors = selectors
+        self.artifacts_hash = artifacts_hash
+
+    @classmethod
+    def load(cls, projects_root=PROJECTS_ROOT, cache_path=DEFAULT_CACHE_PATH):
+        """
+        Returns the index for the current artifacts, reading it from
+        `cache_path` when the artifacts are unchanged and rebuilding it otherwise.
+        """
+        paths = find_artifacts(projects_root)
+        artifacts_hash = hash_artifacts(paths, projects_root)
+
+        if cache_path is not None and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                cached = json.load(f)
+            if cached.get('artifacts_hash') == artifacts_hash:
+                return cls(cached['selectors'], artifacts_hash)
+
+        index = cls(build_selectors(paths), artifacts_hash)
+        if cache_path is not None:
+            index.save(cache_path)
+        return index
+
+    def save(self, cache_path):
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'artifacts_hash': self.artifacts_hash, 'selectors': self.selectors}, f)
+        os.replace(tmp_path, cache_path)
+
+    def lookup(self, selector):
+        """
+        Returns the ABI entries matching a selector, keyed by signature.
+        More than one entry means a selector collision.
+        """
+        if not isinstance(selector, str):
+            selector = '0x' + bytes(selector).hex()
+        return self.selectors.get(selector.lower(), {})
+
+    def decode_calldata(self, calldata):
+        """
+        Decodes calldata into a `DecodedCall`, or returns `None` for an unknown
+        selector. `bytes` arguments holding a call script are decoded recursively.
+        """
+        from eth_abi import decode_abi
+
+        calldata = bytes(to_bytes(calldata))
+        if len(calldata) < SELECTOR_LENGTH:
+            return None
+        selector = '0x' + calldata[:SELECTOR_LENGTH].hex()
+
+        for signature, entry in self.lookup(selector).items():
+            types = [canonical_type(i) for i in entry['inputs']]
+            try:
+                values = decode_abi(types, calldata[SELECTOR_LENGTH:])
+            except Exception:
+                # a colliding selector with a different layout
+                continue
+            args = [
+                DecodedArg(abi_input['name'], abi_type, value, self._try_decode_script(abi_type, value))
+                for abi_input, abi_type, value in zip(entry['inputs'], types, values)
+            ]
+            return DecodedCall(selector, signature, entry['name'], args)
+
+        return None
+
+    def decode_call_script(self, script):
+        """
+        Decodes every action of a call script. Raises `ValueError` for a
+        malformed script.
+        """
+        _, actions = decode_call_script(script)
+        return [
+            DecodedAction(format_address(to), self.decode_calldata(calldata), bytes(calldata))
+            for to, calldata in actions
+        ]
+
+    def _try_decode_script(self, abi_type, value):
+        if abi_type != 'bytes' or len(value) < SELECTOR_LENGTH:
+            return None
+        if int.from_bytes(value[:SELECTOR_LENGTH], 'big') != CALL_SCRIPT_SPEC_ID:
+            return None
+        try:
+            return self.decode_call_script(value)
+        except ValueError:
+            return None
+
+
+def format_decoded_script(actions, indent=0):
+    lines = []
+    pad = '  ' * indent
+    for action in actions:
+        if action.call is None:
+            lines.append(f'{pad}{action.to}: unknown call 0x{action.calldata.hex()}')
+            continue
+        lines.append(f'{pad}{action.to}: {action.call.signature}')
+        for arg in action.call.args:
+            if arg.script is not None:
+                lines.append(f'{pad}  {arg.name} ({arg.type}): call script')
+                lines += format_decoded_script(arg.script, indent + 2)
+            else:
+                value = '0x' + arg.value.hex() if isinstance(arg.value, bytes) else arg.value
+                lines.append(f'{pad}  {arg.name} ({arg.type}): {value}')
+    return lines
+
+
+def main(argv):
+    if argv[:1] == ['build'] and len(argv) == 1:
+        index = SelectorIndex.load()
+        print(f'{len(index.selectors)} selectors, artifacts hash {index.artifacts_hash}')
+        return 0
+
+    if argv[:1] != ['decode'] or len(argv) != 2:
+        print('usage: python -m tooling.abi_index build | decode <calldata or call script>')
+        return 1
+
+    index = SelectorIndex.load()
+    data = to_bytes(argv[1])
+    if int.from_bytes(data[:SELECTOR_LENGTH], 'big') == CALL_SCRIPT_SPEC_ID:
+        print('\n'.join(format_decoded_script(index.decode_call_script(data))))
+    else:
+        print(index.decode_calldata(data))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
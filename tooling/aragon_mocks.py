@@ -0,0 +1,108 @@
+"""
+Local stand-ins for the Lido DAO token and Aragon apps.
+
+The projects' governance tests drive the real Voting, TokenManager, Finance
+and Agent apps on a mainnet fork. The contracts in `contracts/LidoDaoMocks.sol`
+have the same ABI surface and run EVM scripts the same way, and deploy onto a
+plain local chain. They are always deployed by `LOCAL_DAO_DEPLOYER` with
+nonces 0..4, so their addresses are known up front and
+
+    LIDO_DAO_APPS=local brownie test
+
+makes the projects' `utils.config` point `ldo_token_address` and the
+`lido_dao_*_address` constants at them (the conftests deploy them once per
+session in that case).
+"""
+import functools
+import os
+from collections import namedtuple
+
+
+LOCAL_DAO_DEPLOYER = '0xDA00000000000000000000000000000000000000'
+
+# deployment order, i.e. the deployer nonce of each contract
+LOCAL_DAO_CONTRACTS = ['token', 'agent', 'voting', 'finance', 'token_manager']
+
+# `tooling.pipeline.contract_address(LOCAL_DAO_DEPLOYER, nonce)`, precomputed so
+# `utils.config` doesn't need eth_utils
+LOCAL_DAO_ADDRESSES = {
+    'token': '0x419fe930bbfEb303468A03f5bc108905C001D05b',
+    'agent': '0x521691Ba6d8c5Be31A8aae735D2C332c23D1D423',
+    'voting': '0x408a11bdA049B151779A1EeD44396Cdf3Ba58B3b',
+    'finance': '0x7E7FDE10a15Bc3c9B7e07d21FbeFdd3b648252e4',
+    'token_manager': '0x437fE240CBC30DE60F47e5172c100F9B923B75C9',
+}
+
+# the live Lido DAO settings
+SUPPORT_REQUIRED_PCT = 50 * 10 ** 16
+MIN_ACCEPT_QUORUM_PCT = 5 * 10 ** 16
+VOTE_TIME = 72 * 60 * 60
+
+SOURCE_PATH = os.path.join(os.path.dirname(__file__), 'contracts', 'LidoDaoMocks.sol')
+
+LocalDao = namedtuple('LocalDao', LOCAL_DAO_CONTRACTS)
+
+
+def use_local_dao():
+    return os.environ.get('LIDO_DAO_APPS') == 'local'
+
+
+@functools.lru_cache(maxsize=None)
+def compile_mocks():
+    from brownie import compile_source
+
+    with open(SOURCE_PATH) as f:
+        return compile_source(f.read())
+
+
+def _at(name, container):
+    from brownie import Contract
+    return Contract.from_abi(container._name, LOCAL_DAO_ADDRESSES[name], container.abi)
+
+
+def deploy_local_dao(funder, holders=(), treasury=0):
+    """
+    Deploys the stand-ins, unless they already are, and returns them as a
+    `LocalDao`. `holders` are `(address, amount)` LDO balances to mint and
+    `treasury` the LDO balance of the Agent.
+    """
+    from brownie import accounts, web3
+
+    mocks = compile_mocks()
+    containers = {
+        'token': mocks.MockMiniMeToken,
+        'agent': mocks.MockAgent,
+        'voting': mocks.MockVoting,
+        'finance': mocks.MockFinance,
+        'token_manager': mocks.MockTokenManager,
+    }
+
+    if len(web3.eth.get_code(LOCAL_DAO_ADDRESSES['token_manager'])) == 0:
+        deployer = accounts.at(LOCAL_DAO_DEPLOYER, force=True)
+        if deployer.nonce != 0:
+            raise RuntimeError(f'{LOCAL_DAO_DEPLOYER} has been used, the stand-ins would get other addresses')
+        funder.transfer(deployer, '1 ether')
+        tx_params = {'from': deployer}
+
+        addresses = LOCAL_DAO_ADDRESSES
+        containers['token'].deploy(addresses['token_manager'], tx_params)
+        containers['agent'].deploy(addresses['voting'], addresses['finance'], tx_params)
+        containers['voting'].deploy(
+            addresses['token'],
+            addresses['token_manager'],
+            SUPPORT_REQUIRED_PCT,
+            MIN_ACCEPT_QUORUM_PCT,
+            VOTE_TIME,
+            tx_params
+        )
+        containers['finance'].deploy(addresses['agent'], addresses['voting'], tx_params)
+        containers['token_manager'].deploy(addresses['token'], addresses['voting'], deployer, tx_params)
+
+    dao = LocalDao(**{name: _at(name, container) for name, container in containers.items()})
+
+    manager = {'from': accounts.at(LOCAL_DAO_DEPLOYER, force=True)}
+    for holder, amount in holders:
+        dao.token_manager.mint(holder, amount, manager)
+    if treasury:
+        dao.token_manager.mint(dao.agent, treasury, manager)
+    return dao
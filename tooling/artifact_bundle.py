@@ -0,0 +1,188 @@
+"""
+Precompiled artifact bundles for vendored contract trees.
+
+Brownie compiles every source under a project's `contracts` directory, so a
+project vendoring a large third-party tree (arcx vendors the whole ARCx
+protocol in `contracts/arcx_contracts`) pays for compiling all of it on a
+fresh checkout. A bundle holds the Brownie artifacts of such a subtree,
+together with the hashes of the sources they were compiled from:
+
+    python -m tooling.artifact_bundle build arcx contracts/arcx_contracts
+    python -m tooling.artifact_bundle install arcx
+
+`install` verifies the bundle against the sources on disk and the project's
+compiler settings and copies the artifacts into `build/contracts`, where
+Brownie accepts them, so only the project's own contracts get compiled.
+A bundle that doesn't match is rejected and Brownie compiles as usual.
+
+The builds (`tooling.compile_cache compile` and `tooling.parallel_build`) do
+both for the projects in `BUNDLED_SUBTREES`: they install a matching bundle
+before compiling and rebuild a missing or outdated one afterwards, so the
+bundle to commit is always the one the last build left behind.
+"""
+import hashlib
+import json
+import os
+import sys
+
+from tooling.compile_cache import compiler_settings, list_sources, project_path
+
+
+BUNDLE_FILE = 'artifact_bundle.json'
+
+# vendored trees shipped as a bundle, by project
+BUNDLED_SUBTREES = {
+    'arcx': os.path.join('contracts', 'arcx_contracts'),
+}
+
+
+class BundleMismatch(Exception):
+    pass
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        return _sha256(f.read())
+
+
+def _artifact_sha256(artifact):
+    return _sha256(json.dumps(artifact, sort_keys=True).encode())
+
+
+def _subtree_sources(path, subtree):
+    prefix = os.path.normpath(subtree) + os.sep
+    return [source for source in list_sources(path) if source.startswith(prefix)]
+
+
+def bundle_path(path):
+    return os.path.join(path, BUNDLE_FILE)
+
+
+def build_bundle(path, subtree):
+    """
+    Collects the artifacts of the sources under `subtree` from the project's
+    build directory, which must be freshly compiled, into the bundle file.
+    """
+    sources = _subtree_sources(path, subtree)
+    build_dir = os.path.join(path, 'build', 'contracts')
+    artifacts = {}
+    for name in sorted(os.listdir(build_dir)):
+        with open(os.path.join(build_dir, name)) as f:
+            artifact = json.load(f)
+        if artifact.get('sourcePath') in sources:
+            artifacts[name] = artifact
+
+    compiled = {artifact['sourcePath'] for artifact in artifacts.values()}
+    missing = [source for source in sources if source not in compiled]
+    if missing:
+        raise BundleMismatch(f'not compiled, run `brownie compile` first: {", ".join(missing)}')
+
+    bundle = {
+        'subtree': os.path.normpath(subtree),
+        'compiler_settings': compiler_settings(path),
+        'sources': {source: _file_sha256(os.path.join(path, source)) for source in sources},
+        'artifact_hashes': {name: _artifact_sha256(artifact) for name, artifact in artifacts.items()},
+        'artifacts': artifacts,
+    }
+    with open(bundle_path(path), 'w') as f:
+        json.dump(bundle, f, sort_keys=True)
+        f.write('\n')
+    return bundle
+
+
+def verify_bundle(path, bundle):
+    """
+    Raises `BundleMismatch` unless the bundle was built from the sources
+    currently on disk with the project's current compiler settings.
+    """
+    if bundle['compiler_settings'] != compiler_settings(path):
+        raise BundleMismatch('compiler settings changed since the bundle was built')
+
+    sources = _subtree_sources(path, bundle['subtree'])
+    if sorted(sources) != sorted(bundle['sources']):
+        added = set(sources) - set(bundle['sources'])
+        removed = set(bundle['sources']) - set(sources)
+        raise BundleMismatch(f'sources added {sorted(added)} or removed {sorted(removed)}')
+    for source, digest in bundle['sources'].items():
+        if _file_sha256(os.path.join(path, source)) != digest:
+            raise BundleMismatch(f'{source} changed since the bundle was built')
+
+    for name, artifact in bundle['artifacts'].items():
+        if _artifact_sha256(artifact) != bundle['artifact_hashes'].get(name):
+            raise BundleMismatch(f'artifact {name} is corrupted')
+        # the same check Brownie makes before reusing an artifact
+        with open(os.path.join(path, artifact['sourcePath']), 'rb') as f:
+            if hashlib.sha1(f.read()).hexdigest() != artifact['sha1']:
+                raise BundleMismatch(f'artifact {name} was compiled from another source')
+
+
+def load_bundle(path):
+    with open(bundle_path(path)) as f:
+        return json.load(f)
+
+
+def install_bundle(path):
+    """
+    Verifies the project's bundle and writes its artifacts into the build
+    directory. Returns the number of installed artifacts.
+    """
+    bundle = load_bundle(path)
+    verify_bundle(path, bundle)
+
+    build_dir = os.path.join(path, 'build', 'contracts')
+    os.makedirs(build_dir, exist_ok=True)
+    for name, artifact in bundle['artifacts'].items():
+        with open(os.path.join(build_dir, name), 'w') as f:
+            json.dump(artifact, f, indent=2)
+    return len(bundle['artifacts'])
+
+
+def install_matching_bundle(path):
+    """
+    Same as `install_bundle`, but returns 0 when the project has no bundle or
+    it doesn't match, leaving the sources to Brownie.
+    """
+    try:
+        return install_bundle(path)
+    except (BundleMismatch, FileNotFoundError):
+        return 0
+
+
+def refresh_bundle(path, subtree):
+    """
+    Rebuilds the project's bundle from its freshly compiled build directory
+    unless the bundle already matches the sources. Returns whether it did.
+    """
+    try:
+        verify_bundle(path, load_bundle(path))
+        return False
+    except (BundleMismatch, FileNotFoundError):
+        build_bundle(path, subtree)
+        return True
+
+
+def main(argv):
+    if len(argv) == 3 and argv[0] == 'build':
+        bundle = build_bundle(project_path(argv[1]), argv[2])
+        print(f'bundled {len(bundle["artifacts"])} artifacts of {len(bundle["sources"])} sources')
+        return 0
+
+    if len(argv) == 2 and argv[0] == 'install':
+        try:
+            count = install_bundle(project_path(argv[1]))
+        except (BundleMismatch, FileNotFoundError) as err:
+            print(f'bundle not installed, Brownie will compile all sources: {err}')
+            return 1
+        print(f'installed {count} prebuilt artifacts')
+        return 0
+
+    print('usage: python -m tooling.artifact_bundle build <project> <subtree> | install <project>')
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
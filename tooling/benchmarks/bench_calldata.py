@@ -0,0 +1,41 @@
+"""
+Encodes a bulk Finance payout (one newImmediatePayment per recipient) into
+a single EVM script with a precompiled calldata template.
+
+    python -m tooling.benchmarks.bench_calldata [payments]
+"""
+import sys
+import time
+
+from tooling.calldata import CalldataTemplate
+from tooling.evm_script import encode_call_script
+
+
+FINANCE = '0xB9E5CBB9CA5b0d659238807E84D0176930753d86'
+LDO = '0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32'
+# newImmediatePayment(address,address,uint256,string), passed explicitly so
+# the benchmark doesn't need eth_utils
+NEW_IMMEDIATE_PAYMENT_SELECTOR = '0xf6364846'
+
+
+def main(payments_count=5_000):
+    payments = [
+        (LDO, '0x' + f'{i + 1:040x}', (i + 1) * 10 ** 18, f'Reward program #{i}')
+        for i in range(payments_count)
+    ]
+
+    start = time.perf_counter()
+    template = CalldataTemplate(
+        'newImmediatePayment(address,address,uint256,string)',
+        NEW_IMMEDIATE_PAYMENT_SELECTOR
+    )
+    script = encode_call_script(template.actions(FINANCE, payments))
+    elapsed = time.perf_counter() - start
+
+    print(f'payments:     {payments_count}')
+    print(f'script size:  {(len(script) - 2) // 2} bytes')
+    print(f'encoded in:   {elapsed * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
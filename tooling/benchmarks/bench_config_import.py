@@ -0,0 +1,53 @@
+"""
+Measures how long importing each project's read-only helpers takes in a
+fresh interpreter and checks that it doesn't pull in Brownie.
+
+    python -m tooling.benchmarks.bench_config_import
+"""
+import json
+import os
+import subprocess
+import sys
+
+from tooling.compile_cache import list_projects, project_path
+
+
+IMPORT_BUDGET_MS = 100
+
+MEASURE = '''
+import json, os, sys, time
+start = time.perf_counter()
+import utils.config
+if os.path.exists(os.path.join('utils', 'evm_script.py')):
+    import utils.evm_script
+elapsed = time.perf_counter() - start
+print(json.dumps({'ms': elapsed * 1000, 'brownie': 'brownie' in sys.modules}))
+'''
+
+
+def measure(path):
+    output = subprocess.run(
+        [sys.executable, '-c', MEASURE],
+        cwd=path,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    over_budget = []
+    for project in list_projects():
+        path = project_path(project)
+        if not os.path.exists(os.path.join(path, 'utils', 'config.py')):
+            continue
+        result = measure(path)
+        print(f'{project}: {result["ms"]:.1f}ms' + (', imports brownie' if result['brownie'] else ''))
+        if result['ms'] > IMPORT_BUDGET_MS or result['brownie']:
+            over_budget.append(project)
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Compares the bytes-based `encode_call_script` against the previous
+hex-string implementation on large multi-action scripts.
+
+    python -m tooling.benchmarks.bench_evm_script [actions]
+"""
+import sys
+import time
+
+from tooling.evm_script import encode_call_script
+
+
+FINANCE = '0xB9E5CBB9CA5b0d659238807E84D0176930753d86'
+# Finance.newImmediatePayment calldata with a short reference string
+PAYMENT_CALLDATA = '0xf6364846' + 'ab' * 224
+
+
+def legacy_encode_call_script(actions, spec_id=1):
+    # The previous implementation: per-action int256 ABI encoding and
+    # hex-string concatenation.
+    import eth_abi
+    from web3 import Web3
+
+    result = '0x' + str(spec_id).zfill(8)
+    for to, calldata in actions:
+        calldata_bytes = calldata[2:] if calldata[0:2] == '0x' else calldata
+        length = eth_abi.encode_single('int256', len(calldata_bytes) // 2).hex()
+        result += Web3.toBytes(hexstr=to).hex() + length[56:] + calldata_bytes
+    return result
+
+
+def measure(fn, actions):
+    start = time.perf_counter()
+    result = fn(actions)
+    return result, time.perf_counter() - start
+
+
+def main(actions_count=10_000):
+    actions = [(FINANCE, PAYMENT_CALLDATA)] * actions_count
+
+    script, encode_time = measure(encode_call_script, actions)
+
+    print(f'actions:            {actions_count}')
+    print(f'script size:        {(len(script) - 2) // 2} bytes')
+    print(f'bytearray encoder:  {encode_time * 1000:.1f} ms')
+
+    try:
+        legacy_script, legacy_time = measure(legacy_encode_call_script, actions)
+    except ImportError:
+        print('legacy encoder:     skipped, eth_abi and web3 are not installed')
+        return
+
+    assert script == legacy_script
+    print(f'legacy encoder:     {legacy_time * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
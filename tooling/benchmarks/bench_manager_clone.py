@@ -0,0 +1,61 @@
+"""
+Compares the gas of a full RewardsManager deployment with creating a clone
+through the project's RewardsManagerFactory, on Brownie's development network.
+
+    python -m tooling.benchmarks.bench_manager_clone [curve|sushi]
+"""
+import os
+import sys
+
+from tooling.compile_cache import list_projects, project_path
+
+
+def clone_projects():
+    return [
+        name for name in list_projects()
+        if os.path.exists(os.path.join(project_path(name), 'contracts', 'RewardsManagerFactory.vy'))
+    ]
+
+
+def measure(project):
+    from brownie import accounts, network, web3
+    from brownie import project as brownie_project
+
+    loaded = brownie_project.load(project_path(project))
+    network.connect('development')
+    try:
+        tx_params = {'from': accounts[0]}
+
+        manager = loaded.RewardsManager.deploy(tx_params)
+        factory = loaded.RewardsManagerFactory.deploy(manager, tx_params)
+        tx = factory.create_manager(tx_params)
+        clone = tx.events['ManagerCreated']['manager']
+
+        return {
+            'full_gas': manager.tx.gas_used,
+            'clone_gas': tx.gas_used,
+            'factory_gas': factory.tx.gas_used,
+            'manager_code_size': len(web3.eth.get_code(manager.address)),
+            'clone_code_size': len(web3.eth.get_code(clone)),
+        }
+    finally:
+        network.disconnect()
+        loaded.close()
+
+
+def main(project='curve'):
+    if project not in clone_projects():
+        print(f'usage: python -m tooling.benchmarks.bench_manager_clone [{"|".join(clone_projects())}]')
+        return 1
+
+    result = measure(project)
+    saved_gas = result['full_gas'] - result['clone_gas']
+    print(f'{project} full deployment: {result["full_gas"]} gas, {result["manager_code_size"]} bytes of code')
+    print(f'{project} clone creation:  {result["clone_gas"]} gas, {result["clone_code_size"]} bytes of code')
+    print(f'saved per manager: {saved_gas} gas ({100 * saved_gas / result["full_gas"]:.0f}%)')
+    print(f'one-off implementation and factory deployment: {result["full_gas"] + result["factory_gas"]} gas')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,48 @@
+"""
+Measures the cold (empty build directory) and warm startup of a Brownie
+project, i.e. the time `brownie compile` takes before tests can run, with and
+without installing the project's prebuilt artifact bundle first.
+
+    python -m tooling.benchmarks.bench_project_startup [project]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from tooling.artifact_bundle import bundle_path, install_bundle
+from tooling.compile_cache import project_path
+
+
+def timed_compile(path):
+    start = time.perf_counter()
+    subprocess.run(['brownie', 'compile'], cwd=path, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def measure(path, use_bundle):
+    shutil.rmtree(os.path.join(path, 'build'), ignore_errors=True)
+    start = time.perf_counter()
+    if use_bundle:
+        install_bundle(path)
+    cold = time.perf_counter() - start + timed_compile(path)
+    warm = timed_compile(path)
+    return cold, warm
+
+
+def main(project='arcx'):
+    path = project_path(project)
+    modes = [('full compile', False)]
+    if os.path.exists(bundle_path(path)):
+        modes.append(('with bundle', True))
+    else:
+        print(f'no bundle, build one with `python -m tooling.compile_cache compile {project}`')
+
+    for label, use_bundle in modes:
+        cold, warm = measure(path, use_bundle)
+        print(f'{project} {label}: cold {cold:.1f}s, warm {warm:.1f}s')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,159 @@
+"""
+Precompiled calldata templates.
+
+A template parses a function signature once, caching its selector and the
+head layout of its arguments, and then encodes calls without going through
+Brownie or eth_abi:
+
+    payment = CalldataTemplate('newImmediatePayment(address,address,uint256,string)')
+    calldata = payment.encode(token, recipient, amount, reference)
+
+Only elementary types are supported: address, bool, (u)intN, bytesN, bytes
+and string.
+"""
+import re
+
+from tooling.abi_index import function_selector
+from tooling.evm_script import to_bytes
+
+
+WORD = 32
+ZERO_WORD = bytes(WORD)
+
+_signature_re = re.compile(r'^(\w+)\(([\w,]*)\)$')
+_int_re = re.compile(r'^(u?)int(\d*)$')
+_fixed_bytes_re = re.compile(r'^bytes(\d+)$')
+
+
+def _encode_address(value):
+    address = to_bytes(value)
+    if len(address) != 20:
+        raise ValueError(f'invalid address: {value}')
+    return bytes(12) + address
+
+
+def _encode_bool(value):
+    if not isinstance(value, bool):
+        raise TypeError(f'expected a bool, got {value!r}')
+    return (1 if value else 0).to_bytes(WORD, 'big')
+
+
+def _int_encoder(signed, bits):
+    low, high = (-2 ** (bits - 1), 2 ** (bits - 1)) if signed else (0, 2 ** bits)
+
+    def encode(value):
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError(f'expected an integer, got {value!r}')
+        if not low <= value < high:
+            raise ValueError(f'{value} is out of range for {"" if signed else "u"}int{bits}')
+        return value.to_bytes(WORD, 'big', signed=signed)
+
+    return encode
+
+
+def _fixed_bytes_encoder(size):
+    def encode(value):
+        data = to_bytes(value)
+        if len(data) > size:
+            raise ValueError(f'{len(data)} bytes do not fit into bytes{size}')
+        return bytes(data) + bytes(WORD - len(data))
+
+    return encode
+
+
+def _encode_dynamic_bytes(data):
+    padding = -len(data) % WORD
+    return len(data).to_bytes(WORD, 'big') + bytes(data) + bytes(padding)
+
+
+def _encode_bytes(value):
+    return _encode_dynamic_bytes(to_bytes(value))
+
+
+def _encode_string(value):
+    if not isinstance(value, str):
+        raise TypeError(f'expected a string, got {value!r}')
+    return _encode_dynamic_bytes(value.encode('utf-8'))
+
+
+def _type_encoder(abi_type):
+    """
+    Returns `(is_dynamic, encode)` for an elementary ABI type.
+    """
+    if abi_type == 'address':
+        return False, _encode_address
+    if abi_type == 'bool':
+        return False, _encode_bool
+    if abi_type == 'bytes':
+        return True, _encode_bytes
+    if abi_type == 'string':
+        return True, _encode_string
+
+    match = _int_re.match(abi_type)
+    if match:
+        bits = int(match.group(2) or 256)
+        if bits % 8 != 0 or not 8 <= bits <= 256:
+            raise ValueError(f'invalid ABI type: {abi_type}')
+        return False, _int_encoder(match.group(1) == '', bits)
+
+    match = _fixed_bytes_re.match(abi_type)
+    if match:
+        size = int(match.group(1))
+        if not 1 <= size <= WORD:
+            raise ValueError(f'invalid ABI type: {abi_type}')
+        return False, _fixed_bytes_encoder(size)
+
+    raise ValueError(f'unsupported ABI type: {abi_type}')
+
+
+class CalldataTemplate:
+    def __init__(self, signature, selector=None):
+        match = _signature_re.match(signature.replace(' ', ''))
+        if not match:
+            raise ValueError(f'invalid function signature: {signature}')
+
+        self.name = match.group(1)
+        self.types = [t for t in match.group(2).split(',') if t]
+        self.signature = f'{self.name}({",".join(self.types)})'
+        self.selector = to_bytes(selector or function_selector(self.signature))
+        if len(self.selector) != 4:
+            raise ValueError(f'invalid selector: {selector}')
+
+        self.head_size = WORD * len(self.types)
+        self._encoders = [_type_encoder(t) for t in self.types]
+
+    def encode(self, *args):
+        if len(args) != len(self.types):
+            raise TypeError(f'{self.signature} takes {len(self.types)} arguments, got {len(args)}')
+
+        head = [self.selector]
+        tail = []
+        tail_offset = self.head_size
+        for (is_dynamic, encode), arg in zip(self._encoders, args):
+            if is_dynamic:
+                encoded = encode(arg)
+                head.append(tail_offset.to_bytes(WORD, 'big'))
+                tail.append(encoded)
+                tail_offset += len(encoded)
+            else:
+                head.append(encode(arg))
+
+        return b''.join(head + tail)
+
+    def encode_hex(self, *args):
+        return '0x' + self.encode(*args).hex()
+
+    def encode_batch(self, rows):
+        """
+        Encodes an iterable of argument tuples, returning a list of calldata bytes.
+        """
+        encode = self.encode
+        return [encode(*row) for row in rows]
+
+    def actions(self, to, rows):
+        """
+        Yields `(to, calldata)` pairs for `encode_call_script`, one per row.
+        """
+        encode = self.encode
+        for row in rows:
+            yield to, encode(*row)
@@ -0,0 +1,283 @@
+"""
+Content-addressed compile cache shared by all Brownie projects.
+
+Brownie skips compiling a contract whose `build/contracts` artifact matches
+the current source and compiler settings, but every checkout and every
+project starts with an empty build directory. This cache keeps artifacts in
+`.cache/compile` at the repository root, keyed by
+
+    (language, compiler version, compiler settings, contents of the source
+     file and of every file it imports)
+
+so a source compiled once by any project is reused by all of them:
+
+    python -m tooling.compile_cache compile             # all projects
+    python -m tooling.compile_cache compile curve sushi
+    python -m tooling.compile_cache restore             # before `brownie test`
+
+`compile` restores cached artifacts, runs `brownie compile` for whatever is
+left and stores the new artifacts; both commands report the cache hits and
+the compile time they saved.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+from tooling.abi_index import PROJECTS_ROOT, REPO_ROOT
+
+
+DEFAULT_CACHE_DIR = os.path.join(REPO_ROOT, '.cache', 'compile')
+
+SOURCE_EXTENSIONS = {'.sol': 'Solidity', '.vy': 'Vyper'}
+
+# Brownie's defaults for settings a brownie-config.yaml may leave out
+DEFAULT_SOLC_OPTIMIZER = {'enabled': True, 'runs': 200}
+
+CacheReport = namedtuple('CacheReport', ['project', 'hits', 'misses', 'saved_seconds'])
+
+_solidity_import_re = re.compile(r'^\s*import\s+(?:[^"\';]*?from\s+)?["\']([^"\']+)["\']', re.MULTILINE)
+_vyper_import_re = re.compile(r'^\s*import\s+([\w.]+)\s+as\s+\w+', re.MULTILINE)
+_vyper_from_import_re = re.compile(r'^\s*from\s+([\w.]+)\s+import\s+(\w+)', re.MULTILINE)
+_solidity_pragma_re = re.compile(r'pragma\s+solidity\s+([^;]+);')
+_vyper_pragma_re = re.compile(r'#\s*@version\s+(\S+)')
+
+
+def project_path(name):
+    return os.path.join(PROJECTS_ROOT, name)
+
+
+def list_projects(projects_root=PROJECTS_ROOT):
+    return sorted(
+        name for name in os.listdir(projects_root)
+        if os.path.exists(os.path.join(projects_root, name, 'brownie-config.yaml'))
+    )
+
+
+def compiler_settings(path):
+    """
+    Returns the compiler settings of the project at `path` that Brownie
+    compares against existing artifacts, with Brownie's defaults filled in.
+    """
+    import yaml
+    with open(os.path.join(path, 'brownie-config.yaml')) as f:
+        compiler = (yaml.safe_load(f) or {}).get('compiler') or {}
+    solc = compiler.get('solc') or {}
+    vyper = compiler.get('vyper') or {}
+    return {
+        'evm_version': compiler.get('evm_version'),
+        'solc': {
+            'version': solc.get('version'),
+            'optimizer': solc.get('optimizer') or DEFAULT_SOLC_OPTIMIZER,
+            'remappings': solc.get('remappings'),
+        },
+        'vyper': {'version': vyper.get('version')},
+    }
+
+
+def list_sources(path):
+    sources = []
+    for root, _, files in os.walk(os.path.join(path, 'contracts')):
+        for name in files:
+            if os.path.splitext(name)[1] in SOURCE_EXTENSIONS:
+                sources.append(os.path.relpath(os.path.join(root, name), path))
+    return sorted(sources)
+
+
+def _read(path, source):
+    with open(os.path.join(path, source), encoding='utf-8') as f:
+        return f.read()
+
+
+def _imports(path, source, text):
+    directory = os.path.dirname(source)
+
+    if source.endswith('.sol'):
+        for imported in _solidity_import_re.findall(text):
+            if imported.startswith('.'):
+                imported = os.path.normpath(os.path.join(directory, imported))
+            yield imported
+        return
+
+    modules = _vyper_import_re.findall(text)
+    modules += [f'{module}.{name}' for module, name in _vyper_from_import_re.findall(text)]
+    for module in modules:
+        # vyper.interfaces is built into the compiler
+        if module.startswith('vyper.'):
+            continue
+        base = module.lstrip('.').replace('.', '/')
+        if module.startswith('.'):
+            base = os.path.join(directory, base)
+        for extension in ('.vy', '.json'):
+            if os.path.exists(os.path.join(path, base + extension)):
+                yield os.path.normpath(base + extension)
+
+
+def source_closure(path, source):
+    """
+    Returns the project-relative paths of `source` and every file it imports,
+    directly or not. Imports that don't resolve to a project file (e.g.
+    remapped packages) are kept as they are written.
+    """
+    seen = set()
+    pending = [source]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        if os.path.exists(os.path.join(path, current)) and os.path.splitext(current)[1] in SOURCE_EXTENSIONS:
+            pending.extend(_imports(path, current, _read(path, current)))
+    return sorted(seen)
+
+
+def compiler_version(source, text, settings):
+    """
+    Returns the version Brownie compiles `source` with: the version pinned in
+    the project config or otherwise the source pragma.
+    """
+    if source.endswith('.vy'):
+        pinned = settings['vyper']['version']
+        match = _vyper_pragma_re.search(text)
+    else:
+        pinned = settings['solc']['version']
+        match = _solidity_pragma_re.search(text)
+    if pinned:
+        return str(pinned).lstrip('v')
+    return match.group(1).strip().lstrip('=') if match else None
+
+
+def source_key(path, source, settings):
+    text = _read(path, source)
+    language = SOURCE_EXTENSIONS[os.path.splitext(source)[1]]
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        'language': language,
+        'version': compiler_version(source, text, settings),
+        'evm_version': settings['evm_version'],
+        'optimizer': settings['solc']['optimizer'] if language == 'Solidity' else None,
+        'remappings': settings['solc']['remappings'] if language == 'Solidity' else None,
+    }, sort_keys=True).encode())
+    for dependency in source_closure(path, source):
+        digest.update(dependency.encode() + b'\0')
+        if os.path.exists(os.path.join(path, dependency)):
+            with open(os.path.join(path, dependency), 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def _build_dir(path):
+    return os.path.join(path, 'build', 'contracts')
+
+
+def _load_metadata(entry_dir):
+    with open(os.path.join(entry_dir, 'metadata.json')) as f:
+        return json.load(f)
+
+
+def restore(path, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Copies cached artifacts of the project's sources into its build directory.
+    Returns a `CacheReport` whose `misses` are the sources left to compile.
+    """
+    settings = compiler_settings(path)
+    build_dir = _build_dir(path)
+    hits = []
+    misses = []
+    saved_seconds = 0.0
+
+    for source in list_sources(path):
+        entry_dir = os.path.join(cache_dir, source_key(path, source, settings))
+        if not os.path.exists(os.path.join(entry_dir, 'metadata.json')):
+            misses.append(source)
+            continue
+        metadata = _load_metadata(entry_dir)
+        os.makedirs(build_dir, exist_ok=True)
+        for artifact in metadata['artifacts']:
+            shutil.copyfile(os.path.join(entry_dir, artifact), os.path.join(build_dir, artifact))
+        hits.append(source)
+        saved_seconds += metadata['compile_seconds']
+
+    return CacheReport(os.path.basename(path), hits, misses, saved_seconds)
+
+
+def store(path, sources, compile_seconds, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Stores the build artifacts of `sources`, compiled by Brownie in
+    `compile_seconds`, which are split evenly between them.
+    """
+    settings = compiler_settings(path)
+    build_dir = _build_dir(path)
+    artifacts_by_source = {}
+    for name in os.listdir(build_dir) if os.path.isdir(build_dir) else []:
+        with open(os.path.join(build_dir, name)) as f:
+            artifacts_by_source.setdefault(json.load(f).get('sourcePath'), []).append(name)
+
+    for source in sources:
+        artifacts = sorted(artifacts_by_source.get(source, []))
+        if not artifacts:
+            continue
+        entry_dir = os.path.join(cache_dir, source_key(path, source, settings))
+        tmp_dir = entry_dir + '.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for artifact in artifacts:
+            shutil.copyfile(os.path.join(build_dir, artifact), os.path.join(tmp_dir, artifact))
+        with open(os.path.join(tmp_dir, 'metadata.json'), 'w') as f:
+            json.dump({
+                'source': source,
+                'artifacts': artifacts,
+                'compile_seconds': compile_seconds / len(sources),
+            }, f, indent=2)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+
+
+def brownie_compile(path):
+    subprocess.run(['brownie', 'compile'], cwd=path, check=True)
+
+
+def compile_project(path, cache_dir=DEFAULT_CACHE_DIR, compile=brownie_compile):
+    from tooling.artifact_bundle import BUNDLED_SUBTREES, install_matching_bundle, refresh_bundle
+
+    subtree = BUNDLED_SUBTREES.get(os.path.basename(path))
+    report = restore(path, cache_dir)
+    if report.misses:
+        if subtree is not None:
+            install_matching_bundle(path)
+        start = time.perf_counter()
+        compile(path)
+        store(path, report.misses, time.perf_counter() - start, cache_dir)
+    if subtree is not None:
+        refresh_bundle(path, subtree)
+    return report
+
+
+def format_report(report):
+    total = len(report.hits) + len(report.misses)
+    return (
+        f'{report.project}: {len(report.hits)}/{total} sources from cache, '
+        f'{len(report.misses)} compiled, ~{report.saved_seconds:.1f}s saved'
+    )
+
+
+def main(argv):
+    if not argv or argv[0] not in {'compile', 'restore'}:
+        print('usage: python -m tooling.compile_cache compile|restore [project ...]')
+        return 1
+
+    action = compile_project if argv[0] == 'compile' else restore
+    reports = [action(project_path(name)) for name in argv[1:] or list_projects()]
+    for report in reports:
+        print(format_report(report))
+    print(f'total: ~{sum(r.saved_seconds for r in reports):.1f}s of compile time saved')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,434 @@
+pragma solidity 0.6.12;
+
+// Stand-ins for the Lido DAO token and its Voting, TokenManager, Finance and Agent apps,
+// deployed by `tooling/aragon_mocks.py` onto a plain local chain. They keep the parts of the
+// apps' ABIs the projects use and run EVM scripts like Aragon's CallsScript executor (spec
+// id 1), but replace the ACL with fixed wiring: only the TokenManager creates votes, only the
+// Voting app executes through the Agent and pays through Finance.
+
+
+interface IERC20Transfer {
+    function transfer(address to, uint256 value) external returns (bool);
+    function balanceOf(address owner) external view returns (uint256);
+    function totalSupply() external view returns (uint256);
+}
+
+
+interface IMockToken {
+    function generateTokens(address owner, uint256 amount) external returns (bool);
+}
+
+
+interface IMockAgent {
+    function transfer(address token, address to, uint256 value) external;
+}
+
+
+contract CallsScriptRunner {
+    uint32 constant CALLS_SCRIPT_SPEC_ID = 1;
+
+    event ScriptResult(address indexed executor, bytes script, bytes input, bytes returnData);
+
+    function runScript(bytes memory script) internal {
+        require(script.length >= 4, "EVMRUN_EXECUTOR_INVALID");
+        uint32 specId;
+        assembly { specId := shr(224, mload(add(script, 0x20))) }
+        require(specId == CALLS_SCRIPT_SPEC_ID, "EVMRUN_EXECUTOR_INVALID");
+
+        uint256 location = 4;
+        while (location < script.length) {
+            require(script.length - location >= 24, "EVMCALLS_INVALID_LENGTH");
+            address target;
+            uint256 calldataLength;
+            uint256 calldataStart;
+            assembly {
+                let ptr := add(add(script, 0x20), location)
+                target := shr(96, mload(ptr))
+                calldataLength := shr(224, mload(add(ptr, 20)))
+                calldataStart := add(ptr, 24)
+            }
+            location += 24 + calldataLength;
+            require(location <= script.length, "EVMCALLS_INVALID_LENGTH");
+
+            assembly {
+                if iszero(call(gas(), target, 0, calldataStart, calldataLength, 0, 0)) {
+                    let ptr := mload(0x40)
+                    returndatacopy(ptr, 0, returndatasize())
+                    revert(ptr, returndatasize())
+                }
+            }
+        }
+        emit ScriptResult(address(this), script, "", "");
+    }
+}
+
+
+contract MockMiniMeToken {
+    string public name = "Lido DAO Token";
+    string public symbol = "LDO";
+    uint8 public decimals = 18;
+    address public controller;
+
+    uint256 public totalSupply;
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+
+    constructor(address _controller) public {
+        controller = _controller;
+    }
+
+    function transfer(address to, uint256 value) external returns (bool) {
+        _transfer(msg.sender, to, value);
+        return true;
+    }
+
+    function transferFrom(address from, address to, uint256 value) external returns (bool) {
+        require(allowance[from][msg.sender] >= value, "ALLOWANCE_EXCEEDED");
+        allowance[from][msg.sender] -= value;
+        _transfer(from, to, value);
+        return true;
+    }
+
+    function approve(address spender, uint256 value) external returns (bool) {
+        allowance[msg.sender][spender] = value;
+        emit Approval(msg.sender, spender, value);
+        return true;
+    }
+
+    function generateTokens(address owner, uint256 amount) external returns (bool) {
+        require(msg.sender == controller, "NOT_CONTROLLER");
+        totalSupply += amount;
+        balanceOf[owner] += amount;
+        emit Transfer(address(0), owner, amount);
+        return true;
+    }
+
+    function _transfer(address from, address to, uint256 value) internal {
+        require(balanceOf[from] >= value, "BALANCE_EXCEEDED");
+        balanceOf[from] -= value;
+        balanceOf[to] += value;
+        emit Transfer(from, to, value);
+    }
+}
+
+
+contract MockAgent is CallsScriptRunner {
+    address public voting;
+    address public finance;
+
+    event Execute(address indexed sender, address indexed target, uint256 ethValue, bytes data);
+    event VaultTransfer(address indexed token, address indexed to, uint256 amount);
+    event VaultDeposit(address indexed token, address indexed sender, uint256 amount);
+
+    constructor(address _voting, address _finance) public {
+        voting = _voting;
+        finance = _finance;
+    }
+
+    receive() external payable {
+        emit VaultDeposit(address(0), msg.sender, msg.value);
+    }
+
+    function isForwarder() external pure returns (bool) {
+        return true;
+    }
+
+    function canForward(address sender, bytes calldata) external view returns (bool) {
+        return sender == voting;
+    }
+
+    function forward(bytes calldata evmScript) external {
+        require(msg.sender == voting, "AGENT_CAN_NOT_FORWARD");
+        runScript(evmScript);
+    }
+
+    function execute(address target, uint256 ethValue, bytes calldata data) external returns (bytes memory) {
+        require(msg.sender == voting, "APP_AUTH_FAILED");
+        (bool success, bytes memory returnData) = target.call{value: ethValue}(data);
+        if (!success) {
+            assembly { revert(add(returnData, 0x20), mload(returnData)) }
+        }
+        emit Execute(msg.sender, target, ethValue, data);
+        return returnData;
+    }
+
+    function transfer(address token, address to, uint256 value) external {
+        require(msg.sender == voting || msg.sender == finance, "APP_AUTH_FAILED");
+        if (token == address(0)) {
+            (bool success, ) = to.call{value: value}("");
+            require(success, "VAULT_SEND_REVERTED");
+        } else {
+            require(IERC20Transfer(token).transfer(to, value), "VAULT_TOKEN_TRANSFER_REVERTED");
+        }
+        emit VaultTransfer(token, to, value);
+    }
+
+    function balance(address token) external view returns (uint256) {
+        return token == address(0) ? address(this).balance : IERC20Transfer(token).balanceOf(address(this));
+    }
+}
+
+
+contract MockFinance {
+    address public vault;
+    address public voting;
+    uint256 public transactionsNextIndex = 1;
+
+    event NewTransaction(uint256 indexed transactionId, bool incoming, address indexed entity, uint256 amount, string reference);
+
+    constructor(address _vault, address _voting) public {
+        vault = _vault;
+        voting = _voting;
+    }
+
+    function newImmediatePayment(address token, address receiver, uint256 amount, string calldata reference) external {
+        require(msg.sender == voting, "APP_AUTH_FAILED");
+        require(amount > 0, "FINANCE_NEW_PAYMENT_AMOUNT_ZERO");
+        IMockAgent(vault).transfer(token, receiver, amount);
+        emit NewTransaction(transactionsNextIndex++, false, receiver, amount, reference);
+    }
+}
+
+
+contract MockTokenManager is CallsScriptRunner {
+    address public token;
+    address public voting;
+    // the account that deployed the stand-ins, allowed to mint the initial balances
+    address public manager;
+
+    constructor(address _token, address _voting, address _manager) public {
+        token = _token;
+        voting = _voting;
+        manager = _manager;
+    }
+
+    function isForwarder() external pure returns (bool) {
+        return true;
+    }
+
+    function canForward(address sender, bytes calldata) external view returns (bool) {
+        return IERC20Transfer(token).balanceOf(sender) > 0;
+    }
+
+    function forward(bytes calldata evmScript) external {
+        require(IERC20Transfer(token).balanceOf(msg.sender) > 0, "TM_CAN_NOT_FORWARD");
+        runScript(evmScript);
+    }
+
+    function mint(address receiver, uint256 amount) external {
+        require(msg.sender == voting || msg.sender == manager, "APP_AUTH_FAILED");
+        IMockToken(token).generateTokens(receiver, amount);
+    }
+}
+
+
+contract MockVoting is CallsScriptRunner {
+    enum VoterState { Absent, Yea, Nay }
+
+    struct Vote {
+        bool executed;
+        uint64 startDate;
+        uint64 snapshotBlock;
+        uint64 supportRequiredPct;
+        uint64 minAcceptQuorumPct;
+        uint256 yea;
+        uint256 nay;
+        uint256 votingPower;
+        bytes executionScript;
+        mapping(address => VoterState) voters;
+        mapping(address => uint256) stakes;
+    }
+
+    uint64 public constant PCT_BASE = 10 ** 18;
+
+    address public token;
+    address public tokenManager;
+    uint64 public supportRequiredPct;
+    uint64 public minAcceptQuorumPct;
+    uint64 public voteTime;
+
+    mapping(uint256 => Vote) internal votes;
+    uint256 public votesLength;
+
+    event StartVote(uint256 indexed voteId, address indexed creator, string metadata);
+    event CastVote(uint256 indexed voteId, address indexed voter, bool supports, uint256 stake);
+    event ExecuteVote(uint256 indexed voteId);
+
+    constructor(
+        address _token,
+        address _tokenManager,
+        uint64 _supportRequiredPct,
+        uint64 _minAcceptQuorumPct,
+        uint64 _voteTime
+    ) public {
+        token = _token;
+        tokenManager = _tokenManager;
+        supportRequiredPct = _supportRequiredPct;
+        minAcceptQuorumPct = _minAcceptQuorumPct;
+        voteTime = _voteTime;
+    }
+
+    function newVote(bytes calldata executionScript, string calldata metadata) external returns (uint256) {
+        return _newVote(executionScript, metadata, true, true);
+    }
+
+    function newVote(
+        bytes calldata executionScript,
+        string calldata metadata,
+        bool castVote,
+        bool executesIfDecided
+    ) external returns (uint256) {
+        return _newVote(executionScript, metadata, castVote, executesIfDecided);
+    }
+
+    function isForwarder() external pure returns (bool) {
+        return true;
+    }
+
+    function canForward(address sender, bytes calldata) external view returns (bool) {
+        return sender == tokenManager;
+    }
+
+    function forward(bytes calldata evmScript) external {
+        require(msg.sender == tokenManager, "VOTING_CAN_NOT_FORWARD");
+        _newVote(evmScript, "", true, true);
+    }
+
+    function vote(uint256 voteId, bool supports, bool executesIfDecided) external {
+        require(canVote(voteId, msg.sender), "VOTING_CAN_NOT_VOTE");
+        _vote(voteId, supports, msg.sender, executesIfDecided);
+    }
+
+    function executeVote(uint256 voteId) external {
+        require(canExecute(voteId), "VOTING_CAN_NOT_EXECUTE");
+        _executeVote(voteId);
+    }
+
+    // voting power is the token balance when the vote is cast, MiniMe snapshots aren't emulated
+    function canVote(uint256 voteId, address voter) public view returns (bool) {
+        return voteId < votesLength && _isVoteOpen(votes[voteId]) && IERC20Transfer(token).balanceOf(voter) > 0;
+    }
+
+    function canExecute(uint256 voteId) public view returns (bool) {
+        if (voteId >= votesLength) {
+            return false;
+        }
+        Vote storage vote_ = votes[voteId];
+        if (vote_.executed) {
+            return false;
+        }
+        // decided early: a majority of all voting power supports the vote
+        if (_isValuePct(vote_.yea, vote_.votingPower, vote_.supportRequiredPct)) {
+            return true;
+        }
+        if (_isVoteOpen(vote_)) {
+            return false;
+        }
+        return _isValuePct(vote_.yea, vote_.yea + vote_.nay, vote_.supportRequiredPct)
+            && _isValuePct(vote_.yea, vote_.votingPower, vote_.minAcceptQuorumPct);
+    }
+
+    function getVote(uint256 voteId) external view returns (
+        bool open,
+        bool executed,
+        uint64 startDate,
+        uint64 snapshotBlock,
+        uint64 supportRequired,
+        uint64 minAcceptQuorum,
+        uint256 yea,
+        uint256 nay,
+        uint256 votingPower,
+        bytes memory script
+    ) {
+        require(voteId < votesLength, "VOTING_NO_VOTE");
+        Vote storage vote_ = votes[voteId];
+        open = _isVoteOpen(vote_);
+        executed = vote_.executed;
+        startDate = vote_.startDate;
+        snapshotBlock = vote_.snapshotBlock;
+        supportRequired = vote_.supportRequiredPct;
+        minAcceptQuorum = vote_.minAcceptQuorumPct;
+        yea = vote_.yea;
+        nay = vote_.nay;
+        votingPower = vote_.votingPower;
+        script = vote_.executionScript;
+    }
+
+    function getVoterState(uint256 voteId, address voter) external view returns (VoterState) {
+        require(voteId < votesLength, "VOTING_NO_VOTE");
+        return votes[voteId].voters[voter];
+    }
+
+    function _newVote(
+        bytes memory executionScript,
+        string memory metadata,
+        bool castVote,
+        bool executesIfDecided
+    ) internal returns (uint256 voteId) {
+        require(msg.sender == tokenManager, "APP_AUTH_FAILED");
+        uint256 votingPower = IERC20Transfer(token).totalSupply();
+        require(votingPower > 0, "VOTING_NO_VOTING_POWER");
+
+        voteId = votesLength++;
+        Vote storage vote_ = votes[voteId];
+        vote_.startDate = uint64(block.timestamp);
+        vote_.snapshotBlock = uint64(block.number - 1);
+        vote_.supportRequiredPct = supportRequiredPct;
+        vote_.minAcceptQuorumPct = minAcceptQuorumPct;
+        vote_.votingPower = votingPower;
+        vote_.executionScript = executionScript;
+
+        emit StartVote(voteId, msg.sender, metadata);
+
+        if (castVote && canVote(voteId, msg.sender)) {
+            _vote(voteId, true, msg.sender, executesIfDecided);
+        }
+    }
+
+    function _vote(uint256 voteId, bool supports, address voter, bool executesIfDecided) internal {
+        Vote storage vote_ = votes[voteId];
+        uint256 stake = IERC20Transfer(token).balanceOf(voter);
+
+        // a changed vote replaces the previous one
+        if (vote_.voters[voter] == VoterState.Yea) {
+            vote_.yea -= vote_.stakes[voter];
+        } else if (vote_.voters[voter] == VoterState.Nay) {
+            vote_.nay -= vote_.stakes[voter];
+        }
+
+        if (supports) {
+            vote_.yea += stake;
+        } else {
+            vote_.nay += stake;
+        }
+        vote_.voters[voter] = supports ? VoterState.Yea : VoterState.Nay;
+        vote_.stakes[voter] = stake;
+
+        emit CastVote(voteId, voter, supports, stake);
+
+        if (executesIfDecided && canExecute(voteId)) {
+            _executeVote(voteId);
+        }
+    }
+
+    function _executeVote(uint256 voteId) internal {
+        Vote storage vote_ = votes[voteId];
+        vote_.executed = true;
+        runScript(vote_.executionScript);
+        emit ExecuteVote(voteId);
+    }
+
+    function _isVoteOpen(Vote storage vote_) internal view returns (bool) {
+        return block.timestamp < vote_.startDate + voteTime && !vote_.executed;
+    }
+
+    function _isValuePct(uint256 value, uint256 total, uint256 pct) internal pure returns (bool) {
+        if (total == 0) {
+            return false;
+        }
+        return value * PCT_BASE / total > pct;
+    }
+}
@@ -0,0 +1,563 @@
+pragma solidity 0.6.12;
+
+// Stand-ins for the external protocols the projects integrate with: Lido stETH, the Curve
+// stETH pool with its LP token and LiquidityGaugeV2, SushiSwap MasterChefV2 and Balancer
+// MerkleRedeem. `tooling/protocol_mocks.py` copies their runtime code to the mainnet addresses
+// the projects' contracts hard-code, so nothing may be set in a constructor: each contract
+// is set up with `initialize` once its code is in place.
+//
+// They keep the ABI the projects use and the behaviour their contracts depend on (rewarder
+// hooks, reward contract staking, allocation seeding), but no economics: the pool mints LP
+// tokens 1:1, MasterChefV2 emits no SUSHI.
+
+
+interface IERC20Mock {
+    function transfer(address to, uint256 value) external returns (bool);
+    function transferFrom(address from, address to, uint256 value) external returns (bool);
+    function approve(address spender, uint256 value) external returns (bool);
+    function balanceOf(address owner) external view returns (uint256);
+    function totalSupply() external view returns (uint256);
+    function mint(address to, uint256 amount) external;
+    function burnFrom(address from, uint256 amount) external;
+}
+
+
+interface IRewarder {
+    function onSushiReward(uint256 pid, address user, address recipient, uint256 sushiAmount, uint256 newLpAmount) external;
+}
+
+
+contract Initializable {
+    bool public initialized;
+
+    modifier initializer() {
+        require(!initialized, "ALREADY_INITIALIZED");
+        initialized = true;
+        _;
+    }
+}
+
+
+contract MockERC20 is Initializable {
+    string public name;
+    string public symbol;
+    uint8 public decimals;
+    address public minter;
+
+    uint256 public totalSupply;
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+
+    function initialize(string calldata _name, string calldata _symbol, address _minter) external initializer {
+        name = _name;
+        symbol = _symbol;
+        decimals = 18;
+        minter = _minter;
+    }
+
+    function transfer(address to, uint256 value) external returns (bool) {
+        _transfer(msg.sender, to, value);
+        return true;
+    }
+
+    function transferFrom(address from, address to, uint256 value) external returns (bool) {
+        if (allowance[from][msg.sender] != uint256(-1)) {
+            require(allowance[from][msg.sender] >= value, "ALLOWANCE_EXCEEDED");
+            allowance[from][msg.sender] -= value;
+        }
+        _transfer(from, to, value);
+        return true;
+    }
+
+    function approve(address spender, uint256 value) external returns (bool) {
+        allowance[msg.sender][spender] = value;
+        emit Approval(msg.sender, spender, value);
+        return true;
+    }
+
+    function mint(address to, uint256 amount) external {
+        require(msg.sender == minter, "NOT_MINTER");
+        _mint(to, amount);
+    }
+
+    function burnFrom(address from, uint256 amount) external {
+        require(msg.sender == minter, "NOT_MINTER");
+        require(balanceOf[from] >= amount, "BALANCE_EXCEEDED");
+        balanceOf[from] -= amount;
+        totalSupply -= amount;
+        emit Transfer(from, address(0), amount);
+    }
+
+    function _mint(address to, uint256 amount) internal {
+        totalSupply += amount;
+        balanceOf[to] += amount;
+        emit Transfer(address(0), to, amount);
+    }
+
+    function _transfer(address from, address to, uint256 value) internal {
+        require(balanceOf[from] >= value, "BALANCE_EXCEEDED");
+        balanceOf[from] -= value;
+        balanceOf[to] += value;
+        emit Transfer(from, to, value);
+    }
+}
+
+
+// stETH with 1:1 shares: `submit` mints as many tokens as ether sent
+contract MockStETH is MockERC20 {
+    event Submitted(address indexed sender, uint256 amount, address referral);
+
+    function submit(address referral) external payable returns (uint256) {
+        require(msg.value > 0, "ZERO_DEPOSIT");
+        _mint(msg.sender, msg.value);
+        emit Submitted(msg.sender, msg.value, referral);
+        return msg.value;
+    }
+}
+
+
+contract MockStableSwapSTETH is Initializable {
+    address constant ETH = 0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE;
+
+    address[2] public coins;
+    address public lp_token;
+    address public owner;
+
+    event TokenExchange(address indexed buyer, int128 sold_id, uint256 tokens_sold, int128 bought_id, uint256 tokens_bought);
+    event AddLiquidity(address indexed provider, uint256[2] token_amounts, uint256[2] fees, uint256 invariant, uint256 token_supply);
+    event RemoveLiquidity(address indexed provider, uint256[2] token_amounts, uint256[2] fees, uint256 token_supply);
+
+    function initialize(address _steth, address _lp_token, address _owner) external initializer {
+        coins[0] = ETH;
+        coins[1] = _steth;
+        lp_token = _lp_token;
+        owner = _owner;
+    }
+
+    receive() external payable {}
+
+    function balances(uint256 i) public view returns (uint256) {
+        return i == 0 ? address(this).balance : IERC20Mock(coins[1]).balanceOf(address(this));
+    }
+
+    function A() external pure returns (uint256) {
+        return 50;
+    }
+
+    function fee() external pure returns (uint256) {
+        return 0;
+    }
+
+    function get_virtual_price() external pure returns (uint256) {
+        return 10 ** 18;
+    }
+
+    function calc_token_amount(uint256[2] calldata amounts, bool) external pure returns (uint256) {
+        return amounts[0] + amounts[1];
+    }
+
+    function get_dy(int128, int128, uint256 dx) external pure returns (uint256) {
+        return dx;
+    }
+
+    function add_liquidity(uint256[2] calldata amounts, uint256 min_mint_amount) external payable returns (uint256) {
+        require(msg.value == amounts[0], "ETH_AMOUNT_MISMATCH");
+        if (amounts[1] > 0) {
+            require(IERC20Mock(coins[1]).transferFrom(msg.sender, address(this), amounts[1]), "STETH_TRANSFER_FAILED");
+        }
+        uint256 mint_amount = amounts[0] + amounts[1];
+        require(mint_amount >= min_mint_amount, "Slippage screwed you");
+        IERC20Mock(lp_token).mint(msg.sender, mint_amount);
+
+        uint256[2] memory fees;
+        emit AddLiquidity(msg.sender, amounts, fees, balances(0) + balances(1), IERC20Mock(lp_token).totalSupply());
+        return mint_amount;
+    }
+
+    function remove_liquidity(uint256 _amount, uint256[2] calldata _min_amounts) external returns (uint256[2] memory amounts) {
+        uint256 total = balances(0) + balances(1);
+        require(_amount <= total, "AMOUNT_EXCEEDS_POOL");
+        amounts[0] = balances(0) * _amount / total;
+        amounts[1] = _amount - amounts[0];
+        require(amounts[0] >= _min_amounts[0] && amounts[1] >= _min_amounts[1], "Withdrawal resulted in fewer coins than expected");
+
+        IERC20Mock(lp_token).burnFrom(msg.sender, _amount);
+        require(IERC20Mock(coins[1]).transfer(msg.sender, amounts[1]), "STETH_TRANSFER_FAILED");
+        (bool success, ) = msg.sender.call{value: amounts[0]}("");
+        require(success, "ETH_TRANSFER_FAILED");
+
+        uint256[2] memory fees;
+        emit RemoveLiquidity(msg.sender, amounts, fees, total - _amount);
+    }
+
+    function exchange(int128 i, int128 j, uint256 dx, uint256 min_dy) external payable returns (uint256) {
+        require(i != j && (i == 0 || i == 1) && (j == 0 || j == 1), "INVALID_COINS");
+        require(dx >= min_dy, "Exchange resulted in fewer coins than expected");
+        if (i == 0) {
+            require(msg.value == dx, "ETH_AMOUNT_MISMATCH");
+            require(IERC20Mock(coins[1]).transfer(msg.sender, dx), "STETH_TRANSFER_FAILED");
+        } else {
+            require(IERC20Mock(coins[1]).transferFrom(msg.sender, address(this), dx), "STETH_TRANSFER_FAILED");
+            (bool success, ) = msg.sender.call{value: dx}("");
+            require(success, "ETH_TRANSFER_FAILED");
+        }
+        emit TokenExchange(msg.sender, i, dx, j, dx);
+        return dx;
+    }
+}
+
+
+// LiquidityGaugeV2 without CRV emissions: LP deposits are staked into the reward contract
+// through `_sigs` and reward tokens are paid out pro rata on every checkpoint
+contract MockLiquidityGaugeV2 is Initializable {
+    uint256 constant MAX_REWARDS = 8;
+
+    address public lp_token;
+    address public admin;
+
+    string public name;
+    string public symbol;
+    uint256 public decimals;
+    uint256 public totalSupply;
+    mapping(address => uint256) public balanceOf;
+
+    address public reward_contract;
+    bytes32 public reward_sigs;
+    address[MAX_REWARDS] public reward_tokens;
+    mapping(address => uint256) public reward_integral;
+    mapping(address => mapping(address => uint256)) public reward_integral_for;
+
+    event Deposit(address indexed provider, uint256 value);
+    event Withdraw(address indexed provider, uint256 value);
+    event Transfer(address indexed _from, address indexed _to, uint256 _value);
+
+    function initialize(address _lp_token, address _admin) external initializer {
+        lp_token = _lp_token;
+        admin = _admin;
+        name = "Curve.fi steCRV Gauge Deposit";
+        symbol = "steCRV-gauge";
+        decimals = 18;
+    }
+
+    function deposit(uint256 _value) external {
+        _deposit(_value, msg.sender);
+    }
+
+    function deposit(uint256 _value, address _addr) external {
+        _deposit(_value, _addr);
+    }
+
+    function withdraw(uint256 _value) external {
+        _checkpoint_rewards(msg.sender, totalSupply);
+        require(balanceOf[msg.sender] >= _value, "BALANCE_EXCEEDED");
+        balanceOf[msg.sender] -= _value;
+        totalSupply -= _value;
+        if (reward_contract != address(0) && _value > 0) {
+            _call_reward_contract(bytes4(reward_sigs << 32), _value);
+        }
+        require(IERC20Mock(lp_token).transfer(msg.sender, _value), "LP_TRANSFER_FAILED");
+        emit Withdraw(msg.sender, _value);
+        emit Transfer(msg.sender, address(0), _value);
+    }
+
+    function claim_rewards() external {
+        _checkpoint_rewards(msg.sender, totalSupply);
+    }
+
+    function claim_rewards(address _addr) external {
+        _checkpoint_rewards(_addr, totalSupply);
+    }
+
+    // like the real gauge, claims as a side effect; call it as a view
+    function claimable_reward(address _addr, address _token) external returns (uint256) {
+        uint256 balance = IERC20Mock(_token).balanceOf(_addr);
+        _checkpoint_rewards(_addr, totalSupply);
+        return IERC20Mock(_token).balanceOf(_addr) - balance;
+    }
+
+    function set_rewards(address _reward_contract, bytes32 _sigs, address[MAX_REWARDS] calldata _reward_tokens) external {
+        require(msg.sender == admin, "dev: admin only");
+        uint256 total_supply = totalSupply;
+
+        if (reward_contract != address(0)) {
+            _checkpoint_rewards(address(0), total_supply);
+            if (total_supply > 0) {
+                _call_reward_contract(bytes4(reward_sigs << 32), total_supply);
+            }
+            IERC20Mock(lp_token).approve(reward_contract, 0);
+        }
+
+        reward_contract = _reward_contract;
+        reward_sigs = _sigs;
+        for (uint256 i = 0; i < MAX_REWARDS; i++) {
+            reward_tokens[i] = _reward_tokens[i];
+        }
+
+        if (_reward_contract != address(0)) {
+            IERC20Mock(lp_token).approve(_reward_contract, uint256(-1));
+            if (total_supply > 0) {
+                _call_reward_contract(bytes4(_sigs), total_supply);
+            }
+        }
+    }
+
+    function _deposit(uint256 _value, address _addr) internal {
+        _checkpoint_rewards(_addr, totalSupply);
+        balanceOf[_addr] += _value;
+        totalSupply += _value;
+        require(IERC20Mock(lp_token).transferFrom(msg.sender, address(this), _value), "LP_TRANSFER_FAILED");
+        if (reward_contract != address(0) && _value > 0) {
+            _call_reward_contract(bytes4(reward_sigs), _value);
+        }
+        emit Deposit(_addr, _value);
+        emit Transfer(address(0), _addr, _value);
+    }
+
+    function _call_reward_contract(bytes4 sig, uint256 value) internal {
+        (bool success, ) = reward_contract.call(abi.encodePacked(sig, value));
+        require(success, "REWARD_CONTRACT_CALL_FAILED");
+    }
+
+    function _checkpoint_rewards(address _addr, uint256 _total_supply) internal {
+        if (reward_contract == address(0)) {
+            return;
+        }
+
+        uint256[MAX_REWARDS] memory reward_balances;
+        for (uint256 i = 0; i < MAX_REWARDS; i++) {
+            if (reward_tokens[i] == address(0)) {
+                break;
+            }
+            reward_balances[i] = IERC20Mock(reward_tokens[i]).balanceOf(address(this));
+        }
+
+        (bool success, ) = reward_contract.call(abi.encodePacked(bytes4(reward_sigs << 64)));
+        require(success, "REWARD_CLAIM_FAILED");
+
+        uint256 user_balance = balanceOf[_addr];
+        for (uint256 i = 0; i < MAX_REWARDS; i++) {
+            address token = reward_tokens[i];
+            if (token == address(0)) {
+                break;
+            }
+            if (_total_supply != 0) {
+                uint256 token_balance = IERC20Mock(token).balanceOf(address(this));
+                reward_integral[token] += 10 ** 18 * (token_balance - reward_balances[i]) / _total_supply;
+            }
+            if (_addr == address(0)) {
+                continue;
+            }
+            uint256 dI = reward_integral[token] - reward_integral_for[token][_addr];
+            if (dI > 0) {
+                reward_integral_for[token][_addr] = reward_integral[token];
+                uint256 amount = user_balance * dI / 10 ** 18;
+                if (amount > 0) {
+                    require(IERC20Mock(token).transfer(_addr, amount), "REWARD_TRANSFER_FAILED");
+                }
+            }
+        }
+    }
+}
+
+
+// MasterChefV2 without SUSHI emissions: keeps LP balances and calls the pool rewarders
+contract MockMasterChefV2 is Initializable {
+    struct UserInfo {
+        uint256 amount;
+        int256 rewardDebt;
+    }
+
+    struct PoolInfo {
+        uint128 accSushiPerShare;
+        uint64 lastRewardBlock;
+        uint64 allocPoint;
+    }
+
+    address public owner;
+    PoolInfo[] public poolInfo;
+    address[] public lpToken;
+    address[] public rewarder;
+    mapping(uint256 => mapping(address => UserInfo)) public userInfo;
+    uint256 public totalAllocPoint;
+
+    event OwnershipTransferred(address indexed previousOwner, address indexed newOwner);
+    event Deposit(address indexed user, uint256 indexed pid, uint256 amount, address indexed to);
+    event Withdraw(address indexed user, uint256 indexed pid, uint256 amount, address indexed to);
+    event EmergencyWithdraw(address indexed user, uint256 indexed pid, uint256 amount, address indexed to);
+    event Harvest(address indexed user, uint256 indexed pid, uint256 amount);
+    event LogPoolAddition(uint256 indexed pid, uint256 allocPoint, address indexed lpToken, address indexed rewarder);
+    event LogSetPool(uint256 indexed pid, uint256 allocPoint, address indexed rewarder, bool overwrite);
+
+    modifier onlyOwner() {
+        require(msg.sender == owner, "Ownable: caller is not the owner");
+        _;
+    }
+
+    function initialize(address _owner) external initializer {
+        owner = _owner;
+        emit OwnershipTransferred(address(0), _owner);
+    }
+
+    function transferOwnership(address newOwner, bool, bool) external onlyOwner {
+        emit OwnershipTransferred(owner, newOwner);
+        owner = newOwner;
+    }
+
+    function poolLength() external view returns (uint256) {
+        return poolInfo.length;
+    }
+
+    function pendingSushi(uint256, address) external pure returns (uint256) {
+        return 0;
+    }
+
+    function sushiPerBlock() external pure returns (uint256) {
+        return 0;
+    }
+
+    function add(uint256 allocPoint, address _lpToken, address _rewarder) external onlyOwner {
+        totalAllocPoint += allocPoint;
+        lpToken.push(_lpToken);
+        rewarder.push(_rewarder);
+        poolInfo.push(PoolInfo(0, uint64(block.number), uint64(allocPoint)));
+        emit LogPoolAddition(lpToken.length - 1, allocPoint, _lpToken, _rewarder);
+    }
+
+    function set(uint256 _pid, uint256 _allocPoint, address _rewarder, bool overwrite) external onlyOwner {
+        totalAllocPoint = totalAllocPoint - poolInfo[_pid].allocPoint + _allocPoint;
+        poolInfo[_pid].allocPoint = uint64(_allocPoint);
+        if (overwrite) {
+            rewarder[_pid] = _rewarder;
+        }
+        emit LogSetPool(_pid, _allocPoint, overwrite ? _rewarder : rewarder[_pid], overwrite);
+    }
+
+    function deposit(uint256 pid, uint256 amount, address to) external {
+        UserInfo storage user = userInfo[pid][to];
+        user.amount += amount;
+        _onSushiReward(pid, to, to, user.amount);
+        require(IERC20Mock(lpToken[pid]).transferFrom(msg.sender, address(this), amount), "LP_TRANSFER_FAILED");
+        emit Deposit(msg.sender, pid, amount, to);
+    }
+
+    function withdraw(uint256 pid, uint256 amount, address to) external {
+        UserInfo storage user = userInfo[pid][msg.sender];
+        require(user.amount >= amount, "BoringMath: Underflow");
+        user.amount -= amount;
+        _onSushiReward(pid, msg.sender, to, user.amount);
+        require(IERC20Mock(lpToken[pid]).transfer(to, amount), "LP_TRANSFER_FAILED");
+        emit Withdraw(msg.sender, pid, amount, to);
+    }
+
+    function harvest(uint256 pid, address to) external {
+        _onSushiReward(pid, msg.sender, to, userInfo[pid][msg.sender].amount);
+        emit Harvest(msg.sender, pid, 0);
+    }
+
+    function withdrawAndHarvest(uint256 pid, uint256 amount, address to) external {
+        UserInfo storage user = userInfo[pid][msg.sender];
+        require(user.amount >= amount, "BoringMath: Underflow");
+        user.amount -= amount;
+        _onSushiReward(pid, msg.sender, to, user.amount);
+        require(IERC20Mock(lpToken[pid]).transfer(to, amount), "LP_TRANSFER_FAILED");
+        emit Withdraw(msg.sender, pid, amount, to);
+        emit Harvest(msg.sender, pid, 0);
+    }
+
+    function emergencyWithdraw(uint256 pid, address to) external {
+        UserInfo storage user = userInfo[pid][msg.sender];
+        uint256 amount = user.amount;
+        user.amount = 0;
+        _onSushiReward(pid, msg.sender, to, 0);
+        require(IERC20Mock(lpToken[pid]).transfer(to, amount), "LP_TRANSFER_FAILED");
+        emit EmergencyWithdraw(msg.sender, pid, amount, to);
+    }
+
+    function _onSushiReward(uint256 pid, address user, address to, uint256 newLpAmount) internal {
+        if (rewarder[pid] != address(0)) {
+            IRewarder(rewarder[pid]).onSushiReward(pid, user, to, 0, newLpAmount);
+        }
+    }
+}
+
+
+// Balancer's MerkleRedeem: weekly allocations seeded by the owner, claimed with merkle proofs
+contract MockMerkleRedeem is Initializable {
+    address public rewardToken;
+    address public owner;
+    mapping(uint256 => bytes32) public weekMerkleRoots;
+    mapping(uint256 => mapping(address => bool)) public claimed;
+
+    event OwnershipTransferred(address indexed previousOwner, address indexed newOwner);
+    event RewardAdded(address indexed token, uint256 amount);
+    event RewardPaid(address indexed user, address indexed rewardToken, uint256 amount);
+
+    modifier onlyOwner() {
+        require(msg.sender == owner, "Ownable: caller is not the owner");
+        _;
+    }
+
+    function initialize(address _rewardToken, address _owner) external initializer {
+        rewardToken = _rewardToken;
+        owner = _owner;
+        emit OwnershipTransferred(address(0), _owner);
+    }
+
+    function transferOwnership(address newOwner) external onlyOwner {
+        require(newOwner != address(0), "Ownable: new owner is the zero address");
+        emit OwnershipTransferred(owner, newOwner);
+        owner = newOwner;
+    }
+
+    function renounceOwnership() external onlyOwner {
+        emit OwnershipTransferred(owner, address(0));
+        owner = address(0);
+    }
+
+    function seedAllocations(uint256 _week, bytes32 _merkleRoot, uint256 _totalAllocation) external onlyOwner {
+        require(weekMerkleRoots[_week] == bytes32(0), "cannot rewrite merkle root");
+        weekMerkleRoots[_week] = _merkleRoot;
+        require(IERC20Mock(rewardToken).transferFrom(msg.sender, address(this), _totalAllocation), "TRANSFER_FAILED");
+        emit RewardAdded(rewardToken, _totalAllocation);
+    }
+
+    function claimWeek(address _liquidityProvider, uint256 _week, uint256 _claimedBalance, bytes32[] calldata _merkleProof) external {
+        require(!claimed[_week][_liquidityProvider], "cannot claim twice");
+        require(verifyClaim(_liquidityProvider, _week, _claimedBalance, _merkleProof), "Incorrect merkle proof");
+        claimed[_week][_liquidityProvider] = true;
+        require(IERC20Mock(rewardToken).transfer(_liquidityProvider, _claimedBalance), "TRANSFER_FAILED");
+        emit RewardPaid(_liquidityProvider, rewardToken, _claimedBalance);
+    }
+
+    function claimStatus(address _liquidityProvider, uint256 _begin, uint256 _end) external view returns (bool[] memory) {
+        require(_begin <= _end, "weeks must be in order");
+        bool[] memory statuses = new bool[](_end - _begin + 1);
+        for (uint256 i = _begin; i <= _end; i++) {
+            statuses[i - _begin] = claimed[i][_liquidityProvider];
+        }
+        return statuses;
+    }
+
+    function merkleRoots(uint256 _begin, uint256 _end) external view returns (bytes32[] memory) {
+        require(_begin <= _end, "weeks must be in order");
+        bytes32[] memory roots = new bytes32[](_end - _begin + 1);
+        for (uint256 i = _begin; i <= _end; i++) {
+            roots[i - _begin] = weekMerkleRoots[i];
+        }
+        return roots;
+    }
+
+    function verifyClaim(address _liquidityProvider, uint256 _week, uint256 _claimedBalance, bytes32[] memory _merkleProof) public view returns (bool) {
+        bytes32 computedHash = keccak256(abi.encodePacked(_liquidityProvider, _claimedBalance));
+        for (uint256 i = 0; i < _merkleProof.length; i++) {
+            bytes32 proofElement = _merkleProof[i];
+            computedHash = computedHash <= proofElement
+                ? keccak256(abi.encodePacked(computedHash, proofElement))
+                : keccak256(abi.encodePacked(proofElement, computedHash));
+        }
+        return computedHash == weekMerkleRoots[_week];
+    }
+}
@@ -0,0 +1,40 @@
+"""
+Offline prediction of CREATE2 addresses.
+
+The rewards factories deploy contracts with CREATE2 under a salt bound to the
+caller, `keccak256(abi.encodePacked(caller, salt))`, so front-running a
+deployment with the same salt from another account lands elsewhere.
+"""
+from tooling.evm_script import address_to_bytes, to_bytes
+
+
+SALT_LENGTH = 32
+
+
+def salt_to_bytes(salt):
+    salt = bytes(to_bytes(salt))
+    if len(salt) != SALT_LENGTH:
+        raise ValueError(f'salt must be {SALT_LENGTH} bytes, got {len(salt)}')
+    return salt
+
+
+def create2_address_preimage(deployer, salt, init_code_hash):
+    return b'\xff' + bytes(address_to_bytes(deployer)) + salt_to_bytes(salt) + bytes(init_code_hash)
+
+
+def create2_address(deployer, salt, init_code):
+    """
+    Returns the checksummed address of the contract created by `deployer`
+    with CREATE2: keccak256(0xff ++ deployer ++ salt ++ keccak256(init_code))[12:].
+    """
+    from eth_utils import keccak, to_checksum_address
+    preimage = create2_address_preimage(deployer, salt, keccak(bytes(to_bytes(init_code))))
+    return to_checksum_address(keccak(preimage)[12:])
+
+
+def caller_salt(caller, salt):
+    """
+    Returns the salt a rewards factory uses for `salt` passed by `caller`.
+    """
+    from eth_utils import keccak
+    return keccak(bytes(address_to_bytes(caller)) + salt_to_bytes(salt))
@@ -0,0 +1,413 @@
+"""
+Declarative multi-project deployment plans.
+
+A plan is a YAML file listing deployment steps across the Brownie projects:
+
+    accounts:
+      curve: ${env:CURVE_DEPLOYER}     # Brownie account id, loaded once
+
+    constants:
+      agent: '0x3e40D73EB977Dc6a537aF587D48316feE66E9C8c'
+
+    steps:
+      - id: curve_manager
+        project: curve
+        account: curve
+        deploy: RewardsManager
+
+      - id: curve_handover
+        project: curve
+        account: curve
+        call: {contract: curve_manager, method: transfer_ownership, args: ['${agent}']}
+
+`${name}` refers to a constant or to the address deployed by the step `name`,
+`${env:NAME}` to an environment variable. A step depends on every step it
+refers to and on those listed in its `depends_on`.
+
+Steps are sent as soon as their dependencies are confirmed, from a single
+thread without waiting for confirmation, so steps of different accounts are
+in flight at the same time while steps of one account go one at a time. The
+nonce and hash of every sent transaction are written to a checkpoint file
+before it is awaited, and every confirmed step afterwards. A crashed run
+resumes where it stopped: confirmed steps are skipped, and sent ones are
+awaited rather than sent again unless the node lost them and their nonce is
+still unused:
+
+    python -m tooling.deploy_plan deployments/rewards_managers.yaml --network mainnet
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+from tooling.abi_index import PROJECTS_ROOT
+
+
+Step = namedtuple('Step', ['id', 'project', 'account', 'deploy', 'call', 'args', 'depends_on'])
+Plan = namedtuple('Plan', ['accounts', 'constants', 'steps'])
+
+_reference_re = re.compile(r'\$\{([\w:]+)\}')
+
+POLL_INTERVAL = 1
+
+
+class StepReverted(Exception):
+    pass
+
+
+class TransactionDropped(Exception):
+    """
+    The node doesn't know a sent transaction and its nonce is still unused,
+    so the step can safely be sent again.
+    """
+
+
+def step_hash(step):
+    return hashlib.sha256(json.dumps(step._asdict(), sort_keys=True).encode()).hexdigest()
+
+
+def _references(value):
+    if isinstance(value, str):
+        return [name for name in _reference_re.findall(value) if not name.startswith('env:')]
+    if isinstance(value, list):
+        return [name for item in value for name in _references(item)]
+    if isinstance(value, dict):
+        return [name for item in value.values() for name in _references(item)]
+    return []
+
+
+def parse_plan(data):
+    """
+    Validates a plan loaded from YAML and returns a `Plan`. Raises `ValueError`
+    for unknown references, accounts or projects and for dependency cycles.
+    """
+    accounts = data.get('accounts', {})
+    constants = data.get('constants', {})
+    steps = []
+    seen = set()
+
+    for raw in data['steps']:
+        step_id = raw['id']
+        if step_id in seen or step_id in constants:
+            raise ValueError(f'duplicate step id: {step_id}')
+        if ('deploy' in raw) == ('call' in raw):
+            raise ValueError(f'step {step_id}: exactly one of `deploy` and `call` is required')
+        if raw['account'] not in accounts:
+            raise ValueError(f'step {step_id}: unknown account {raw["account"]}')
+        if not os.path.isdir(os.path.join(PROJECTS_ROOT, raw['project'])):
+            raise ValueError(f'step {step_id}: unknown project {raw["project"]}')
+
+        call = raw.get('call')
+        args = raw.get('args', []) if call is None else call.get('args', [])
+        depends_on = set(raw.get('depends_on', []))
+        depends_on.update(name for name in _references(args) if name not in constants)
+        if call is not None:
+            depends_on.add(call['contract'])
+
+        steps.append(Step(
+            id=step_id,
+            project=raw['project'],
+            account=raw['account'],
+            deploy=raw.get('deploy'),
+            call=call,
+            args=args,
+            depends_on=sorted(depends_on),
+        ))
+        seen.add(step_id)
+
+    by_id = {step.id: step for step in steps}
+    for step in steps:
+        for dependency in step.depends_on:
+            if dependency not in by_id:
+                raise ValueError(f'step {step.id}: unknown reference {dependency}')
+        if step.call is not None and by_id[step.call['contract']].deploy is None:
+            raise ValueError(f'step {step.id}: {step.call["contract"]} is not a deploy step')
+
+    topological_order(steps)
+    return Plan(accounts, constants, steps)
+
+
+def load_plan(path):
+    import yaml
+    with open(path) as f:
+        return parse_plan(yaml.safe_load(f))
+
+
+def topological_order(steps):
+    by_id = {step.id: step for step in steps}
+    order = []
+    state = {}
+
+    def visit(step_id, path):
+        if state.get(step_id) == 'done':
+            return
+        if state.get(step_id) == 'visiting':
+            raise ValueError(f'dependency cycle: {" -> ".join(path + [step_id])}')
+        state[step_id] = 'visiting'
+        for dependency in by_id[step_id].depends_on:
+            visit(dependency, path + [step_id])
+        state[step_id] = 'done'
+        order.append(by_id[step_id])
+
+    for step in steps:
+        visit(step.id, [])
+    return order
+
+
+def resolve(value, constants, results):
+    if isinstance(value, list):
+        return [resolve(item, constants, results) for item in value]
+    if not isinstance(value, str):
+        return value
+
+    def substitute(match):
+        name = match.group(1)
+        if name.startswith('env:'):
+            env_name = name[len('env:'):]
+            if env_name not in os.environ:
+                raise EnvironmentError(f'Please set {env_name} env variable')
+            return os.environ[env_name]
+        if name in constants:
+            return str(constants[name])
+        return results[name]['address']
+
+    # keep non-string constants (e.g. durations) intact when used on their own
+    match = _reference_re.fullmatch(value)
+    if match and match.group(1) in constants:
+        return constants[match.group(1)]
+    return _reference_re.sub(substitute, value)
+
+
+def load_checkpoint(path, plan):
+    """
+    Returns the `(completed, sent)` steps recorded at `path`.
+    """
+    if not os.path.exists(path):
+        return {}, {}
+    with open(path) as f:
+        checkpoint = json.load(f)
+    completed, sent = checkpoint['steps'], checkpoint.get('sent', {})
+
+    hashes = {step.id: step_hash(step) for step in plan.steps}
+    for step_id, result in [*completed.items(), *sent.items()]:
+        if hashes.get(step_id) != result['step_hash']:
+            raise ValueError(
+                f'step {step_id} changed since it was executed, '
+                f'remove it from {path} to run it again'
+            )
+    return completed, sent
+
+
+def save_checkpoint(path, completed, sent):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'steps': completed, 'sent': sent}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def execute_plan(plan, runner, checkpoint_path, log=print, poll_interval=POLL_INTERVAL):
+    """
+    Executes the steps of `plan` not yet recorded in the checkpoint with
+    `runner`, whose methods are called from this thread only:
+
+    - `next_nonce(step)` returns the nonce of the step account's next transaction
+    - `send(step, args, target, nonce)` broadcasts a step with resolved
+      arguments, `target` being the called contract's address for call steps,
+      and returns the transaction hash without waiting for it
+    - `poll(step, sent)` returns None while the `{'nonce', 'tx'}` transaction is
+      pending and a JSON-serializable dict once it's confirmed, with an
+      `address` for deploy steps. It raises `StepReverted` if the transaction
+      failed and `TransactionDropped` if it can be sent again.
+
+    If a step fails, steps already sent are awaited and checkpointed before
+    the error is raised.
+    """
+    completed, sent = load_checkpoint(checkpoint_path, plan)
+    for step in plan.steps:
+        if step.id in completed:
+            log(f'{step.id}: already done')
+        elif step.id in sent:
+            log(f'{step.id}: awaiting {sent[step.id]["tx"] or "nonce " + str(sent[step.id]["nonce"])}')
+
+    pending = [step for step in topological_order(plan.steps) if step.id not in completed and step.id not in sent]
+    in_flight = [step for step in plan.steps if step.id in sent]
+    error = None
+
+    def checkpoint():
+        save_checkpoint(checkpoint_path, completed, sent)
+
+    while pending or in_flight:
+        if error is None:
+            busy_accounts = {step.account for step in in_flight}
+            for step in list(pending):
+                if step.account in busy_accounts:
+                    continue
+                if not all(dependency in completed for dependency in step.depends_on):
+                    continue
+                args = resolve(step.args, plan.constants, completed)
+                target = completed[step.call['contract']]['address'] if step.call else None
+                # the nonce is recorded before sending, so a crash can't lose track of the transaction
+                sent[step.id] = {'nonce': runner.next_nonce(step), 'tx': None, 'step_hash': step_hash(step)}
+                checkpoint()
+                sent[step.id]['tx'] = runner.send(step, args, target, sent[step.id]['nonce'])
+                checkpoint()
+                log(f'{step.id}: sent {sent[step.id]["tx"]}')
+                in_flight.append(step)
+                busy_accounts.add(step.account)
+                pending.remove(step)
+
+        if not in_flight:
+            break
+
+        confirmed = False
+        for step in list(in_flight):
+            try:
+                result = runner.poll(step, sent[step.id])
+            except TransactionDropped:
+                log(f'{step.id}: transaction dropped, sending it again')
+                del sent[step.id]
+                checkpoint()
+                in_flight.remove(step)
+                pending.insert(0, step)
+                continue
+            except StepReverted as err:
+                log(f'{step.id}: failed: {err}')
+                error = error or err
+                del sent[step.id]
+                checkpoint()
+                in_flight.remove(step)
+                continue
+            if result is None:
+                continue
+            in_flight.remove(step)
+            del sent[step.id]
+            completed[step.id] = {**result, 'step_hash': step_hash(step)}
+            checkpoint()
+            log(f'{step.id}: done {result}')
+            confirmed = True
+
+        if not confirmed and in_flight:
+            time.sleep(poll_interval)
+
+    if error is not None:
+        raise error
+    return completed
+
+
+class BrownieStepRunner:
+    """
+    Runs plan steps with Brownie, loading every project the plan touches into
+    one process and the plan accounts by their Brownie account ids.
+    Transactions are sent with `required_confs=0` and awaited by polling
+    their receipts.
+    """
+
+    def __init__(self, plan, tx_params=None):
+        from brownie import accounts, project, web3
+
+        self.web3 = web3
+        self.tx_params = tx_params or {}
+        self.accounts = {
+            alias: accounts.load(resolve(account_id, plan.constants, {}))
+            for alias, account_id in plan.accounts.items()
+        }
+        self.projects = {}
+        for name in sorted({step.project for step in plan.steps}):
+            project_name = 'Plan' + re.sub(r'\W', '', name.title())
+            self.projects[name] = project.load(os.path.join(PROJECTS_ROOT, name), name=project_name)
+        self.deploy_steps = {step.id: step for step in plan.steps if step.deploy is not None}
+
+    def next_nonce(self, step):
+        return self.web3.eth.get_transaction_count(self.accounts[step.account].address, 'pending')
+
+    def send(self, step, args, target, nonce):
+        tx_params = {**self.tx_params, 'from': self.accounts[step.account], 'nonce': nonce, 'required_confs': 0}
+
+        if step.deploy is not None:
+            tx = self.projects[step.project][step.deploy].deploy(*args, tx_params)
+        else:
+            target_step = self.deploy_steps[step.call['contract']]
+            contract = self.projects[target_step.project][target_step.deploy].at(target)
+            tx = getattr(contract, step.call['method'])(*args, tx_params)
+        return tx.txid
+
+    def poll(self, step, sent):
+        from web3.exceptions import TransactionNotFound
+
+        sender = self.accounts[step.account].address
+        if sent['tx'] is None:
+            return self._poll_unknown(step, sender, sent['nonce'])
+
+        try:
+            receipt = self.web3.eth.get_transaction_receipt(sent['tx'])
+        except TransactionNotFound:
+            try:
+                self.web3.eth.get_transaction(sent['tx'])
+                return None
+            except TransactionNotFound:
+                pass
+            if self.web3.eth.get_transaction_count(sender) > sent['nonce']:
+                raise RuntimeError(
+                    f'{step.id}: {sent["tx"]} is gone but nonce {sent["nonce"]} of {sender} was used, '
+                    f'check the account and fix the checkpoint by hand'
+                )
+            raise TransactionDropped(sent['tx'])
+
+        if receipt['status'] != 1:
+            raise StepReverted(f'{step.id}: {sent["tx"]} reverted')
+        if step.deploy is not None:
+            return {'address': receipt['contractAddress'], 'tx': sent['tx']}
+        return {'tx': sent['tx']}
+
+    def _poll_unknown(self, step, sender, nonce):
+        # the run stopped between recording the nonce and learning the hash
+        from tooling.pipeline import contract_address
+
+        if self.web3.eth.get_transaction_count(sender, 'pending') <= nonce:
+            raise TransactionDropped(f'nonce {nonce}')
+        if self.web3.eth.get_transaction_count(sender) <= nonce:
+            return None
+        address = contract_address(sender, nonce)
+        if step.deploy is not None and len(self.web3.eth.get_code(address)) > 0:
+            return {'address': address, 'tx': None}
+        raise RuntimeError(
+            f'{step.id}: nonce {nonce} of {sender} was used by a transaction of unknown hash, '
+            f'check the account and fix the checkpoint by hand'
+        )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m tooling.deploy_plan')
+    parser.add_argument('plan')
+    parser.add_argument('--network', default='development')
+    parser.add_argument('--checkpoint', help='defaults to <plan>.checkpoint.json')
+    parser.add_argument('--gas-price')
+    parser.add_argument('--yes', action='store_true', help="don't ask for confirmation")
+    options = parser.parse_args(argv)
+
+    plan = load_plan(options.plan)
+    checkpoint_path = options.checkpoint or os.path.splitext(options.plan)[0] + '.checkpoint.json'
+
+    for step in topological_order(plan.steps):
+        action = f'deploy {step.deploy}' if step.deploy else f'{step.call["contract"]}.{step.call["method"]}'
+        print(f'{step.id} [{step.project}, {step.account}]: {action}{tuple(step.args)}')
+    if not options.yes:
+        sys.stdout.write('Proceed? [y/n]: ')
+        if input().lower() not in {'yes', 'y'}:
+            print('Aborting')
+            return 1
+
+    from brownie import Wei, network
+    network.connect(options.network)
+    tx_params = {'gas_price': Wei(options.gas_price)} if options.gas_price else {}
+    execute_plan(plan, BrownieStepRunner(plan, tx_params), checkpoint_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
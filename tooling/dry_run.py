@@ -0,0 +1,220 @@
+"""
+Local dry runs of vote scripts.
+
+`dry_run_script` executes every action of a call script on the connected
+development node as if the executing app (the Voting app, or the Agent for
+forwarded scripts) sent it, then reverts the chain. The report lists each
+call's success, gas used, emitted events, the token balance deltas of the
+transfer parties and the ETH balance deltas of the executor, the called
+contracts and every address emitting or named in the events and transfers.
+
+Unlike `Voting.executeVote`, actions run as separate transactions, so a
+failing action is reported instead of reverting the whole script.
+
+Reports are cached on disk by (script hash, executor, state root), so
+reviewing the same proposal against the same chain state again is instant.
+"""
+import hashlib
+import json
+import os
+
+from tooling.abi_index import REPO_ROOT
+from tooling.evm_script import decode_call_script, format_address, to_bytes
+
+
+DEFAULT_CACHE_DIR = os.path.join(REPO_ROOT, '.cache', 'dry_run')
+
+ACTION_GAS_LIMIT = 12_000_000
+
+# keccak256('Transfer(address,address,uint256)')
+TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+BALANCE_OF_SELECTOR = '0x70a08231'
+
+# part of the cache key, bump when the report changes
+REPORT_VERSION = 2
+
+
+def cache_key(script, executor, state_root):
+    digest = hashlib.sha256()
+    digest.update(f'v{REPORT_VERSION}'.encode())
+    digest.update(bytes(to_bytes(script)))
+    digest.update(executor.lower().encode())
+    digest.update(state_root.lower().encode())
+    return digest.hexdigest()
+
+
+def _to_json(value):
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return int(value)
+    return str(value)
+
+
+def _hex(value):
+    return value if isinstance(value, str) else '0x' + bytes(value).hex()
+
+
+def _topic_address(topic):
+    return '0x' + _hex(topic)[-40:]
+
+
+def _transfer_parties(logs):
+    for log in logs:
+        topics = [_hex(t) for t in log['topics']]
+        # ERC721 transfers index the token id and carry no data
+        if len(topics) != 3 or topics[0] != TRANSFER_TOPIC or len(to_bytes(log['data'])) != 32:
+            continue
+        for topic in topics[1:]:
+            if int(topic, 16) != 0:
+                yield log['address'], _topic_address(topic)
+
+
+def _event_addresses(events):
+    for event in events:
+        yield event['address']
+        for value in event['args'].values():
+            if isinstance(value, str) and len(value) == 42 and value.startswith('0x'):
+                yield value
+
+
+def _balance_of(web3, token, holder, block_identifier):
+    data = BALANCE_OF_SELECTOR + '00' * 12 + holder[2:]
+    try:
+        result = web3.eth.call({'to': token, 'data': data}, block_identifier)
+    except ValueError:
+        return None
+    return int.from_bytes(to_bytes(result), 'big') if len(to_bytes(result)) >= 32 else None
+
+
+def _execute_action(web3, executor, to, calldata):
+    from brownie.network.event import decode_logs
+
+    try:
+        tx_hash = web3.eth.send_transaction({
+            'from': executor,
+            'to': to,
+            'data': '0x' + bytes(calldata).hex(),
+            'gas': ACTION_GAS_LIMIT,
+            'gasPrice': 0,
+        })
+    except ValueError as err:
+        # ganache reports reverted transactions as RPC errors
+        return {'success': False, 'gas_used': None, 'error': str(err), 'events': []}, []
+
+    receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+    events = [
+        {'name': event.name, 'address': event.address, 'args': _to_json(dict(event))}
+        for event in decode_logs(receipt['logs'])
+    ]
+    result = {
+        'success': receipt['status'] == 1,
+        'gas_used': receipt['gasUsed'],
+        'error': None,
+        'events': events,
+    }
+    return result, receipt['logs']
+
+
+def dry_run_script(script, executor, index=None, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Dry-runs `script` from the `executor` address on the connected development
+    node and returns a JSON-serializable report. `index` is an optional
+    `tooling.abi_index.SelectorIndex` used to name the called functions.
+    """
+    from brownie import accounts, web3
+
+    executor = web3.toChecksumAddress(executor)
+    state_root = _hex(web3.eth.get_block('latest')['stateRoot'])
+    key = cache_key(script, executor, state_root)
+    cache_path = os.path.join(cache_dir, f'{key}.json') if cache_dir else None
+
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            return json.load(f)
+
+    _, actions = decode_call_script(script)
+    block_before = web3.eth.block_number
+    # unlocks the executor on the fork, scripts are sent with a zero gas price
+    accounts.at(executor, force=True)
+
+    # raw snapshots don't clobber the one held by brownie's `chain` (e.g. fn_isolation)
+    snapshot_id = web3.provider.make_request('evm_snapshot', [])['result']
+    try:
+        calls = []
+        touched = set()
+        holders = {executor}
+        for to, calldata in actions:
+            to = web3.toChecksumAddress(format_address(to))
+            decoded = index.decode_calldata(calldata) if index is not None else None
+            result, logs = _execute_action(web3, executor, to, calldata)
+            calls.append({
+                'to': to,
+                'function': decoded.signature if decoded else '0x' + bytes(calldata[:4]).hex(),
+                **result,
+            })
+            touched.update(_transfer_parties(logs))
+            holders.add(to)
+            holders.update(_event_addresses(result['events']))
+
+        balance_deltas = {}
+        for token, holder in sorted(touched):
+            before = _balance_of(web3, token, holder, block_before)
+            after = _balance_of(web3, token, holder, 'latest')
+            if before is not None and after is not None and after != before:
+                balance_deltas.setdefault(token, {})[holder] = after - before
+
+        # actions are sent with a zero gas price, so only transfers move ETH
+        eth_deltas = {}
+        holders.update(holder for _, holder in touched)
+        for holder in sorted({holder.lower() for holder in holders}):
+            address = web3.toChecksumAddress(holder)
+            delta = web3.eth.get_balance(address, 'latest') - web3.eth.get_balance(address, block_before)
+            if delta:
+                eth_deltas[holder] = delta
+    finally:
+        web3.provider.make_request('evm_revert', [snapshot_id])
+
+    report = {
+        'executor': executor,
+        'state_root': state_root,
+        'script_sha256': hashlib.sha256(bytes(to_bytes(script))).hexdigest(),
+        'calls': calls,
+        'balance_deltas': balance_deltas,
+        'eth_deltas': eth_deltas,
+    }
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    return report
+
+
+def format_report(report):
+    lines = [f'executor: {report["executor"]}']
+    for number, call in enumerate(report['calls'], start=1):
+        if call['success']:
+            status = f'ok, gas used {call["gas_used"]}'
+        else:
+            status = f'REVERTED: {call["error"] or "status 0"}'
+        lines.append(f'#{number} {call["to"]} {call["function"]}: {status}')
+        for event in call['events']:
+            lines.append(f'    {event["name"]} @ {event["address"]}: {event["args"]}')
+    if report['balance_deltas']:
+        lines.append('balance deltas:')
+        for token, deltas in report['balance_deltas'].items():
+            for holder, delta in deltas.items():
+                lines.append(f'    {token} {holder}: {delta:+}')
+    if report['eth_deltas']:
+        lines.append('ETH deltas:')
+        for holder, delta in report['eth_deltas'].items():
+            lines.append(f'    {holder}: {delta:+}')
+    return '\n'.join(lines)
@@ -0,0 +1,127 @@
+"""
+Aragon EVM call script (spec id 1) encoding and decoding.
+
+A call script is a 4-byte executor id followed by one record per action:
+
+    <to: 20 bytes> <calldata length: uint32, big-endian> <calldata>
+"""
+import struct
+
+
+EMPTY_CALLSCRIPT = '0x00000001'
+
+ADDRESS_LENGTH = 20
+LENGTH_PREFIX_LENGTH = 4
+EXECUTOR_ID_LENGTH = 4
+ACTION_HEADER_LENGTH = ADDRESS_LENGTH + LENGTH_PREFIX_LENGTH
+
+MAX_CALLDATA_LENGTH = 2 ** 32 - 1
+
+
+def create_executor_id(id):
+    return '0x' + str(id).zfill(8)
+
+
+def strip_byte_prefix(hexstr):
+    return hexstr[2:] if hexstr[0:2] == '0x' else hexstr
+
+
+def to_bytes(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return value
+    if not isinstance(value, str):
+        value = str(value)
+    return bytes.fromhex(value[2:] if value[0:2] == '0x' else value)
+
+
+def address_to_bytes(address):
+    address_bytes = to_bytes(address)
+    if len(address_bytes) != ADDRESS_LENGTH:
+        raise ValueError(f'invalid address: {address}')
+    return address_bytes
+
+
+def encode_call_script_bytes(actions, spec_id=1):
+    """
+    Encodes `(to, calldata)` pairs into a call script and returns it as bytes.
+
+    Each action is converted to bytes once, then the script is written into
+    a single preallocated buffer, so encoding time is linear in the output size.
+    """
+    executor_id = bytes.fromhex(strip_byte_prefix(create_executor_id(spec_id)))
+
+    # scripts usually target a handful of contracts, so convert each address once
+    address_cache = {}
+    encoded_actions = []
+    total_length = len(executor_id)
+    for to, calldata in actions:
+        if isinstance(to, str):
+            addr_bytes = address_cache.get(to)
+            if addr_bytes is None:
+                addr_bytes = address_cache[to] = address_to_bytes(to)
+        else:
+            addr_bytes = address_to_bytes(to)
+        calldata_bytes = to_bytes(calldata)
+        if len(calldata_bytes) > MAX_CALLDATA_LENGTH:
+            raise ValueError(f'calldata for {to} is too long: {len(calldata_bytes)} bytes')
+        encoded_actions.append((addr_bytes, calldata_bytes))
+        total_length += ACTION_HEADER_LENGTH + len(calldata_bytes)
+
+    script = bytearray(total_length)
+    script[0:len(executor_id)] = executor_id
+    offset = len(executor_id)
+    pack_length = struct.Struct('>I').pack_into
+    for addr_bytes, calldata_bytes in encoded_actions:
+        calldata_offset = offset + ACTION_HEADER_LENGTH
+        script[offset:offset + ADDRESS_LENGTH] = addr_bytes
+        pack_length(script, offset + ADDRESS_LENGTH, len(calldata_bytes))
+        offset = calldata_offset + len(calldata_bytes)
+        script[calldata_offset:offset] = calldata_bytes
+
+    return bytes(script)
+
+
+def encode_call_script(actions, spec_id=1):
+    return '0x' + encode_call_script_bytes(actions, spec_id).hex()
+
+
+def decode_call_script(script):
+    """
+    Decodes a call script into `(spec_id, actions)`.
+
+    `actions` lazily yields `(to, calldata)` pairs as memoryview slices over
+    `script`, which may be any bytes-like object (including an `mmap`), so
+    large scripts are walked in constant memory. Hex strings are converted
+    to bytes first. Raises `ValueError` on a truncated or malformed script;
+    errors in action records are raised while iterating.
+    """
+    if isinstance(script, str):
+        script = to_bytes(script)
+    view = memoryview(script).cast('B')
+    if len(view) < EXECUTOR_ID_LENGTH:
+        raise ValueError(f'call script is too short: {len(view)} bytes')
+    spec_id = int.from_bytes(view[0:EXECUTOR_ID_LENGTH], 'big')
+    return spec_id, _iter_actions(view)
+
+
+def _iter_actions(view):
+    unpack_length = struct.Struct('>I').unpack_from
+    script_length = len(view)
+    offset = EXECUTOR_ID_LENGTH
+    while offset < script_length:
+        calldata_offset = offset + ACTION_HEADER_LENGTH
+        if calldata_offset > script_length:
+            raise ValueError(f'truncated action header at offset {offset}')
+        (calldata_length,) = unpack_length(view, offset + ADDRESS_LENGTH)
+        end = calldata_offset + calldata_length
+        if end > script_length:
+            raise ValueError(
+                f'calldata length {calldata_length} at offset {offset} '
+                f'exceeds the remaining {script_length - calldata_offset} bytes'
+            )
+        yield view[offset:offset + ADDRESS_LENGTH], view[calldata_offset:end]
+        offset = end
+
+
+def format_address(address_bytes):
+    return '0x' + bytes(address_bytes).hex()
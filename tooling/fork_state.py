@@ -0,0 +1,251 @@
+"""
+Recorded mainnet state for offline fork tests.
+
+The projects test against a ganache fork of mainnet, which fetches every
+account, code and storage slot a test touches from a remote node. Here a
+local JSON-RPC proxy sits between ganache and that node: while recording it
+pins the fork block, forwards ganache's requests and keeps the answers; while
+replaying it answers from the state file alone, so the suite runs offline.
+
+    python -m tooling.fork_state add-network          # once per machine
+    cd projects/curve
+    python -m tooling.fork_state record tests/fork_state.json.gz -- brownie test --network mainnet-state
+    python -m tooling.fork_state replay tests/fork_state.json.gz -- brownie test --network mainnet-state
+
+(with the repository root on PYTHONPATH.) Replaying a request that wasn't
+recorded is an error rather than a guess, so a test touching new state fails
+until the state is recorded again.
+"""
+import argparse
+import gzip
+import json
+import os
+import subprocess
+import sys
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+NETWORK_ID = 'mainnet-state'
+PROXY_HOST = '127.0.0.1'
+PROXY_PORT = 8600
+
+ACCOUNT_FIELDS = {
+    'eth_getBalance': 'balance',
+    'eth_getTransactionCount': 'nonce',
+    'eth_getCode': 'code',
+}
+BLOCK_TAGS = {'latest', 'pending'}
+
+
+class NotRecorded(Exception):
+    pass
+
+
+class ForkState:
+    """
+    State of the chain at the fork block as seen by recorded requests:
+    per-account balance, nonce, code and storage slots, plus the answers to
+    any other request (blocks, chain id, ...) keyed by the canonical request.
+    """
+
+    def __init__(self, block_number=None, accounts=None, requests=None):
+        self.block_number = block_number
+        self.accounts = accounts or {}
+        self.requests = requests or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt') as f:
+            data = json.load(f)
+        return cls(data['block_number'], data['accounts'], data['requests'])
+
+    def save(self, path):
+        opener = gzip.open if path.endswith('.gz') else open
+        tmp_path = path + '.tmp'
+        with self._lock, opener(tmp_path, 'wt') as f:
+            json.dump({
+                'block_number': self.block_number,
+                'accounts': self.accounts,
+                'requests': self.requests,
+            }, f, sort_keys=True, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def pin(self, params):
+        """
+        Replaces `latest`/`pending` block tags with the fork block.
+        """
+        pinned = hex(self.block_number)
+        return [pinned if param in BLOCK_TAGS else param for param in params]
+
+    def _at_fork_block(self, block):
+        if block in BLOCK_TAGS:
+            return True
+        return isinstance(block, str) and block.startswith('0x') and int(block, 16) == self.block_number
+
+    def _slot(self, method, params):
+        """
+        Returns `(address, field)` for account state at the fork block and
+        None for anything else.
+        """
+        if method in ACCOUNT_FIELDS and len(params) == 2 and self._at_fork_block(params[1]):
+            return params[0].lower(), ACCOUNT_FIELDS[method]
+        if method == 'eth_getStorageAt' and len(params) == 3 and self._at_fork_block(params[2]):
+            return params[0].lower(), hex(int(params[1], 16))
+        return None
+
+    def _request_key(self, method, params):
+        return json.dumps([method, self.pin(params)], sort_keys=True, separators=(',', ':'))
+
+    def lookup(self, method, params):
+        if method == 'eth_blockNumber':
+            return hex(self.block_number)
+
+        slot = self._slot(method, params)
+        with self._lock:
+            if slot is None:
+                key = self._request_key(method, params)
+                if key in self.requests:
+                    return self.requests[key]
+            else:
+                address, field = slot
+                account = self.accounts.get(address, {})
+                value = account.get(field) if field in ACCOUNT_FIELDS.values() else account.get('storage', {}).get(field)
+                if value is not None:
+                    return value
+        raise NotRecorded(f'{method}{params} was not recorded')
+
+    def record(self, method, params, result):
+        slot = self._slot(method, params)
+        with self._lock:
+            if slot is None:
+                self.requests[self._request_key(method, params)] = result
+                return
+            address, field = slot
+            account = self.accounts.setdefault(address, {})
+            if field in ACCOUNT_FIELDS.values():
+                account[field] = result
+            else:
+                account.setdefault('storage', {})[field] = result
+
+
+def rpc_call(url, method, params):
+    body = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params}).encode()
+    request = urllib.request.Request(url, body, {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.load(response)
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if isinstance(payload, list):
+            response = [self.server.handle_call(call) for call in payload]
+        else:
+            response = self.server.handle_call(payload)
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StateProxy(ThreadingHTTPServer):
+    """
+    JSON-RPC endpoint for ganache's `fork` setting. Records `state` from
+    `upstream` when it's given and replays it otherwise.
+    """
+    daemon_threads = True
+
+    def __init__(self, state, upstream=None, address=(PROXY_HOST, PROXY_PORT)):
+        self.state = state
+        self.upstream = upstream
+        if upstream is not None and state.block_number is None:
+            state.block_number = int(rpc_call(upstream, 'eth_blockNumber', [])['result'], 16)
+        super().__init__(address, _ProxyHandler)
+
+    def handle_call(self, call):
+        method, params = call['method'], call.get('params', [])
+        response = {'jsonrpc': '2.0', 'id': call.get('id')}
+        try:
+            response['result'] = self.state.lookup(method, params)
+            return response
+        except NotRecorded as err:
+            if self.upstream is None:
+                response['error'] = {'code': -32000, 'message': str(err)}
+                return response
+
+        upstream_response = rpc_call(self.upstream, method, self.state.pin(params))
+        if 'error' in upstream_response:
+            response['error'] = upstream_response['error']
+        else:
+            self.state.record(method, params, upstream_response['result'])
+            response['result'] = upstream_response['result']
+        return response
+
+
+def run_with_proxy(proxy, command):
+    thread = threading.Thread(target=proxy.serve_forever, daemon=True)
+    thread.start()
+    try:
+        return subprocess.run(command).returncode
+    finally:
+        proxy.shutdown()
+        proxy.server_close()
+
+
+def default_upstream():
+    if 'WEB3_INFURA_PROJECT_ID' not in os.environ:
+        raise EnvironmentError('Please set WEB3_INFURA_PROJECT_ID env variable or pass --upstream')
+    return f'https://mainnet.infura.io/v3/{os.environ["WEB3_INFURA_PROJECT_ID"]}'
+
+
+def add_network():
+    subprocess.run([
+        'brownie', 'networks', 'add', 'Development', NETWORK_ID,
+        'cmd=ganache-cli', 'host=http://127.0.0.1', 'port=8545', 'gas_limit=12000000',
+        'accounts=10', 'evm_version=istanbul', 'mnemonic=brownie',
+        f'fork=http://{PROXY_HOST}:{PROXY_PORT}',
+    ], check=True)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m tooling.fork_state')
+    parser.add_argument('action', choices=['record', 'replay', 'add-network'])
+    parser.add_argument('state', nargs='?', help='state file, gzipped if it ends with .gz')
+    parser.add_argument('--upstream', help='mainnet RPC to record from, defaults to Infura')
+    parser.add_argument('--block', type=int, help='fork block to record at, defaults to the latest')
+    parser.add_argument('command', nargs=argparse.REMAINDER, help='-- command to run, e.g. brownie test')
+    options = parser.parse_args(argv)
+
+    if options.action == 'add-network':
+        add_network()
+        return 0
+
+    command = options.command[1:] if options.command[:1] == ['--'] else options.command
+    if not options.state or not command:
+        parser.error('a state file and a command to run are required')
+
+    if options.action == 'record':
+        state = ForkState(options.block)
+        proxy = StateProxy(state, options.upstream or default_upstream())
+        returncode = run_with_proxy(proxy, command)
+        state.save(options.state)
+        print(
+            f'recorded {len(state.accounts)} accounts and {len(state.requests)} other requests '
+            f'at block {state.block_number} to {options.state}'
+        )
+        return returncode
+
+    return run_with_proxy(StateProxy(ForkState.load(options.state)), command)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,175 @@
+"""
+Offline gas and size estimation for vote scripts.
+
+A vote costs gas twice: `TokenManager.forward(newVote(script, ...))` pays
+calldata gas for the script and stores it in the Voting app, and
+`Voting.executeVote` later runs every action. Both have to fit into a block.
+
+Per-action execution gas comes from a per-selector table (`gas_table.json`)
+measured on a local node with `measure_gas_table`; each entry records the
+node it was measured on in `measured_on`. Selectors that were not
+measured fall back to the table default, which is a guess: an execution
+estimate that only exceeds the limit because of it is a warning, not an error.
+"""
+import json
+import os
+import sys
+import warnings
+from collections import namedtuple
+
+from tooling.evm_script import decode_call_script, format_address, to_bytes
+
+
+GAS_TABLE_PATH = os.path.join(os.path.dirname(__file__), 'gas_table.json')
+
+BLOCK_GAS_LIMIT = 12_000_000
+
+TX_BASE_GAS = 21_000
+# EIP-2028 (Istanbul) calldata pricing
+ZERO_BYTE_GAS = 4
+NONZERO_BYTE_GAS = 16
+# a fresh storage slot, the Voting app keeps the whole script in storage
+STORAGE_WORD_GAS = 20_000
+
+ActionGas = namedtuple('ActionGas', ['to', 'selector', 'signature', 'gas', 'measured'])
+ScriptGasEstimate = namedtuple('ScriptGasEstimate', [
+    'script_bytes',
+    'intrinsic_gas',
+    'create_gas',
+    'execute_gas',
+    'actions',
+])
+
+
+def calldata_gas(data):
+    data = to_bytes(data)
+    zero_bytes = bytes(data).count(0)
+    return zero_bytes * ZERO_BYTE_GAS + (len(data) - zero_bytes) * NONZERO_BYTE_GAS
+
+
+def intrinsic_gas(data):
+    return TX_BASE_GAS + calldata_gas(data)
+
+
+def storage_gas(size):
+    return (size + 31) // 32 * STORAGE_WORD_GAS
+
+
+def load_gas_table(path=GAS_TABLE_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_gas_table(table, path=GAS_TABLE_PATH):
+    with open(path, 'w') as f:
+        json.dump(table, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def estimate_action_gas(to, calldata, table):
+    selector = '0x' + bytes(calldata[:4]).hex()
+    entry = table['selectors'].get(selector)
+    if entry is None:
+        return ActionGas(to, selector, None, table['default_action_gas'], False)
+    return ActionGas(to, selector, entry['signature'], entry['gas'], True)
+
+
+def estimate_script_gas(script, table=None):
+    """
+    Estimates the gas needed to create a vote with `script` as its execution
+    script and to execute it.
+    """
+    table = table or load_gas_table()
+    script = to_bytes(script)
+    _, decoded = decode_call_script(script)
+
+    actions = [
+        estimate_action_gas(format_address(to), calldata, table)
+        for to, calldata in decoded
+    ]
+    # the script is sent as part of the forward() calldata and then
+    # written to storage by the Voting app
+    create_gas = (
+        table['create_vote_base_gas']
+        + intrinsic_gas(script)
+        + storage_gas(len(script))
+    )
+    execute_gas = (
+        table['execute_vote_base_gas']
+        + sum(action.gas + table['action_overhead_gas'] for action in actions)
+    )
+    return ScriptGasEstimate(len(script), intrinsic_gas(script), create_gas, execute_gas, actions)
+
+
+def assert_script_fits(script, gas_limit=BLOCK_GAS_LIMIT, table=None):
+    """
+    Raises `ValueError` if creating or executing a vote for `script` is
+    estimated to exceed `gas_limit`. Only warns about execution if some
+    actions are priced at the unmeasured default.
+    """
+    estimate = estimate_script_gas(script, table)
+    if estimate.create_gas > gas_limit:
+        raise ValueError(
+            f'creating the vote needs ~{estimate.create_gas} gas for a '
+            f'{estimate.script_bytes}-byte script, over the {gas_limit} gas limit'
+        )
+    if estimate.execute_gas > gas_limit:
+        message = (
+            f'executing the vote needs ~{estimate.execute_gas} gas for '
+            f'{len(estimate.actions)} actions, over the {gas_limit} gas limit'
+        )
+        unmeasured = sorted({action.selector for action in estimate.actions if not action.measured})
+        if not unmeasured:
+            raise ValueError(message)
+        warnings.warn(f'{message}; unmeasured selectors {", ".join(unmeasured)} use the default gas')
+    return estimate
+
+
+def measure_gas_table(web3, executor, actions, source, table=None, path=GAS_TABLE_PATH):
+    """
+    Measures the execution gas of `(to, calldata, signature)` actions sent
+    from `executor` (e.g. the Voting app) via `eth_estimateGas` on a local
+    node and records the per-selector maximum in the gas table. `source`
+    describes the node, e.g. the fork block; a measurement on another
+    source replaces the entry instead of being merged into it.
+    """
+    table = table or load_gas_table(path)
+    for to, calldata, signature in actions:
+        calldata = to_bytes(calldata)
+        gas = web3.eth.estimate_gas({
+            'from': executor,
+            'to': to,
+            'data': '0x' + bytes(calldata).hex(),
+        }) - intrinsic_gas(calldata)
+        selector = '0x' + bytes(calldata[:4]).hex()
+        entry = table['selectors'].get(selector)
+        if entry is None or entry.get('measured_on') != source:
+            entry = table['selectors'][selector] = {'signature': signature, 'gas': 0, 'measured_on': source}
+        entry['gas'] = max(entry['gas'], gas)
+    save_gas_table(table, path)
+    return table
+
+
+def format_estimate(estimate):
+    lines = [
+        f'script size:     {estimate.script_bytes} bytes',
+        f'intrinsic gas:   {estimate.intrinsic_gas}',
+        f'create vote gas: ~{estimate.create_gas}',
+        f'execute gas:     ~{estimate.execute_gas}',
+    ]
+    for action in estimate.actions:
+        source = 'measured' if action.measured else 'default'
+        lines.append(f'  {action.to} {action.signature or action.selector}: ~{action.gas} ({source})')
+    return '\n'.join(lines)
+
+
+def main(argv):
+    if len(argv) != 1:
+        print('usage: python -m tooling.gas <call script>')
+        return 1
+    print(format_estimate(estimate_script_gas(argv[0])))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,442 @@
+"""
+In-process EVM for unit tests that don't need mainnet state.
+
+Brownie runs every call and transaction through JSON-RPC to a ganache
+subprocess, which dominates the run time of small access-control and
+accounting tests. `InProcessEVM` executes them in py-evm through eth-tester
+instead and mirrors the parts of the Brownie API those tests use:
+
+    chain = InProcessEVM()
+    ape, stranger = chain.accounts[0], chain.accounts[9]
+    manager = chain.deploy(RewardsManager, {'from': ape})
+    with reverts('not permitted'):
+        manager.transfer_ownership(stranger, {'from': stranger})
+    tx = manager.recover_erc20(token, {'from': ape})
+    assert tx.events[0].name == 'Transfer'
+
+Contract types are anything with `abi` and `bytecode`: Brownie containers
+(compiled by `brownie.project.load` or `compile_source`, no network needed)
+or build artifacts loaded with `load_artifact`. `at` also takes the
+project's interfaces, like `interface.ERC20(address)` does on the fork. Needs eth-tester with the
+py-evm backend, a version matching Brownie's eth-abi 2.x:
+
+    pip install 'eth-tester[py-evm]==0.5.0b4'
+
+There is no mainnet state, so anything touching a mainnet address (LDO, the
+DAO apps, the pools) stays in the Brownie tests on the fork.
+"""
+import contextlib
+import json
+from collections import namedtuple
+from collections.abc import Mapping
+from decimal import Decimal
+
+from tooling.abi_index import SELECTOR_LENGTH, canonical_type, function_selector, function_signature
+from tooling.evm_script import to_bytes
+
+
+ERROR_SELECTOR = bytes.fromhex('08c379a0')  # Error(string)
+
+WEI_UNITS = {
+    'wei': 1,
+    'gwei': 10 ** 9,
+    'ether': 10 ** 18,
+}
+
+ContractType = namedtuple('ContractType', ['name', 'abi', 'bytecode'])
+
+
+class VirtualMachineError(Exception):
+    def __init__(self, revert_msg):
+        self.revert_msg = revert_msg
+        super().__init__(f'revert: {revert_msg}' if revert_msg else 'revert')
+
+
+def load_artifact(path):
+    with open(path) as f:
+        artifact = json.load(f)
+    return ContractType(artifact['contractName'], artifact['abi'], artifact['bytecode'])
+
+
+def as_contract_type(container):
+    if isinstance(container, ContractType):
+        return container
+    name = getattr(container, '_name', None) or type(container).__name__
+    # interfaces (`project.interface.ERC20`) have no bytecode, only `at` takes them
+    return ContractType(name, container.abi, getattr(container, 'bytecode', None))
+
+
+def to_wei(value):
+    if isinstance(value, int):
+        return value
+    amount, _, unit = str(value).strip().partition(' ')
+    return int(Decimal(amount) * WEI_UNITS[unit or 'wei'])
+
+
+def revert_reason(err):
+    """
+    Returns the revert string of an eth-tester `TransactionFailed`, which
+    carries either the decoded reason or the raw revert data.
+    """
+    reason = err.args[0] if err.args else None
+    while isinstance(reason, Exception):
+        reason = reason.args[0] if reason.args else None
+    if isinstance(reason, (bytes, bytearray)):
+        from eth_abi import decode_single
+        if bytes(reason[:SELECTOR_LENGTH]) != ERROR_SELECTOR:
+            return None
+        return decode_single('string', bytes(reason[SELECTOR_LENGTH:]))
+    if not reason or reason == 'execution reverted':
+        return None
+    return str(reason)
+
+
+@contextlib.contextmanager
+def reverts(revert_msg=None):
+    """
+    Same as `brownie.reverts`: the block must revert, with `revert_msg` if
+    it's given.
+    """
+    try:
+        yield
+    except VirtualMachineError as err:
+        if revert_msg is not None and err.revert_msg != revert_msg:
+            raise AssertionError(f'Unexpected revert string {err.revert_msg!r}, expected {revert_msg!r}') from None
+        return
+    raise AssertionError('Transaction did not revert')
+
+
+def _to_abi(value):
+    if isinstance(value, (Account, Contract)):
+        return value.address
+    if isinstance(value, (list, tuple)):
+        return [_to_abi(item) for item in value]
+    return value
+
+
+def _from_abi(abi_type, value):
+    from eth_utils import to_checksum_address
+
+    if abi_type == 'address':
+        return to_checksum_address(value)
+    if abi_type.endswith(']'):
+        item_type = abi_type[:abi_type.rindex('[')]
+        return [_from_abi(item_type, item) for item in value]
+    return value
+
+
+def _split_tx_params(args):
+    if args and isinstance(args[-1], dict):
+        return args[:-1], args[-1]
+    return args, {}
+
+
+def _encode_inputs(abi_inputs, args):
+    from eth_abi import encode_abi
+
+    types = [canonical_type(i) for i in abi_inputs]
+    return encode_abi(types, [_to_abi(arg) for arg in args])
+
+
+def _decode_outputs(abi_outputs, data):
+    from eth_abi import decode_abi
+
+    types = [canonical_type(o) for o in abi_outputs]
+    values = [_from_abi(t, v) for t, v in zip(types, decode_abi(types, data))]
+    if len(values) == 1:
+        return values[0]
+    return tuple(values) if values else None
+
+
+class Event(Mapping):
+    def __init__(self, name, address, values):
+        self.name = name
+        self.address = address
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f'<Event {self.name} {self._values}>'
+
+
+class EventItem(list):
+    """
+    Events of one name; like Brownie, a string key reads the first one.
+    """
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return list.__getitem__(self, 0)[key]
+        return list.__getitem__(self, key)
+
+
+class EventDict:
+    """
+    Decoded events of a transaction, indexed by position or by name.
+    """
+
+    def __init__(self, events):
+        self._events = events
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            found = EventItem(event for event in self._events if event.name == key)
+            if not found:
+                raise KeyError(f'Event {key!r} did not fire')
+            return found
+        return self._events[key]
+
+    def __contains__(self, name):
+        return any(event.name == name for event in self._events)
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __len__(self):
+        return len(self._events)
+
+    def __repr__(self):
+        return repr(self._events)
+
+
+TransactionReceipt = namedtuple('TransactionReceipt', [
+    'txid', 'sender', 'receiver', 'contract_address', 'status', 'gas_used', 'block_number', 'events',
+])
+
+
+class Account:
+    def __init__(self, evm, address):
+        self._evm = evm
+        self.address = address
+
+    def balance(self):
+        return self._evm.tester.get_balance(self.address)
+
+    def transfer(self, to, amount):
+        return self._evm.transact({'from': self, 'value': amount}, to, b'')
+
+    def deploy(self, container, *args):
+        args, tx_params = _split_tx_params(args)
+        return self._evm.deploy(container, *args, {**tx_params, 'from': self})
+
+    def __eq__(self, other):
+        if isinstance(other, (Account, Contract)):
+            other = other.address
+        return isinstance(other, str) and other.lower() == self.address.lower()
+
+    def __hash__(self):
+        return hash(self.address.lower())
+
+    def __str__(self):
+        return self.address
+
+    def __repr__(self):
+        return f'<Account {self.address}>'
+
+
+class ContractMethod:
+    """
+    All ABI entries of a function name; Vyper default arguments produce one
+    entry per arity, so the entry is picked by the number of arguments.
+    """
+
+    def __init__(self, contract, abi_entries):
+        self._contract = contract
+        self._entries = {len(entry['inputs']): entry for entry in abi_entries}
+
+    def _entry(self, args):
+        if len(args) not in self._entries:
+            arities = ', '.join(str(arity) for arity in sorted(self._entries))
+            raise TypeError(f'expected {arities} arguments, got {len(args)}')
+        return self._entries[len(args)]
+
+    def _calldata(self, entry, args):
+        selector = to_bytes(function_selector(function_signature(entry)))
+        return selector + _encode_inputs(entry['inputs'], args)
+
+    def __call__(self, *args):
+        args, tx_params = _split_tx_params(args)
+        entry = self._entry(args)
+        if entry.get('stateMutability') in ('view', 'pure') or entry.get('constant'):
+            return self.call(*args, tx_params)
+        return self.transact(*args, tx_params)
+
+    def call(self, *args):
+        args, tx_params = _split_tx_params(args)
+        entry = self._entry(args)
+        data = self._contract._evm.call(tx_params, self._contract, self._calldata(entry, args))
+        return _decode_outputs(entry['outputs'], data)
+
+    def transact(self, *args):
+        args, tx_params = _split_tx_params(args)
+        entry = self._entry(args)
+        return self._contract._evm.transact(tx_params, self._contract, self._calldata(entry, args))
+
+
+class Contract:
+    def __init__(self, evm, contract_type, address):
+        self._evm = evm
+        self._name = contract_type.name
+        self.abi = contract_type.abi
+        self.address = address
+
+        functions = {}
+        for entry in self.abi:
+            if entry.get('type') == 'function':
+                functions.setdefault(entry['name'], []).append(entry)
+        for name, entries in functions.items():
+            setattr(self, name, ContractMethod(self, entries))
+
+    def balance(self):
+        return self._evm.tester.get_balance(self.address)
+
+    def __eq__(self, other):
+        if isinstance(other, (Account, Contract)):
+            other = other.address
+        return isinstance(other, str) and other.lower() == self.address.lower()
+
+    def __hash__(self):
+        return hash(self.address.lower())
+
+    def __str__(self):
+        return self.address
+
+    def __repr__(self):
+        return f'<{self._name} Contract {self.address}>'
+
+
+class InProcessEVM:
+    def __init__(self):
+        from eth_tester import EthereumTester, PyEVMBackend
+
+        self.tester = EthereumTester(PyEVMBackend())
+        self.accounts = [Account(self, address) for address in self.tester.get_accounts()]
+        # event topic -> (name, abi entry), for every contract type deployed or attached
+        self._events = {}
+
+    def _register(self, contract_type):
+        from eth_utils import keccak
+
+        for entry in contract_type.abi:
+            if entry.get('type') == 'event' and not entry.get('anonymous'):
+                topic = keccak(text=function_signature(entry))
+                self._events[topic] = (entry['name'], entry)
+
+    def deploy(self, container, *args):
+        args, tx_params = _split_tx_params(args)
+        contract_type = as_contract_type(container)
+        constructor = next((e for e in contract_type.abi if e.get('type') == 'constructor'), {'inputs': []})
+        data = bytes(to_bytes(contract_type.bytecode)) + _encode_inputs(constructor['inputs'], args)
+
+        self._register(contract_type)
+        receipt = self.transact(tx_params, None, data)
+        return Contract(self, contract_type, receipt.contract_address)
+
+    def at(self, container, address):
+        contract_type = as_contract_type(container)
+        self._register(contract_type)
+        return Contract(self, contract_type, str(_to_abi(address)))
+
+    def _transaction(self, tx_params, to, data):
+        sender = tx_params.get('from') or self.accounts[0]
+        transaction = {
+            'from': str(_to_abi(sender)),
+            'gas': tx_params.get('gas_limit') or self.block_gas_limit(),
+            'value': to_wei(tx_params.get('value', 0)),
+            'data': '0x' + bytes(data).hex(),
+        }
+        if to is not None:
+            transaction['to'] = str(_to_abi(to))
+        return transaction
+
+    def call(self, tx_params, to, data, block_number='latest'):
+        from eth_tester.exceptions import TransactionFailed
+
+        transaction = self._transaction(tx_params, to, data)
+        try:
+            return bytes(to_bytes(self.tester.call(transaction, block_number)))
+        except TransactionFailed as err:
+            raise VirtualMachineError(revert_reason(err)) from None
+
+    def transact(self, tx_params, to, data):
+        from eth_tester.exceptions import TransactionFailed
+
+        transaction = self._transaction(tx_params, to, data)
+        try:
+            txid = self.tester.send_transaction(transaction)
+        except TransactionFailed as err:
+            raise VirtualMachineError(revert_reason(err)) from None
+        receipt = self.tester.get_transaction_receipt(txid)
+
+        if receipt.get('status', 1) == 0:
+            # every transaction is mined in its own block, so replaying it
+            # on the parent block recovers the revert string
+            self.call(tx_params, to, data, receipt['block_number'] - 1)
+            raise VirtualMachineError(None)
+
+        return TransactionReceipt(
+            txid=txid,
+            sender=transaction['from'],
+            receiver=transaction.get('to'),
+            contract_address=receipt.get('contract_address'),
+            status=1,
+            gas_used=receipt['gas_used'],
+            block_number=receipt['block_number'],
+            events=EventDict([self._decode_log(log) for log in receipt['logs']]),
+        )
+
+    def _decode_log(self, log):
+        from eth_abi import decode_abi, decode_single
+        from eth_utils import to_checksum_address
+
+        address = to_checksum_address(log['address'])
+        topics = [bytes(to_bytes(topic)) for topic in log['topics']]
+        if not topics or topics[0] not in self._events:
+            return Event('(unknown)', address, {'topics': topics, 'data': bytes(to_bytes(log['data']))})
+
+        name, entry = self._events[topics[0]]
+        indexed = [i for i in entry['inputs'] if i['indexed']]
+        not_indexed = [i for i in entry['inputs'] if not i['indexed']]
+        values = {}
+        for abi_input, topic in zip(indexed, topics[1:]):
+            abi_type = canonical_type(abi_input)
+            if abi_type in ('string', 'bytes') or abi_type.endswith(']'):
+                # dynamic indexed values are only stored as their hash
+                values[abi_input['name']] = topic
+            else:
+                values[abi_input['name']] = _from_abi(abi_type, decode_single(abi_type, topic))
+        types = [canonical_type(i) for i in not_indexed]
+        for abi_input, abi_type, value in zip(not_indexed, types, decode_abi(types, bytes(to_bytes(log['data'])))):
+            values[abi_input['name']] = _from_abi(abi_type, value)
+        # keep the ABI order of the arguments
+        return Event(name, address, {i['name']: values[i['name']] for i in entry['inputs']})
+
+    def block_gas_limit(self):
+        return self.tester.get_block_by_number('latest')['gas_limit']
+
+    def time(self):
+        return self.tester.get_block_by_number('latest')['timestamp']
+
+    @property
+    def height(self):
+        return self.tester.get_block_by_number('latest')['number']
+
+    def sleep(self, seconds):
+        self.tester.time_travel(self.time() + seconds)
+
+    def mine(self, blocks=1):
+        self.tester.mine_blocks(blocks)
+
+    def snapshot(self):
+        return self.tester.take_snapshot()
+
+    def revert(self, snapshot_id):
+        self.tester.revert_to_snapshot(snapshot_id)
@@ -0,0 +1,167 @@
+"""
+Parallel compilation of all projects, grouped by compiler version.
+
+Brownie compiles a project's sources one compiler version after another, and
+projects one after another. `build` splits every project's sources into
+groups per (language, compiler version) and compiles all groups in a process
+pool, so a full rebuild takes about as long as the slowest group:
+
+    python -m tooling.parallel_build                  # all projects
+    python -m tooling.parallel_build curve sushi
+
+Every group is compiled with Brownie's own `compile_and_format` and written to
+the project's `build/contracts` exactly like `brownie compile` writes it, so
+Brownie loads the results without recompiling.
+"""
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tooling.artifact_bundle import BUNDLE_FILE, BUNDLED_SUBTREES, refresh_bundle
+from tooling.compile_cache import compiler_settings, list_projects, list_sources, project_path
+
+
+INTERFACE_EXTENSIONS = ('.sol', '.vy', '.json')
+
+CompileGroup = namedtuple('CompileGroup', ['path', 'language', 'version', 'sources'])
+GroupResult = namedtuple('GroupResult', ['group', 'contracts', 'seconds'])
+
+
+def _read_sources(path, sources):
+    result = {}
+    for source in sources:
+        with open(os.path.join(path, source), encoding='utf-8') as f:
+            result[source] = f.read()
+    return result
+
+
+def interface_sources(path):
+    interfaces_dir = os.path.join(path, 'interfaces')
+    sources = []
+    for root, _, files in os.walk(interfaces_dir):
+        sources += [
+            os.path.relpath(os.path.join(root, name), path)
+            for name in files if name.endswith(INTERFACE_EXTENSIONS)
+        ]
+    return _read_sources(path, sorted(sources))
+
+
+def resolve_versions(path, language, sources):
+    """
+    Maps the compiler versions Brownie would use for the project's `sources`
+    of `language` to the sources compiled with them, installing missing
+    compilers on the way so the workers don't race to do it.
+    """
+    settings = compiler_settings(path)
+    pinned = settings['solc' if language == 'Solidity' else 'vyper']['version']
+    if pinned:
+        return {str(pinned).lstrip('v'): sorted(sources)}
+
+    from brownie.project import compiler
+    contract_sources = _read_sources(path, sources)
+    if language == 'Solidity':
+        versions = compiler.find_solc_versions(contract_sources, install_needed=True, silent=True)
+    else:
+        versions = compiler.find_vyper_versions(contract_sources, install_needed=True, silent=True)
+    return {str(version): sorted(paths) for version, paths in versions.items()}
+
+
+def plan_groups(paths, resolve=resolve_versions):
+    groups = []
+    for path in paths:
+        by_language = {}
+        for source in list_sources(path):
+            language = 'Vyper' if source.endswith('.vy') else 'Solidity'
+            by_language.setdefault(language, []).append(source)
+        for language, sources in sorted(by_language.items()):
+            for version, version_sources in sorted(resolve(path, language, sources).items()):
+                groups.append(CompileGroup(path, language, version, version_sources))
+    return groups
+
+
+def compile_group(group):
+    """
+    Compiles one group the way `brownie compile` does and writes the
+    artifacts to the project's build directory. Runs in a worker process.
+    """
+    from brownie.project import compiler
+
+    start = time.perf_counter()
+    path = group.path
+    settings = compiler_settings(path)
+    solc = settings['solc']
+    version_kwarg = 'solc_version' if group.language == 'Solidity' else 'vyper_version'
+
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        build_json = compiler.compile_and_format(
+            _read_sources(path, group.sources),
+            optimize=solc['optimizer']['enabled'],
+            runs=solc['optimizer']['runs'],
+            evm_version=settings['evm_version'],
+            silent=True,
+            allow_paths=path,
+            interface_sources=interface_sources(path),
+            remappings=solc['remappings'],
+            **{version_kwarg: group.version},
+        )
+    finally:
+        os.chdir(cwd)
+
+    build_dir = os.path.join(path, 'build', 'contracts')
+    os.makedirs(build_dir, exist_ok=True)
+    contracts = []
+    for name, data in build_json.items():
+        if data['sourcePath'].startswith('interface'):
+            continue
+        with open(os.path.join(build_dir, f'{name}.json'), 'w') as f:
+            json.dump(data, f, sort_keys=True, indent=2, default=sorted)
+        contracts.append(name)
+
+    return GroupResult(group, sorted(contracts), time.perf_counter() - start)
+
+
+def build(groups, compile=compile_group, max_workers=None):
+    """
+    Compiles `groups` in a process pool and returns their `GroupResult`s in
+    the order they finished, raising the first compilation error.
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers or len(groups) or 1) as pool:
+        futures = [pool.submit(compile, group) for group in groups]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return results
+
+
+def format_results(results, wall_seconds):
+    lines = []
+    for result in sorted(results, key=lambda r: -r.seconds):
+        group = result.group
+        lines.append(
+            f'{os.path.basename(group.path)} {group.language} {group.version}: '
+            f'{len(result.contracts)} contracts in {result.seconds:.1f}s'
+        )
+    sequential = sum(result.seconds for result in results)
+    lines.append(f'total: {wall_seconds:.1f}s wall, {sequential:.1f}s if compiled one group after another')
+    return '\n'.join(lines)
+
+
+def main(argv):
+    names = argv or list_projects()
+    groups = plan_groups([project_path(name) for name in names])
+    start = time.perf_counter()
+    results = build(groups)
+    print(format_results(results, time.perf_counter() - start))
+    for name in names:
+        if name in BUNDLED_SUBTREES and refresh_bundle(project_path(name), BUNDLED_SUBTREES[name]):
+            print(f'{name}: rebuilt {BUNDLE_FILE}, commit it')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
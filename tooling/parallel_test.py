@@ -0,0 +1,329 @@
+"""
+Sharded test runs across all projects.
+
+`brownie test` runs a project's test modules one after another against a
+single ganache, and the projects run one after another. `run` splits every
+project's suite into shards of one module each, starts a pool of forked
+ganache instances on separate ports and runs the shards in parallel, each as
+`brownie test <module>` attached to a chain from the pool that is reverted to
+its clean snapshot first. Shards start longest first according to earlier
+runs, so a run takes about as long as the slowest shard:
+
+    python -m tooling.parallel_test add-networks             # once per machine
+    python -m tooling.parallel_test run                      # all projects
+    python -m tooling.parallel_test run curve sushi --workers 4
+
+All chains fork the same pinned block. `--fork` takes another upstream, e.g.
+the `tooling.fork_state` proxy. Every shard writes a JUnit report and a log
+to `.cache/parallel_test/reports`; the merged results are printed and shard
+timings are kept in `.cache/parallel_test/timings.json` for the next run.
+"""
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ElementTree
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tooling.abi_index import REPO_ROOT
+from tooling.compile_cache import list_projects, project_path
+from tooling.fork_state import default_upstream, rpc_call
+
+
+NETWORK_PREFIX = 'parallel'
+CHAIN_HOST = '127.0.0.1'
+BASE_PORT = 8610
+CHAIN_TIMEOUT = 120
+
+# the projects' `development` network settings
+GANACHE_SETTINGS = {
+    'gasLimit': '12000000',
+    'accounts': '10',
+    'hardfork': 'istanbul',
+    'mnemonic': 'brownie',
+}
+
+CACHE_DIR = os.path.join(REPO_ROOT, '.cache', 'parallel_test')
+TIMINGS_PATH = os.path.join(CACHE_DIR, 'timings.json')
+REPORTS_DIR = os.path.join(CACHE_DIR, 'reports')
+
+Shard = namedtuple('Shard', ['project', 'module'])
+CaseResult = namedtuple('CaseResult', ['name', 'outcome', 'seconds'])
+ShardResult = namedtuple('ShardResult', ['shard', 'returncode', 'seconds', 'cases', 'log_path'])
+
+
+def shard_key(shard):
+    return f'{shard.project}/{shard.module}'
+
+
+def network_id(port):
+    return f'{NETWORK_PREFIX}-{port}'
+
+
+def is_test_module(name):
+    # pytest's default `python_files`
+    return name.endswith('.py') and (name.startswith('test_') or name.endswith('_test.py'))
+
+
+def list_modules(path):
+    tests_dir = os.path.join(path, 'tests')
+    modules = []
+    for root, _, files in os.walk(tests_dir):
+        modules += [
+            os.path.relpath(os.path.join(root, name), path)
+            for name in files if is_test_module(name)
+        ]
+    return sorted(modules)
+
+
+def plan_shards(projects, timings=None):
+    """
+    Returns a shard per test module of `projects`, longest first by
+    `timings`; shards without a timing go first since they may be the longest.
+    """
+    timings = timings or {}
+    shards = [Shard(project, module) for project in projects for module in list_modules(project_path(project))]
+    return sorted(shards, key=lambda shard: -timings.get(shard_key(shard), float('inf')))
+
+
+def load_timings(path=TIMINGS_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_timings(results, path=TIMINGS_PATH):
+    timings = load_timings(path)
+    timings.update({shard_key(result.shard): round(result.seconds, 3) for result in results})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(timings, f, sort_keys=True, indent=2)
+
+
+def parse_junit(path):
+    if not os.path.exists(path):
+        return []
+    cases = []
+    for case in ElementTree.parse(path).iter('testcase'):
+        if case.find('failure') is not None:
+            outcome = 'failed'
+        elif case.find('error') is not None:
+            outcome = 'error'
+        elif case.find('skipped') is not None:
+            outcome = 'skipped'
+        else:
+            outcome = 'passed'
+        name = f'{case.get("classname")}::{case.get("name")}'
+        cases.append(CaseResult(name, outcome, float(case.get('time') or 0)))
+    return cases
+
+
+class LocalChain:
+    """
+    A forked ganache on `port`, reset to its clean snapshot before every shard.
+    """
+
+    def __init__(self, port, fork):
+        self.port = port
+        self.fork = fork
+        self.url = f'http://{CHAIN_HOST}:{port}'
+        self._process = None
+        self._snapshot = None
+
+    def command(self):
+        command = ['ganache-cli', '--port', str(self.port), '--fork', self.fork]
+        for option, value in GANACHE_SETTINGS.items():
+            command += [f'--{option}', value]
+        return command
+
+    def start(self):
+        self._process = subprocess.Popen(self.command(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + CHAIN_TIMEOUT
+        while True:
+            try:
+                rpc_call(self.url, 'web3_clientVersion', [])
+                break
+            except OSError:
+                if self._process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f'ganache on port {self.port} did not start')
+                time.sleep(0.5)
+        self._snapshot = rpc_call(self.url, 'evm_snapshot', [])['result']
+
+    def reset(self):
+        # ganache drops a snapshot once it's reverted to, so take it again
+        rpc_call(self.url, 'evm_revert', [self._snapshot])
+        self._snapshot = rpc_call(self.url, 'evm_snapshot', [])['result']
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process = None
+
+
+class ChainPool:
+    def __init__(self, chains):
+        self.chains = chains
+        self._idle = queue.Queue()
+
+    def __enter__(self):
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.chains)) as executor:
+                for future in [executor.submit(chain.start) for chain in self.chains]:
+                    future.result()
+        except Exception:
+            self.stop()
+            raise
+        for chain in self.chains:
+            self._idle.put(chain)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stop(self):
+        for chain in self.chains:
+            chain.stop()
+
+    def acquire(self):
+        chain = self._idle.get()
+        chain.reset()
+        return chain
+
+    def release(self, chain):
+        self._idle.put(chain)
+
+
+def brownie_test(shard, network, junit_path, log):
+    return subprocess.run(
+        ['brownie', 'test', shard.module, '--network', network, f'--junitxml={junit_path}'],
+        cwd=project_path(shard.project),
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    ).returncode
+
+
+def run_shard(shard, chain, reports_dir=REPORTS_DIR, execute=brownie_test):
+    name = shard_key(shard).replace('/', '__')
+    junit_path = os.path.join(reports_dir, f'{name}.xml')
+    log_path = os.path.join(reports_dir, f'{name}.log')
+    if os.path.exists(junit_path):
+        os.remove(junit_path)
+
+    start = time.perf_counter()
+    with open(log_path, 'w') as log:
+        returncode = execute(shard, network_id(chain.port), junit_path, log)
+    return ShardResult(shard, returncode, time.perf_counter() - start, parse_junit(junit_path), log_path)
+
+
+def run(shards, pool, reports_dir=REPORTS_DIR, execute=brownie_test):
+    """
+    Runs `shards` on the chains of `pool` and returns their `ShardResult`s
+    in the order they finished.
+    """
+    os.makedirs(reports_dir, exist_ok=True)
+
+    def run_on_pool(shard):
+        chain = pool.acquire()
+        try:
+            return run_shard(shard, chain, reports_dir, execute)
+        finally:
+            pool.release(chain)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=len(pool.chains)) as executor:
+        futures = [executor.submit(run_on_pool, shard) for shard in shards]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return results
+
+
+def count_outcomes(cases):
+    counts = {}
+    for case in cases:
+        counts[case.outcome] = counts.get(case.outcome, 0) + 1
+    return counts
+
+
+def format_counts(counts):
+    return ', '.join(f'{count} {outcome}' for outcome, count in sorted(counts.items())) or 'no tests'
+
+
+def format_results(results, wall_seconds):
+    lines = []
+    for result in sorted(results, key=lambda r: -r.seconds):
+        lines.append(f'{shard_key(result.shard)}: {format_counts(count_outcomes(result.cases))} in {result.seconds:.1f}s')
+
+    failed = [
+        (result, case) for result in results for case in result.cases
+        if case.outcome in ('failed', 'error')
+    ]
+    # shards that failed without a failed test, e.g. on collection or chain errors
+    broken = [
+        result for result in results
+        if result.returncode != 0 and not any(case.outcome in ('failed', 'error') for case in result.cases)
+    ]
+    if failed or broken:
+        lines.append('')
+    for result, case in failed:
+        lines.append(f'{case.outcome.upper()} {result.shard.project} {case.name} (log: {result.log_path})')
+    for result in broken:
+        lines.append(f'ERROR {shard_key(result.shard)} exited with {result.returncode} (log: {result.log_path})')
+
+    sequential = sum(result.seconds for result in results)
+    counts = count_outcomes([case for result in results for case in result.cases])
+    lines.append(
+        f'total: {format_counts(counts)}; {wall_seconds:.1f}s wall, '
+        f'{sequential:.1f}s if run one shard after another'
+    )
+    return '\n'.join(lines)
+
+
+def add_networks(workers):
+    for port in range(BASE_PORT, BASE_PORT + workers):
+        subprocess.run([
+            'brownie', 'networks', 'add', 'Development', network_id(port),
+            'cmd=ganache-cli', f'host=http://{CHAIN_HOST}', f'port={port}', 'gas_limit=12000000',
+            'accounts=10', 'evm_version=istanbul', 'mnemonic=brownie', f'timeout={CHAIN_TIMEOUT}',
+        ], check=True)
+
+
+def pinned_fork(upstream, block=None):
+    if block is None:
+        block = int(rpc_call(upstream, 'eth_blockNumber', [])['result'], 16)
+    return f'{upstream}@{block}'
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m tooling.parallel_test')
+    parser.add_argument('action', choices=['run', 'add-networks'])
+    parser.add_argument('projects', nargs='*', help='projects to test, defaults to all')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='number of chains and parallel shards')
+    parser.add_argument('--fork', help='RPC the chains fork, defaults to Infura mainnet')
+    parser.add_argument('--block', type=int, help='block to fork at, defaults to the latest')
+    options = parser.parse_args(argv)
+
+    if options.action == 'add-networks':
+        add_networks(options.workers)
+        return 0
+
+    shards = plan_shards(options.projects or list_projects(), load_timings())
+    workers = max(1, min(options.workers, len(shards)))
+    fork = pinned_fork(options.fork or default_upstream(), options.block)
+    chains = [LocalChain(port, fork) for port in range(BASE_PORT, BASE_PORT + workers)]
+
+    start = time.perf_counter()
+    with ChainPool(chains) as pool:
+        results = run(shards, pool)
+    print(format_results(results, time.perf_counter() - start))
+    save_timings(results)
+    return 0 if all(result.returncode == 0 for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
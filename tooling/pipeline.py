@@ -0,0 +1,116 @@
+"""
+Nonce-pipelined transaction submission.
+
+Instead of sending a transaction and waiting for its confirmation before
+building the next one, `send_pipelined` assigns consecutive nonces to a
+batch of transactions, signs all of them up front, broadcasts them
+back-to-back and only then waits for the receipts. Transactions later in
+the batch may call contracts created earlier in it, since their addresses
+are derived from the sender and nonce with `contract_address`.
+"""
+import time
+from collections import namedtuple
+
+from tooling.evm_script import address_to_bytes
+
+
+CONFIRMATION_POLL_INTERVAL = 1
+
+PipelinedTx = namedtuple('PipelinedTx', ['to', 'data', 'gas'])
+
+
+def _rlp_encode_bytes(data):
+    if len(data) == 1 and data[0] < 0x80:
+        return data
+    if len(data) >= 56:
+        raise ValueError('long RLP strings are not supported')
+    return bytes([0x80 + len(data)]) + data
+
+
+def _rlp_encode_list(items):
+    payload = b''.join(items)
+    if len(payload) >= 56:
+        raise ValueError('long RLP lists are not supported')
+    return bytes([0xc0 + len(payload)]) + payload
+
+
+def create_address_preimage(sender, nonce):
+    nonce_bytes = nonce.to_bytes((nonce.bit_length() + 7) // 8, 'big')
+    return _rlp_encode_list([
+        _rlp_encode_bytes(bytes(address_to_bytes(sender))),
+        _rlp_encode_bytes(nonce_bytes),
+    ])
+
+
+def contract_address(sender, nonce):
+    """
+    Returns the checksummed address of the contract created by `sender`'s
+    transaction with `nonce`: keccak256(rlp([sender, nonce]))[12:].
+    """
+    from eth_utils import keccak, to_checksum_address
+    return to_checksum_address(keccak(create_address_preimage(sender, nonce))[12:])
+
+
+def send_pipelined(
+    web3,
+    sender,
+    txs,
+    gas_price,
+    private_key=None,
+    required_confs=1,
+    timeout=600,
+    signer=None,
+    nonce=None
+):
+    """
+    Sends `PipelinedTx`s from `sender` with consecutive nonces starting at
+    `nonce`, or the account's current nonce, and waits for all of them. Pass
+    the `nonce` that created addresses were predicted from, so they can't
+    move if the account sends something in between. `to=None` creates a
+    contract. Transactions are signed locally when `private_key` is given, by
+    `signer` (e.g. a `tooling.signing_agent.AgentSigner`) when that is, and
+    sent through the node's unlocked account otherwise.
+
+    Returns the receipts in order, raising `RuntimeError` if any reverted.
+    """
+    if nonce is None:
+        nonce = web3.eth.get_transaction_count(sender)
+    chain_id = web3.eth.chain_id
+
+    prepared = []
+    for offset, tx in enumerate(txs):
+        params = {
+            'from': sender,
+            'nonce': nonce + offset,
+            'gas': tx.gas,
+            'gasPrice': gas_price,
+            'data': tx.data,
+            'value': 0,
+            'chainId': chain_id,
+        }
+        if tx.to is not None:
+            params['to'] = tx.to
+        if private_key is not None:
+            del params['from']
+            params = web3.eth.account.sign_transaction(params, private_key).rawTransaction
+        elif signer is not None:
+            del params['from']
+            params = signer.sign_transaction(params).rawTransaction
+        prepared.append(params)
+
+    if private_key is not None or signer is not None:
+        tx_hashes = [web3.eth.send_raw_transaction(raw_tx) for raw_tx in prepared]
+    else:
+        tx_hashes = [web3.eth.send_transaction(params) for params in prepared]
+
+    receipts = [web3.eth.wait_for_transaction_receipt(h, timeout=timeout) for h in tx_hashes]
+    if required_confs > 1:
+        last_block = max(r['blockNumber'] for r in receipts) + required_confs - 1
+        while web3.eth.block_number < last_block:
+            time.sleep(CONFIRMATION_POLL_INTERVAL)
+
+    failed = [i for i, r in enumerate(receipts) if r['status'] != 1]
+    if failed:
+        raise RuntimeError(f'pipelined transactions {failed} reverted: {[tx_hashes[i].hex() for i in failed]}')
+
+    return receipts
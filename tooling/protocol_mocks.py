@@ -0,0 +1,164 @@
+"""
+Fork-free stand-ins for the external protocols the projects integrate with.
+
+`StakingRewardsSushi` hard-codes MasterChefV2, the balancer `RewardsManager`
+hard-codes MerkleRedeem and LDO, and the curve tests need the stETH pool,
+its LP token and gauge, so those suites only run on a mainnet fork. The
+contracts in `contracts/ProtocolMocks.sol` stand in for them, and
+`install_stand_ins` puts them at their mainnet addresses on a local node:
+
+    stand_ins = install_stand_ins(accounts[0])
+    stand_ins.ldo.mint(dao_agent, Wei('1000 ether'), {'from': accounts[0]})
+
+Each stand-in is deployed normally, its runtime code is copied to the mainnet
+address and it is initialized there. Copying code takes a node with a
+set-code RPC: ganache 7, Hardhat or Anvil, not the ganache-cli 6 the projects
+fork mainnet with. `add-network` registers a fork-free Brownie network on
+ganache 7 (`npm install -g ganache`) or Anvil for the stand-in tests:
+
+    python -m tooling.protocol_mocks add-network              # or --cmd anvil
+    cd projects/curve
+    brownie test tests/test_stand_ins.py --network stand-ins
+"""
+import argparse
+import functools
+import os
+import subprocess
+import sys
+from collections import namedtuple
+
+
+MAINNET_ADDRESSES = {
+    'ldo': '0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32',
+    'steth': '0xae7ab96520DE3A18E5e111B5EaAb095312D7fE84',
+    'steth_pool_lp': '0x06325440D014e39736583c165C2963BA99fAf14E',
+    'steth_pool': '0xDC24316b9AE028F1497c275EB9192a3Ea0f67022',
+    'curve_gauge': '0x182B723a58739a9c974cFDB385ceaDb237453c28',
+    'master_chef_v2': '0xEF0881eC094552b2e128Cf945EF17a6752B4Ec5d',
+    'merkle_redeem': '0x884226c9f7b7205f607922E0431419276a64CF8f',
+}
+
+STAND_IN_CONTRACTS = {
+    'ldo': 'MockERC20',
+    'steth': 'MockStETH',
+    'steth_pool_lp': 'MockERC20',
+    'steth_pool': 'MockStableSwapSTETH',
+    'curve_gauge': 'MockLiquidityGaugeV2',
+    'master_chef_v2': 'MockMasterChefV2',
+    'merkle_redeem': 'MockMerkleRedeem',
+}
+
+# ganache 7, Hardhat and Anvil
+SET_CODE_METHODS = ['evm_setAccountCode', 'hardhat_setCode', 'anvil_setCode']
+
+NETWORK_ID = 'stand-ins'
+# nodes with a set-code RPC that Brownie can launch
+NETWORK_CMDS = ['ganache', 'anvil']
+
+SOURCE_PATH = os.path.join(os.path.dirname(__file__), 'contracts', 'ProtocolMocks.sol')
+
+StandIns = namedtuple('StandIns', list(MAINNET_ADDRESSES))
+
+
+class UnsupportedNode(Exception):
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def compile_mocks():
+    from brownie import compile_source
+
+    with open(SOURCE_PATH) as f:
+        return compile_source(f.read())
+
+
+def set_code(web3, address, code):
+    """
+    Replaces the code at `address` with the first set-code RPC the node
+    supports and returns the method used.
+    """
+    errors = []
+    for method in SET_CODE_METHODS:
+        response = web3.provider.make_request(method, [address, code])
+        if 'error' not in response:
+            return method
+        errors.append(f'{method}: {response["error"].get("message")}')
+    raise UnsupportedNode(
+        'the node cannot set contract code, run the test on the '
+        f'`{NETWORK_ID}` network (python -m tooling.protocol_mocks add-network): ' + '; '.join(errors)
+    )
+
+
+def install_at(container, address, tx_params):
+    """
+    Deploys `container` and copies its runtime code to `address`. Storage
+    isn't copied, the contract has to be initialized at its new address.
+    """
+    from brownie import Contract, web3
+
+    if len(web3.eth.get_code(address)) > 0:
+        raise ValueError(f'{address} already has code, install the stand-ins on a fresh chain')
+    deployed = container.deploy(tx_params)
+    set_code(web3, address, '0x' + bytes(web3.eth.get_code(deployed.address)).hex())
+    return Contract.from_abi(container._name, address, container.abi)
+
+
+def install_stand_ins(owner, names=None):
+    """
+    Installs the stand-ins named in `names` (all by default) at their mainnet
+    addresses and returns them as `StandIns` (None for those not installed).
+    `owner` mints LDO and owns MasterChefV2, MerkleRedeem and the gauge.
+    """
+    mocks = compile_mocks()
+    names = set(names or MAINNET_ADDRESSES)
+    tx_params = {'from': owner}
+
+    installed = {name: None for name in MAINNET_ADDRESSES}
+    for name in MAINNET_ADDRESSES:
+        if name in names:
+            installed[name] = install_at(getattr(mocks, STAND_IN_CONTRACTS[name]), MAINNET_ADDRESSES[name], tx_params)
+    stand_ins = StandIns(**installed)
+
+    if stand_ins.ldo is not None:
+        stand_ins.ldo.initialize('Lido DAO Token', 'LDO', owner, tx_params)
+    if stand_ins.steth is not None:
+        stand_ins.steth.initialize('Liquid staked Ether 2.0', 'stETH', owner, tx_params)
+    if stand_ins.steth_pool_lp is not None:
+        stand_ins.steth_pool_lp.initialize(
+            'Curve.fi ETH/stETH', 'steCRV', MAINNET_ADDRESSES['steth_pool'], tx_params
+        )
+    if stand_ins.steth_pool is not None:
+        stand_ins.steth_pool.initialize(
+            MAINNET_ADDRESSES['steth'], MAINNET_ADDRESSES['steth_pool_lp'], owner, tx_params
+        )
+    if stand_ins.curve_gauge is not None:
+        stand_ins.curve_gauge.initialize(MAINNET_ADDRESSES['steth_pool_lp'], owner, tx_params)
+    if stand_ins.master_chef_v2 is not None:
+        stand_ins.master_chef_v2.initialize(owner, tx_params)
+    if stand_ins.merkle_redeem is not None:
+        stand_ins.merkle_redeem.initialize(MAINNET_ADDRESSES['ldo'], owner, tx_params)
+    return stand_ins
+
+
+def add_network(cmd='ganache'):
+    # the projects' `development` settings minus the fork; Anvil only takes
+    # BIP-39 mnemonics, so both nodes use their default accounts
+    subprocess.run([
+        'brownie', 'networks', 'add', 'Development', NETWORK_ID,
+        f'cmd={cmd}', 'host=http://127.0.0.1', 'port=8545', 'gas_limit=12000000',
+        'accounts=10', 'evm_version=istanbul', 'timeout=120',
+    ], check=True)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m tooling.protocol_mocks')
+    parser.add_argument('action', choices=['add-network'])
+    parser.add_argument('--cmd', choices=NETWORK_CMDS, default='ganache', help='node to launch')
+    options = parser.parse_args(argv)
+
+    add_network(options.cmd)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
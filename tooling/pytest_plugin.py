@@ -0,0 +1,39 @@
+"""
+Fixtures shared by the projects' Brownie test suites. A project's
+`tests/conftest.py` enables them with
+
+    pytest_plugins = ['tooling.pytest_plugin']
+
+- `rpc_cassette`: with `RPC_CASSETTE=record|replay`, records or replays the
+  session's RPC reads, see `tooling.rpc_cassette`
+- `local_dao`: with `LIDO_DAO_APPS=local`, deploys the DAO stand-ins of
+  `tooling.aragon_mocks` that `utils.config` then points at
+- `tooling.setup_timing`'s hooks, recording per-test setup times with
+  `SETUP_TIMINGS=<file>`
+"""
+import pytest
+from brownie import Wei
+
+from tooling.aragon_mocks import deploy_local_dao, use_local_dao
+from tooling.rpc_cassette import cassette_from_env
+
+
+pytest_plugins = ['tooling.setup_timing']
+
+
+@pytest.fixture(scope='session', autouse=True)
+def rpc_cassette():
+    with cassette_from_env() as cassette:
+        yield cassette
+
+
+@pytest.fixture(scope='module', autouse=True)
+def local_dao(module_isolation, accounts):
+    # module_isolation resets the chain before every module, so once per module
+    if not use_local_dao():
+        return None
+    return deploy_local_dao(
+        accounts[0],
+        holders=[(holder, Wei('1000000 ether')) for holder in accounts[:3]],
+        treasury=Wei('1000000 ether')
+    )
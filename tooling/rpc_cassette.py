@@ -0,0 +1,207 @@
+"""
+Recorded RPC responses for the test suites.
+
+Every run repeats the same reads against the local fork (`eth_call`,
+`eth_getCode`, `eth_getStorageAt`, `eth_getBalance`), and ganache fetches
+whatever they touch from the remote node again. `RpcCassette` wraps the
+web3 provider, below all middlewares and Brownie's direct RPC calls, and
+keeps the responses to those reads keyed by the canonical request plus the
+chain state they ran against:
+
+    RPC_CASSETTE=record brownie test      # tests/rpc_cassette.json.gz
+    RPC_CASSETTE=replay brownie test
+
+The state is the block the chain started from (state root and number of the
+latest block on the first request) followed by every state-changing request
+sent since (transactions, mining, snapshots, reverts, time travel). Block
+timestamps and state roots after the start differ from run to run, the
+requests that produced them don't, so a rerun of the same tests finds the
+same keys. The start block does have to be the same: the fork must be pinned
+to a block (`fork: <url>@<block>`, or the `tooling.fork_state` proxy).
+
+Replay answers the reads from the file and raises `CassetteMiss` on a read
+that wasn't recorded in the same state, instead of asking the node.
+`RPC_CASSETTE_PATH` overrides the file. Transactions still run on ganache;
+together with `tooling.fork_state` replay the whole run stays offline.
+
+A replayed read returns what it returned while recording. Reads that depend
+on the wall clock through `block.timestamp` get the recorded run's time, so
+tests asserting exact timestamps should pin ganache's start time (`--time`).
+
+The parameters of state-changing requests are part of the state, so a
+transaction or `evm_increaseTime` whose arguments come from the wall clock
+(`time.time()`, Brownie's `chain.time()`) starts a new state on every run,
+and every read after it misses on replay. Pinning such values doesn't help
+while the chain's own time follows the wall clock, so these suites can only
+be recorded, not replayed:
+
+- balancer: the `program_start_date` fixture (and with it `rewards_manager`),
+  `test_manager.py` and `test_program_start_date.py` sleeping until a date,
+  `test_stand_ins.py` deploying with `chain.time()`
+
+The other projects only sleep fixed periods.
+"""
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+
+
+MODE_ENV_VAR = 'RPC_CASSETTE'
+PATH_ENV_VAR = 'RPC_CASSETTE_PATH'
+DEFAULT_PATH = os.path.join('tests', 'rpc_cassette.json.gz')
+
+CACHED_METHODS = {'eth_call', 'eth_getCode', 'eth_getStorageAt', 'eth_getBalance'}
+
+# requests that don't change the chain state; anything else (transactions,
+# mining, snapshots, reverts, time travel) becomes part of the state key
+READ_ONLY_METHODS = CACHED_METHODS | {
+    'eth_accounts',
+    'eth_blockNumber',
+    'eth_chainId',
+    'eth_estimateGas',
+    'eth_feeHistory',
+    'eth_gasPrice',
+    'eth_getBlockByHash',
+    'eth_getBlockByNumber',
+    'eth_getLogs',
+    'eth_getTransactionByHash',
+    'eth_getTransactionCount',
+    'eth_getTransactionReceipt',
+    'eth_maxPriorityFeePerGas',
+    'eth_syncing',
+    'net_listening',
+    'net_version',
+    'web3_clientVersion',
+    'debug_traceTransaction',
+}
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def canonical(value):
+    # hex is case-insensitive, addresses come checksummed or not
+    if isinstance(value, str) and value.startswith('0x'):
+        return value.lower()
+    if isinstance(value, dict):
+        return {key: canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+    return value
+
+
+def request_key(state, method, params):
+    return json.dumps([state, method, canonical(list(params))], sort_keys=True, separators=(',', ':'))
+
+
+def next_state(state, method, params):
+    return hashlib.sha256(request_key(state, method, params).encode()).hexdigest()
+
+
+class RpcCassette:
+    def __init__(self, mode, responses=None, start=None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'unknown cassette mode: {mode}')
+        self.mode = mode
+        self.responses = responses or {}
+        # the block the recorded chain started from
+        self.start = start
+        self.hits = 0
+        self.recorded = 0
+        self._chain_start = None
+        self._state = None
+
+    @classmethod
+    def load(cls, path, mode):
+        if not os.path.exists(path):
+            if mode == 'replay':
+                raise FileNotFoundError(f'{path} does not exist, record it with {MODE_ENV_VAR}=record first')
+            return cls(mode)
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt') as f:
+            cassette = json.load(f)
+        return cls(mode, cassette['responses'], cassette['start'])
+
+    def save(self, path):
+        opener = gzip.open if path.endswith('.gz') else open
+        tmp_path = path + '.tmp'
+        with opener(tmp_path, 'wt') as f:
+            json.dump({'start': self.start, 'responses': self.responses}, f, sort_keys=True, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def _begin(self, make_request):
+        block = make_request('eth_getBlockByNumber', ['latest', False])['result']
+        self._chain_start = f'{block["stateRoot"]}@{int(block["number"], 16)}'.lower()
+        if self.mode == 'record' and self._chain_start != self.start:
+            # responses recorded on another start block can never be hit again
+            self.responses = {}
+            self.start = self._chain_start
+        self._state = next_state(None, 'start', [self._chain_start])
+
+    def _miss(self, method, params):
+        message = f'{method}{list(params)} is not in the cassette'
+        if self._chain_start != self.start:
+            message += f' (recorded on a chain started at {self.start}, this one started at {self._chain_start}; pin the fork block)'
+        else:
+            message += (
+                ' (the requests that changed the chain differ from the recorded run,'
+                ' e.g. arguments taken from the wall clock)'
+            )
+        return CassetteMiss(message)
+
+    def wrap(self, make_request):
+        def make_cassette_request(method, params):
+            if self._state is None:
+                self._begin(make_request)
+            if method not in CACHED_METHODS:
+                if method not in READ_ONLY_METHODS:
+                    self._state = next_state(self._state, method, params)
+                return make_request(method, params)
+
+            key = request_key(self._state, method, params)
+            if key in self.responses:
+                self.hits += 1
+                return {'jsonrpc': '2.0', 'id': 0, **self.responses[key]}
+            if self.mode == 'replay':
+                raise self._miss(method, params)
+
+            response = make_request(method, params)
+            self.responses[key] = {field: response[field] for field in ('result', 'error') if field in response}
+            self.recorded += 1
+            return response
+        return make_cassette_request
+
+
+@contextlib.contextmanager
+def use_cassette(web3, path, mode):
+    cassette = RpcCassette.load(path, mode)
+    provider = web3.provider
+    # Brownie sends snapshots, reverts and time travel straight to the
+    # provider, so the cassette has to sit there to notice state changes
+    provider.make_request = cassette.wrap(provider.make_request)
+    try:
+        yield cassette
+    finally:
+        del provider.make_request
+        if mode == 'record':
+            cassette.save(path)
+        print(f'\nrpc cassette {path}: {cassette.hits} replayed, {cassette.recorded} recorded')
+
+
+@contextlib.contextmanager
+def cassette_from_env():
+    """
+    `use_cassette` on Brownie's web3 as configured by `RPC_CASSETTE` and
+    `RPC_CASSETTE_PATH`, or nothing when `RPC_CASSETTE` isn't set.
+    """
+    mode = os.environ.get(MODE_ENV_VAR)
+    if not mode:
+        yield None
+        return
+
+    from brownie import web3
+    with use_cassette(web3, os.environ.get(PATH_ENV_VAR, DEFAULT_PATH), mode) as cassette:
+        yield cassette
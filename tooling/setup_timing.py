@@ -0,0 +1,91 @@
+"""
+Per-test setup times of the projects' test suites.
+
+`tooling.pytest_plugin` loads these hooks into the projects' test suites.
+With `SETUP_TIMINGS` set to a file, a test session records how long the
+setup of every test took (fixture deployments and isolation snapshots
+included) and adds them to that file under the project's name:
+
+    SETUP_TIMINGS=/tmp/before.json brownie test      # in each project
+    ... change the fixtures ...
+    SETUP_TIMINGS=/tmp/after.json brownie test
+    python -m tooling.setup_timing /tmp/before.json /tmp/after.json
+
+prints the setup time per test of every project before and after.
+"""
+import json
+import os
+import statistics
+import sys
+
+
+ENV_VAR = 'SETUP_TIMINGS'
+
+_setup_seconds = {}
+
+
+def pytest_runtest_logreport(report):
+    if report.when == 'setup' and os.environ.get(ENV_VAR):
+        _setup_seconds[report.nodeid] = report.duration
+
+
+def pytest_sessionfinish(session):
+    path = os.environ.get(ENV_VAR)
+    if path and _setup_seconds:
+        save_timings(path, os.path.basename(str(session.config.rootdir)), _setup_seconds)
+
+
+def load_timings(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_timings(path, project, setup_seconds):
+    # every project's session adds its own entry, replacing an earlier one
+    timings = load_timings(path)
+    timings[project] = {nodeid: round(seconds, 4) for nodeid, seconds in sorted(setup_seconds.items())}
+    with open(path, 'w') as f:
+        json.dump(timings, f, sort_keys=True, indent=2)
+
+
+def summarize(setup_seconds):
+    seconds = list(setup_seconds.values())
+    if not seconds:
+        return None
+    return {
+        'tests': len(seconds),
+        'total': sum(seconds),
+        'mean': statistics.mean(seconds),
+        'median': statistics.median(seconds),
+        'max': max(seconds),
+    }
+
+
+def format_comparison(before, after):
+    lines = ['project: tests, mean / median / max setup per test, total (before -> after)']
+    for project in sorted(set(before) | set(after)):
+        old, new = summarize(before.get(project, {})), summarize(after.get(project, {}))
+        if old is None or new is None:
+            lines.append(f'{project}: only measured {"after" if old is None else "before"}')
+            continue
+        lines.append(
+            f'{project}: {old["tests"]} -> {new["tests"]} tests, '
+            f'{old["mean"]:.3f}s / {old["median"]:.3f}s / {old["max"]:.2f}s -> '
+            f'{new["mean"]:.3f}s / {new["median"]:.3f}s / {new["max"]:.2f}s, '
+            f'{old["total"]:.1f}s -> {new["total"]:.1f}s'
+        )
+    return '\n'.join(lines)
+
+
+def main(argv):
+    if len(argv) != 2:
+        print('usage: python -m tooling.setup_timing BEFORE.json AFTER.json', file=sys.stderr)
+        return 2
+    print(format_comparison(load_timings(argv[0]), load_timings(argv[1])))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
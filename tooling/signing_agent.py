@@ -0,0 +1,257 @@
+"""
+Local signing agent caching an unlocked keystore account.
+
+`accounts.load` runs the keystore's scrypt key derivation on every script
+run. The agent unlocks the account once and keeps the key in a background
+process that signs transactions for the scripts run after it, over a Unix
+socket in a directory only the current user can open, until its TTL runs
+out:
+
+    python -m tooling.signing_agent start deployer --ttl 900
+    DEPLOYER=deployer brownie run deploy --network mainnet   # no password prompt
+    python -m tooling.signing_agent stop deployer
+
+The key never leaves the agent. Like ssh-agent, it signs whatever processes
+of the same user ask it to, so keep the TTL short. `load_account` (used by the
+projects' `get_deployer_account`) returns an account bound to a running agent
+and falls back to `accounts.load` when there is none.
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+
+DEFAULT_TTL = 15 * 60
+POLL_INTERVAL = 0.5
+
+# mirrors eth_account's SignedTransaction fields used by Brownie and the pipeline
+SignedTransaction = namedtuple('SignedTransaction', ['rawTransaction', 'hash'])
+
+
+class AgentError(Exception):
+    pass
+
+
+class InsecureAgentDirectory(AgentError):
+    pass
+
+
+def socket_path(account_id):
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f'lido-signing-agent-{os.getuid()}', f'{account_id}.sock')
+
+
+def check_private_directory(directory):
+    """
+    Raises `InsecureAgentDirectory` unless `directory` is a directory (not a
+    symlink) owned by the current user with mode 0700. In a shared /tmp
+    another user could create it first and receive the signing requests.
+    """
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) != 0o700:
+        raise InsecureAgentDirectory(
+            f'{directory} is not a directory owned by uid {os.getuid()} with mode 0700, '
+            f'refusing to use it for the signing agent'
+        )
+
+
+def _to_json(value):
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    return value
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = {'result': self.server.dispatch(request)}
+        except Exception as err:
+            response = {'error': f'{type(err).__name__}: {err}'}
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class _AgentServer(socketserver.UnixStreamServer):
+    def __init__(self, path, account, ttl):
+        self.account = account
+        self.expires_at = time.time() + ttl
+        self.stopped = False
+        super().__init__(path, _Handler)
+
+    def dispatch(self, request):
+        method = request['method']
+        if method == 'address':
+            return {'address': self.account.address, 'expires_at': self.expires_at}
+        if method == 'sign_transaction':
+            signed = self.account.sign_transaction(request['tx'])
+            return {'raw_transaction': _to_json(signed.rawTransaction), 'hash': _to_json(signed.hash)}
+        if method == 'stop':
+            self.stopped = True
+            return {}
+        raise AgentError(f'unknown method {method}')
+
+
+def serve(account, path, ttl=DEFAULT_TTL):
+    """
+    Serves signing requests for `account` (anything with `address` and
+    eth_account's `sign_transaction`) on the Unix socket `path` until the TTL
+    expires or the agent is stopped, then removes the socket.
+    """
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    check_private_directory(os.path.dirname(path))
+    if os.path.exists(path):
+        os.unlink(path)
+
+    old_umask = os.umask(0o177)
+    try:
+        server = _AgentServer(path, account, ttl)
+    finally:
+        os.umask(old_umask)
+
+    server.timeout = POLL_INTERVAL
+    try:
+        while not server.stopped and time.time() < server.expires_at:
+            server.handle_request()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+class AgentSigner:
+    """
+    Client side of the agent. `sign_transaction` has the same shape as
+    eth_account's, so it can stand in for an unlocked key.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _request(self, method, **params):
+        try:
+            check_private_directory(os.path.dirname(self.path))
+        except FileNotFoundError as err:
+            raise AgentError(f'no signing agent at {self.path}: {err}') from err
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            try:
+                conn.connect(self.path)
+            except OSError as err:
+                raise AgentError(f'no signing agent at {self.path}: {err}') from err
+            conn.sendall(json.dumps({'method': method, **params}).encode() + b'\n')
+            response = json.loads(conn.makefile('rb').readline())
+        if 'error' in response:
+            raise AgentError(response['error'])
+        return response['result']
+
+    @property
+    def address(self):
+        return self._request('address')['address']
+
+    def sign_transaction(self, tx):
+        result = self._request('sign_transaction', tx={k: _to_json(v) for k, v in tx.items()})
+        return SignedTransaction(
+            bytes.fromhex(result['raw_transaction'][2:]),
+            bytes.fromhex(result['hash'][2:])
+        )
+
+    def stop(self):
+        self._request('stop')
+
+
+def agent_account(account_id):
+    """
+    Returns a Brownie account that signs through the agent unlocked for
+    `account_id`, or None if no agent is running.
+    """
+    from brownie import web3
+    from brownie.network import rpc
+    from brownie.network.account import Account
+
+    signer = AgentSigner(socket_path(account_id))
+    try:
+        address = signer.address
+    except InsecureAgentDirectory:
+        raise
+    except AgentError:
+        return None
+
+    class AgentAccount(Account):
+        # like Brownie's ClefAccount, only the sending of transactions is
+        # replaced; there is no key to sign messages with
+        def __init__(self, address, signer):
+            self.signer = signer
+            super().__init__(address)
+
+        def _transact(self, tx, allow_revert):
+            if allow_revert is None:
+                allow_revert = rpc.is_active()
+            if not allow_revert:
+                self._check_for_revert(tx)
+            tx['chainId'] = web3.chain_id
+            return web3.eth.send_raw_transaction(self.signer.sign_transaction(tx).rawTransaction)
+
+    return AgentAccount(address, signer)
+
+
+def load_account(account_id):
+    from brownie import accounts
+
+    account = agent_account(account_id)
+    if account is not None:
+        print(f'Signing with the agent unlocked for {account_id}')
+        return account
+    return accounts.load(account_id)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m tooling.signing_agent')
+    parser.add_argument('command', choices=['start', 'stop', 'status'])
+    parser.add_argument('account_id', help='Brownie account id, as in DEPLOYER')
+    parser.add_argument('--ttl', type=int, default=DEFAULT_TTL, help='seconds to keep the key')
+    options = parser.parse_args(argv)
+    path = socket_path(options.account_id)
+
+    if options.command != 'start':
+        try:
+            status = AgentSigner(path)._request('address')
+        except AgentError:
+            print(f'no agent running for {options.account_id}')
+            return 1
+        if options.command == 'stop':
+            AgentSigner(path).stop()
+            print(f'stopped the agent for {status["address"]}')
+        else:
+            print(f'{status["address"]}, {int(status["expires_at"] - time.time())}s left')
+        return 0
+
+    from brownie import accounts
+    from eth_account import Account
+
+    # the only scrypt unlock of the session
+    account = Account.from_key(accounts.load(options.account_id).private_key)
+
+    if os.fork() > 0:
+        # scripts started right after this one should find the socket
+        deadline = time.time() + 5
+        while not os.path.exists(path) and time.time() < deadline:
+            time.sleep(0.05)
+        print(f'agent for {account.address} listening on {path} for {options.ttl}s')
+        return 0
+
+    os.setsid()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    serve(account, path, options.ttl)
+    os._exit(0)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,107 @@
+import json
+import shutil
+
+import pytest
+
+from tooling.abi_index import (
+    PROJECTS_ROOT,
+    SelectorIndex,
+    canonical_type,
+    find_artifacts,
+    format_decoded_script,
+    function_selector,
+    function_signature,
+    hash_artifacts
+)
+from tooling.evm_script import encode_call_script
+
+
+VOTING = '0x2e59A20f205bB85a89C53f1936454680651E618e'
+FINANCE = '0xB9E5CBB9CA5b0d659238807E84D0176930753d86'
+TOKEN_MANAGER = '0xf73a1260d222f447210581DDf212D915c09a3249'
+LDO = '0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32'
+
+
+@pytest.fixture
+def projects_root(tmp_path):
+    interfaces = tmp_path / 'curve' / 'interfaces'
+    interfaces.mkdir(parents=True)
+    for name in ('Voting', 'Finance', 'TokenManager'):
+        shutil.copy(f'{PROJECTS_ROOT}/curve/interfaces/{name}.json', interfaces)
+    return tmp_path
+
+
+def test_canonical_tuple_type():
+    abi_input = {
+        'type': 'tuple[]',
+        'components': [
+            {'type': 'address'},
+            {'type': 'tuple', 'components': [{'type': 'uint256'}, {'type': 'bytes'}]},
+        ]
+    }
+    assert canonical_type(abi_input) == '(address,(uint256,bytes))[]'
+
+
+def test_function_signature():
+    abi_entry = {'name': 'newVote', 'inputs': [{'type': 'bytes'}, {'type': 'string'}]}
+    assert function_signature(abi_entry) == 'newVote(bytes,string)'
+
+
+def test_finds_source_interfaces(projects_root):
+    names = [path.split('/')[-1] for path in find_artifacts(projects_root)]
+    assert names == ['Finance.json', 'TokenManager.json', 'Voting.json']
+
+
+def test_reuses_cached_index(projects_root, tmp_path):
+    cache_path = tmp_path / 'cache' / 'index.json'
+    artifacts_hash = hash_artifacts(find_artifacts(projects_root), projects_root)
+    cache_path.parent.mkdir()
+    cache_path.write_text(json.dumps({'artifacts_hash': artifacts_hash, 'selectors': {'0x01020304': {}}}))
+
+    index = SelectorIndex.load(projects_root, str(cache_path))
+    assert index.selectors == {'0x01020304': {}}
+
+
+def test_decodes_nested_vote_script(projects_root, tmp_path):
+    eth_abi = pytest.importorskip('eth_abi')
+    pytest.importorskip('eth_utils')
+
+    cache_path = str(tmp_path / 'index.json')
+    index = SelectorIndex.load(projects_root, cache_path)
+    assert SelectorIndex.load(projects_root, cache_path).selectors == index.selectors
+
+    def calldata(name, types, args):
+        selector = function_selector(f'{name}({",".join(types)})')
+        return selector + eth_abi.encode_abi(types, args).hex()
+
+    payment = calldata(
+        'newImmediatePayment',
+        ['address', 'address', 'uint256', 'string'],
+        [LDO, VOTING, 10 ** 18, 'incentives']
+    )
+    new_vote = calldata(
+        'newVote',
+        ['bytes', 'string', 'bool', 'bool'],
+        [bytes.fromhex(encode_call_script([(FINANCE, payment)])[2:]), 'Send LDO', False, False]
+    )
+    forward = calldata(
+        'forward',
+        ['bytes'],
+        [bytes.fromhex(encode_call_script([(VOTING, new_vote)])[2:])]
+    )
+
+    [action] = index.decode_call_script(encode_call_script([(TOKEN_MANAGER, forward)]))
+    assert action.call.signature == 'forward(bytes)'
+
+    [vote] = action.call.args[0].script
+    assert vote.call.signature == 'newVote(bytes,string,bool,bool)'
+    assert [arg.name for arg in vote.call.args] == ['_executionScript', '_metadata', '_castVote', '_executesIfDecided']
+
+    [payment] = vote.call.args[0].script
+    assert payment.to == FINANCE.lower()
+    assert payment.call.name == 'newImmediatePayment'
+    assert [arg.value for arg in payment.call.args][2:] == [10 ** 18, 'incentives']
+
+    assert 'newImmediatePayment(address,address,uint256,string)' in '\n'.join(
+        format_decoded_script([action])
+    )
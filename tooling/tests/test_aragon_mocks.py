@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tooling.aragon_mocks import LOCAL_DAO_ADDRESSES, LOCAL_DAO_CONTRACTS, LOCAL_DAO_DEPLOYER, SOURCE_PATH
+from tooling.compile_cache import project_path
+
+
+READ_CONFIG = '''
+import json
+from utils import config
+print(json.dumps({name: getattr(config, name, None) for name in [
+    'ldo_token_address',
+    'lido_dao_agent_address',
+    'lido_dao_finance_address',
+    'lido_dao_voting_address',
+    'lido_dao_token_manager_address',
+]}))
+'''
+
+
+def read_config(project, local):
+    env = dict(os.environ)
+    env.pop('LIDO_DAO_APPS', None)
+    if local:
+        env['LIDO_DAO_APPS'] = 'local'
+    output = subprocess.run(
+        [sys.executable, '-c', READ_CONFIG],
+        cwd=project_path(project),
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_addresses_follow_the_deployer_nonces():
+    pytest.importorskip('eth_utils')
+    from tooling.pipeline import contract_address
+
+    assert list(LOCAL_DAO_ADDRESSES) == LOCAL_DAO_CONTRACTS
+    for nonce, name in enumerate(LOCAL_DAO_CONTRACTS):
+        assert LOCAL_DAO_ADDRESSES[name] == contract_address(LOCAL_DAO_DEPLOYER, nonce)
+
+
+def test_source_defines_every_stand_in():
+    with open(SOURCE_PATH) as f:
+        source = f.read()
+    for name in ['MockMiniMeToken', 'MockAgent', 'MockVoting', 'MockFinance', 'MockTokenManager']:
+        assert f'contract {name} ' in source
+
+
+@pytest.mark.parametrize('project', ['balancer', 'curve', 'sushi'])
+def test_config_switch(project):
+    live = read_config(project, local=False)
+    local = read_config(project, local=True)
+
+    assert live['lido_dao_voting_address'] == '0x2e59A20f205bB85a89C53f1936454680651E618e'
+    assert local['ldo_token_address'] == LOCAL_DAO_ADDRESSES['token']
+    assert local['lido_dao_agent_address'] == LOCAL_DAO_ADDRESSES['agent']
+    assert local['lido_dao_voting_address'] == LOCAL_DAO_ADDRESSES['voting']
+    assert local['lido_dao_token_manager_address'] == LOCAL_DAO_ADDRESSES['token_manager']
+    if live['lido_dao_finance_address'] is not None:
+        assert local['lido_dao_finance_address'] == LOCAL_DAO_ADDRESSES['finance']
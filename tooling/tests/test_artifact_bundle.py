@@ -0,0 +1,93 @@
+import hashlib
+import json
+
+import pytest
+
+from tooling.artifact_bundle import BundleMismatch, build_bundle, install_bundle, install_matching_bundle, refresh_bundle
+
+
+CONFIG = 'compiler:\n  solc:\n    version: 0.5.16\n'
+SOURCES = {
+    'contracts/Mock.sol': 'import "./vendor/Campaign.sol";\ncontract Mock is Campaign {}\n',
+    'contracts/vendor/Campaign.sol': 'contract Campaign {}\n',
+    'contracts/vendor/lib/Math.sol': 'library Math {}\n',
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / 'brownie-config.yaml').write_text(CONFIG)
+    build_dir = tmp_path / 'build' / 'contracts'
+    build_dir.mkdir(parents=True)
+    for source, text in SOURCES.items():
+        (tmp_path / source).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / source).write_text(text)
+        name = source.rsplit('/', 1)[1][:-4]
+        (build_dir / f'{name}.json').write_text(json.dumps({
+            'contractName': name,
+            'sourcePath': source,
+            'sha1': hashlib.sha1(text.encode()).hexdigest(),
+            'bytecode': '6080',
+        }))
+    return tmp_path
+
+
+def test_installs_only_the_subtree(project):
+    bundle = build_bundle(str(project), 'contracts/vendor')
+    assert sorted(bundle['artifacts']) == ['Campaign.json', 'Math.json']
+
+    for artifact in (project / 'build' / 'contracts').iterdir():
+        artifact.unlink()
+    assert install_bundle(str(project)) == 2
+    assert sorted(p.name for p in (project / 'build' / 'contracts').iterdir()) == ['Campaign.json', 'Math.json']
+
+
+def test_rejects_changed_sources(project):
+    build_bundle(str(project), 'contracts/vendor')
+    (project / 'contracts' / 'vendor' / 'Campaign.sol').write_text('contract Campaign { }\n')
+
+    with pytest.raises(BundleMismatch, match='Campaign.sol changed'):
+        install_bundle(str(project))
+
+
+def test_rejects_added_sources(project):
+    build_bundle(str(project), 'contracts/vendor')
+    (project / 'contracts' / 'vendor' / 'New.sol').write_text('contract New {}\n')
+
+    with pytest.raises(BundleMismatch, match='added'):
+        install_bundle(str(project))
+
+
+def test_rejects_tampered_artifacts(project):
+    build_bundle(str(project), 'contracts/vendor')
+    bundle = json.loads((project / 'artifact_bundle.json').read_text())
+    bundle['artifacts']['Math.json']['bytecode'] = '00'
+    (project / 'artifact_bundle.json').write_text(json.dumps(bundle))
+
+    with pytest.raises(BundleMismatch, match='Math.json is corrupted'):
+        install_bundle(str(project))
+
+
+def test_rejects_changed_compiler_settings(project):
+    build_bundle(str(project), 'contracts/vendor')
+    (project / 'brownie-config.yaml').write_text(CONFIG.replace('0.5.16', '0.5.17'))
+
+    with pytest.raises(BundleMismatch, match='compiler settings'):
+        install_bundle(str(project))
+
+
+def test_requires_compiled_sources(project):
+    (project / 'build' / 'contracts' / 'Math.json').unlink()
+
+    with pytest.raises(BundleMismatch, match='Math.sol'):
+        build_bundle(str(project), 'contracts/vendor')
+
+
+def test_refreshes_only_outdated_bundles(project):
+    assert install_matching_bundle(str(project)) == 0
+    assert refresh_bundle(str(project), 'contracts/vendor')
+    assert not refresh_bundle(str(project), 'contracts/vendor')
+    assert install_matching_bundle(str(project)) == 2
+
+    (project / 'contracts' / 'vendor' / 'lib' / 'Math.sol').write_text('library Math { }\n')
+    assert install_matching_bundle(str(project)) == 0
@@ -0,0 +1,80 @@
+import pytest
+
+from tooling.calldata import CalldataTemplate
+
+
+SELECTOR = '0x12345678'
+LDO = '0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32'
+RECIPIENT = '0x2e59A20f205bB85a89C53f1936454680651E618e'
+
+
+def word(value):
+    return value.to_bytes(32, 'big').hex()
+
+
+@pytest.fixture
+def payment():
+    return CalldataTemplate('newImmediatePayment(address,address,uint256,string)', SELECTOR)
+
+
+def test_parses_signature(payment):
+    assert payment.name == 'newImmediatePayment'
+    assert payment.types == ['address', 'address', 'uint256', 'string']
+    assert payment.head_size == 128
+
+
+def test_encodes_static_head_and_dynamic_tail(payment):
+    calldata = payment.encode_hex(LDO, RECIPIENT, 10 ** 18, 'ref')
+    assert calldata == (
+        SELECTOR
+        + '00' * 12 + LDO[2:].lower()
+        + '00' * 12 + RECIPIENT[2:].lower()
+        + word(10 ** 18)
+        + word(128)
+        + word(3) + 'ref'.encode().hex() + '00' * 29
+    )
+
+
+def test_encodes_several_dynamic_arguments():
+    template = CalldataTemplate('f(bytes,bool,string)', SELECTOR)
+    calldata = template.encode_hex(b'\x01' * 33, True, '')
+    assert calldata == (
+        SELECTOR
+        + word(96) + word(1) + word(96 + 96)
+        + word(33) + '01' * 33 + '00' * 31
+        + word(0)
+    )
+
+
+def test_encodes_a_batch(payment):
+    rows = [(LDO, RECIPIENT, i, f'payment #{i}') for i in range(3)]
+    assert payment.encode_batch(rows) == [payment.encode(*row) for row in rows]
+    assert list(payment.actions(RECIPIENT, rows[:1])) == [(RECIPIENT, payment.encode(*rows[0]))]
+
+
+def test_rejects_invalid_arguments(payment):
+    with pytest.raises(TypeError):
+        payment.encode(LDO, RECIPIENT, 1)
+    with pytest.raises(ValueError):
+        payment.encode(LDO, '0x1234', 1, '')
+    with pytest.raises(ValueError):
+        payment.encode(LDO, RECIPIENT, -1, '')
+    with pytest.raises(TypeError):
+        payment.encode(LDO, RECIPIENT, '1', '')
+
+
+def test_rejects_unsupported_types():
+    with pytest.raises(ValueError):
+        CalldataTemplate('f(uint256[])', SELECTOR)
+    with pytest.raises(ValueError):
+        CalldataTemplate('f(uint7)', SELECTOR)
+
+
+def test_matches_eth_abi():
+    eth_abi = pytest.importorskip('eth_abi')
+    pytest.importorskip('eth_utils')
+
+    template = CalldataTemplate('f(address,int128,bytes4,bool,bytes,string)')
+    args = (LDO, -5, b'\xab\xcd', False, b'\x00' * 70, 'hello')
+    expected = eth_abi.encode_abi(template.types, list(args))
+    assert template.encode(*args) == template.selector + expected
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from tooling.compile_cache import (
+    compile_project,
+    compiler_settings,
+    list_sources,
+    restore,
+    source_closure,
+    source_key
+)
+
+
+CONFIG = 'compiler:\n  solc:\n    version: 0.5.17\n'
+TOKEN = 'pragma solidity 0.5.17;\nimport "./lib/Math.sol";\ncontract Token {}\n'
+MATH = 'pragma solidity 0.5.17;\nlibrary Math {}\n'
+MANAGER = '# @version 0.2.8\nfrom vyper.interfaces import ERC20\nimport interfaces.Rewards as Rewards\n'
+
+
+def make_project(root, name, config=CONFIG, files=None):
+    path = root / name
+    files = files or {
+        'contracts/Token.sol': TOKEN,
+        'contracts/lib/Math.sol': MATH,
+        'contracts/Manager.vy': MANAGER,
+        'interfaces/Rewards.json': '[]',
+    }
+    for relative, text in {'brownie-config.yaml': config, **files}.items():
+        (path / relative).parent.mkdir(parents=True, exist_ok=True)
+        (path / relative).write_text(text)
+    return str(path)
+
+
+def fake_compile(compiled):
+    def compile(path):
+        build_dir = os.path.join(path, 'build', 'contracts')
+        os.makedirs(build_dir, exist_ok=True)
+        for source in list_sources(path):
+            name = os.path.splitext(os.path.basename(source))[0]
+            with open(os.path.join(path, source), 'rb') as f:
+                sha1 = hashlib.sha1(f.read()).hexdigest()
+            with open(os.path.join(build_dir, f'{name}.json'), 'w') as f:
+                json.dump({'contractName': name, 'sourcePath': source, 'sha1': sha1}, f)
+        compiled.append(path)
+    return compile
+
+
+def test_source_closure(tmp_path):
+    path = make_project(tmp_path, 'a')
+    assert source_closure(path, 'contracts/Token.sol') == ['contracts/Token.sol', 'contracts/lib/Math.sol']
+    assert source_closure(path, 'contracts/Manager.vy') == ['contracts/Manager.vy', 'interfaces/Rewards.json']
+
+
+def test_key_depends_on_imports_and_settings(tmp_path):
+    path = make_project(tmp_path, 'a')
+    key = source_key(path, 'contracts/Token.sol', compiler_settings(path))
+
+    (tmp_path / 'a' / 'contracts' / 'lib' / 'Math.sol').write_text(MATH + '// changed\n')
+    assert source_key(path, 'contracts/Token.sol', compiler_settings(path)) != key
+
+    optimized = make_project(tmp_path, 'b', CONFIG + '    optimizer:\n      enabled: true\n      runs: 999\n')
+    assert source_key(optimized, 'contracts/Token.sol', compiler_settings(optimized)) != key
+
+
+def test_pinned_and_pragma_versions_share_artifacts(tmp_path):
+    pinned = make_project(tmp_path, 'a')
+    unpinned = make_project(tmp_path, 'b', config='networks: {}\n')
+    assert source_key(pinned, 'contracts/Token.sol', compiler_settings(pinned)) == \
+        source_key(unpinned, 'contracts/Token.sol', compiler_settings(unpinned))
+
+
+def test_projects_share_cached_artifacts(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    compiled = []
+    first = make_project(tmp_path, 'a')
+    second = make_project(tmp_path, 'b')
+
+    report = compile_project(first, cache_dir, fake_compile(compiled))
+    assert report.hits == [] and len(report.misses) == 3
+    assert compiled == [first]
+
+    report = compile_project(second, cache_dir, fake_compile(compiled))
+    assert compiled == [first]
+    assert len(report.hits) == 3
+    assert report.saved_seconds >= 0
+    assert sorted(os.listdir(os.path.join(second, 'build', 'contracts'))) == \
+        ['Manager.json', 'Math.json', 'Token.json']
+
+
+def test_only_changed_sources_miss(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    path = make_project(tmp_path, 'a')
+    compile_project(path, cache_dir, fake_compile([]))
+
+    (tmp_path / 'a' / 'contracts' / 'Manager.vy').write_text(MANAGER + '# changed\n')
+    report = restore(path, cache_dir)
+    assert report.misses == ['contracts/Manager.vy']
+    assert report.hits == ['contracts/Token.sol', 'contracts/lib/Math.sol']
+
+
+def test_builds_keep_the_arcx_bundle_current(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    path = make_project(tmp_path, 'arcx', files={
+        'contracts/Mock.sol': 'pragma solidity 0.5.17;\nimport "./arcx_contracts/Token.sol";\ncontract Mock {}\n',
+        'contracts/arcx_contracts/Token.sol': TOKEN.replace('./lib/', './'),
+        'contracts/arcx_contracts/Math.sol': MATH,
+    })
+    bundle_file = os.path.join(path, 'artifact_bundle.json')
+
+    compile_project(path, cache_dir, fake_compile([]))
+    with open(bundle_file) as f:
+        assert sorted(json.load(f)['artifacts']) == ['Math.json', 'Token.json']
+
+    changed = MATH + '// changed\n'
+    (tmp_path / 'arcx' / 'contracts' / 'arcx_contracts' / 'Math.sol').write_text(changed)
+    compile_project(path, cache_dir, fake_compile([]))
+    with open(bundle_file) as f:
+        digest = json.load(f)['sources']['contracts/arcx_contracts/Math.sol']
+    assert digest == hashlib.sha256(changed.encode()).hexdigest()
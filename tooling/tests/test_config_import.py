@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+from tooling.benchmarks.bench_config_import import measure
+from tooling.compile_cache import list_projects, project_path
+
+
+PROJECTS = [
+    project for project in list_projects()
+    if os.path.exists(os.path.join(project_path(project), 'utils', 'config.py'))
+]
+
+
+@pytest.mark.parametrize('project', PROJECTS)
+def test_config_imports_without_brownie(project):
+    assert not measure(project_path(project))['brownie']
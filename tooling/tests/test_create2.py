@@ -0,0 +1,36 @@
+import pytest
+
+from tooling.create2 import caller_salt, create2_address, create2_address_preimage
+
+
+ZERO_SALT = '0x' + '00' * 32
+
+
+def test_create2_address_preimage():
+    deployer = '0x' + 'de' * 20
+    preimage = create2_address_preimage(deployer, ZERO_SALT, b'\x11' * 32)
+    assert preimage == b'\xff' + b'\xde' * 20 + b'\x00' * 32 + b'\x11' * 32
+
+
+def test_rejects_short_salts():
+    with pytest.raises(ValueError, match='salt must be 32 bytes'):
+        create2_address_preimage('0x' + '00' * 20, '0x01', b'\x00' * 32)
+
+
+# EIP-1014 examples
+@pytest.mark.parametrize('deployer, salt, init_code, address', [
+    ('0x0000000000000000000000000000000000000000', ZERO_SALT, '0x00',
+     '0x4D1A2e2bB4F88F0250f26Ffff098B0b30B26BF38'),
+    ('0xdeadbeef00000000000000000000000000000000', ZERO_SALT, '0x00',
+     '0xB928f69Bb1D91Cd65274e3c79d8986362984fDA3'),
+    ('0x00000000000000000000000000000000deadbeef', '0x' + '00' * 28 + 'cafebabe', '0xdeadbeef',
+     '0x60f3f640a8508fC6a86d45DF051962668E1e8AC7'),
+])
+def test_create2_address(deployer, salt, init_code, address):
+    pytest.importorskip('eth_utils')
+    assert create2_address(deployer, salt, init_code) == address
+
+
+def test_caller_salt_depends_on_caller():
+    pytest.importorskip('eth_utils')
+    assert caller_salt('0x' + '01' * 20, ZERO_SALT) != caller_salt('0x' + '02' * 20, ZERO_SALT)
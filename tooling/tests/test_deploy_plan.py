@@ -0,0 +1,191 @@
+import json
+import os
+
+import pytest
+
+from tooling.deploy_plan import (
+    StepReverted,
+    TransactionDropped,
+    execute_plan,
+    load_plan,
+    parse_plan,
+    resolve,
+    topological_order
+)
+
+
+PLAN_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'deployments', 'rewards_managers.yaml')
+
+
+def plan_data(steps, accounts=('a', 'b')):
+    return {
+        'accounts': {account: account for account in accounts},
+        'constants': {'agent': '0xagent', 'duration': 60},
+        'steps': steps,
+    }
+
+
+def branch(account, project):
+    return [
+        {'id': f'{account}_manager', 'project': project, 'account': account, 'deploy': 'RewardsManager'},
+        {'id': f'{account}_rewards', 'project': project, 'account': account, 'deploy': 'StakingRewards',
+         'args': ['${agent}', f'${{{account}_manager}}', '${duration}']},
+        {'id': f'{account}_wiring', 'project': project, 'account': account,
+         'call': {'contract': f'{account}_manager', 'method': 'set_rewards_contract',
+                  'args': [f'${{{account}_rewards}}']}},
+    ]
+
+
+class Crash(Exception):
+    pass
+
+
+class FakeRunner:
+    """
+    Confirms a transaction on the second poll, so steps of different accounts
+    overlap while they are in flight.
+    """
+
+    def __init__(self, fail=(), drop=(), crash=(), mined=()):
+        self.fail = set(fail)
+        self.drop = set(drop)
+        self.crash = set(crash)
+        self.mined = set(mined)
+        self.nonces = {}
+        self.calls = []
+        self.polls = {}
+        self.in_flight = set()
+        self.max_concurrency = 0
+
+    def next_nonce(self, step):
+        return self.nonces.get(step.account, 0)
+
+    def send(self, step, args, target, nonce):
+        assert not any(account == step.account for account, _ in self.in_flight)
+        self.calls.append((step.id, args, target))
+        self.nonces[step.account] = nonce + 1
+        self.in_flight.add((step.account, step.id))
+        self.max_concurrency = max(self.max_concurrency, len(self.in_flight))
+        return f'0xtx_{step.id}'
+
+    def poll(self, step, sent):
+        if step.id in self.crash:
+            raise Crash(step.id)
+        if step.id in self.drop:
+            self.drop.discard(step.id)
+            self.in_flight.discard((step.account, step.id))
+            raise TransactionDropped(sent['tx'])
+        self.polls[step.id] = self.polls.get(step.id, 0) + 1
+        if self.polls[step.id] < 2 and step.id not in self.mined:
+            return None
+        self.in_flight.discard((step.account, step.id))
+        if step.id in self.fail:
+            raise StepReverted(f'{step.id} reverted')
+        if step.deploy:
+            return {'address': f'0x{step.id}', 'tx': sent['tx']}
+        return {'tx': sent['tx']}
+
+
+def run_plan(plan, runner, checkpoint_path):
+    return execute_plan(plan, runner, checkpoint_path, log=lambda _: None, poll_interval=0)
+
+
+def test_example_plan_covers_every_project():
+    plan = load_plan(PLAN_PATH)
+    assert {step.project for step in plan.steps} == {'1inch', 'arcx', 'balancer', 'curve', 'sushi'}
+
+
+def test_references_imply_dependencies():
+    plan = parse_plan(plan_data(branch('a', 'curve')))
+    steps = {step.id: step for step in plan.steps}
+    assert steps['a_rewards'].depends_on == ['a_manager']
+    assert steps['a_wiring'].depends_on == ['a_manager', 'a_rewards']
+    assert [step.id for step in topological_order(plan.steps)] == ['a_manager', 'a_rewards', 'a_wiring']
+
+
+def test_rejects_cycles_and_unknown_references():
+    steps = branch('a', 'curve')
+    steps[0]['depends_on'] = ['a_wiring']
+    with pytest.raises(ValueError, match='cycle'):
+        parse_plan(plan_data(steps))
+
+    steps = branch('a', 'curve')
+    steps[1]['args'] = ['${missing}']
+    with pytest.raises(ValueError, match='unknown reference missing'):
+        parse_plan(plan_data(steps))
+
+    with pytest.raises(ValueError, match='unknown project'):
+        parse_plan(plan_data(branch('a', 'uniswap')))
+
+
+def test_resolve(monkeypatch):
+    monkeypatch.setenv('OWNER', '0xowner')
+    results = {'manager': {'address': '0xmanager'}}
+    assert resolve(['${agent}', '${manager}', '${env:OWNER}', '${duration}', 5], {'agent': '0xagent', 'duration': 60}, results) == \
+        ['0xagent', '0xmanager', '0xowner', 60, 5]
+
+
+def test_runs_branches_concurrently(tmp_path):
+    plan = parse_plan(plan_data(branch('a', 'curve') + branch('b', 'sushi')))
+    runner = FakeRunner()
+    completed = run_plan(plan, runner, str(tmp_path / 'checkpoint.json'))
+
+    assert len(completed) == 6
+    assert runner.max_concurrency == 2
+    calls = {step_id: (args, target) for step_id, args, target in runner.calls}
+    assert calls['a_rewards'] == (['0xagent', '0xa_manager', 60], None)
+    assert calls['b_wiring'] == (['0xb_rewards'], '0xb_manager')
+
+
+def test_resumes_from_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    plan = parse_plan(plan_data(branch('a', 'curve') + branch('b', 'sushi')))
+
+    with pytest.raises(StepReverted, match='a_rewards reverted'):
+        run_plan(plan, FakeRunner(fail={'a_rewards'}), checkpoint_path)
+    with open(checkpoint_path) as f:
+        done = set(json.load(f)['steps'])
+    assert 'a_manager' in done and 'a_rewards' not in done
+
+    runner = FakeRunner()
+    completed = run_plan(plan, runner, checkpoint_path)
+    assert len(completed) == 6
+    assert not done & {step_id for step_id, _, _ in runner.calls}
+
+
+def test_awaits_sent_steps_instead_of_sending_them_again(tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    plan = parse_plan(plan_data(branch('a', 'curve')))
+
+    with pytest.raises(Crash):
+        run_plan(plan, FakeRunner(crash={'a_rewards'}), checkpoint_path)
+    with open(checkpoint_path) as f:
+        sent = json.load(f)['sent']
+    assert sent['a_rewards']['tx'] == '0xtx_a_rewards'
+    assert sent['a_rewards']['nonce'] == 1
+
+    runner = FakeRunner(mined={'a_rewards'})
+    completed = run_plan(plan, runner, checkpoint_path)
+    assert completed['a_rewards']['tx'] == '0xtx_a_rewards'
+    assert [step_id for step_id, _, _ in runner.calls] == ['a_wiring']
+    with open(checkpoint_path) as f:
+        assert json.load(f)['sent'] == {}
+
+
+def test_sends_dropped_steps_again(tmp_path):
+    plan = parse_plan(plan_data(branch('a', 'curve')))
+    runner = FakeRunner(drop={'a_rewards'})
+    completed = run_plan(plan, runner, str(tmp_path / 'checkpoint.json'))
+
+    assert len(completed) == 3
+    assert [step_id for step_id, _, _ in runner.calls] == ['a_manager', 'a_rewards', 'a_rewards', 'a_wiring']
+
+
+def test_refuses_to_resume_a_changed_step(tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    run_plan(parse_plan(plan_data(branch('a', 'curve'))), FakeRunner(), checkpoint_path)
+
+    data = plan_data(branch('a', 'curve'))
+    data['steps'][1]['args'][2] = 120
+    with pytest.raises(ValueError, match='a_rewards changed'):
+        run_plan(parse_plan(data), FakeRunner(), checkpoint_path)
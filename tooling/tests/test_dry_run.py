@@ -0,0 +1,73 @@
+from tooling.dry_run import (
+    TRANSFER_TOPIC,
+    _event_addresses,
+    _transfer_parties,
+    cache_key,
+    format_report
+)
+
+
+LDO = '0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32'
+AGENT = '0x3e40D73EB977Dc6a537aF587D48316feE66E9C8c'
+RECIPIENT = '0x32199f1ffd5c9a5745a98fe492570a8d1601dc4c'
+
+
+def topic(address):
+    return '0x' + '00' * 12 + address[2:].lower()
+
+
+def test_cache_key_depends_on_script_executor_and_state():
+    key = cache_key('0x00000001', AGENT, '0x' + '11' * 32)
+    assert key == cache_key(bytes.fromhex('00000001'), AGENT.lower(), '0x' + '11' * 32)
+    assert key != cache_key('0x00000001', AGENT, '0x' + '22' * 32)
+    assert key != cache_key('0x00000001', RECIPIENT, '0x' + '11' * 32)
+    assert key != cache_key('0x0000000100', AGENT, '0x' + '11' * 32)
+
+
+def test_collects_erc20_transfer_parties():
+    logs = [
+        {'address': LDO, 'topics': [TRANSFER_TOPIC, topic(AGENT), topic(RECIPIENT)], 'data': '0x' + '00' * 31 + '01'},
+        # mint: the zero address has no balance to track
+        {'address': LDO, 'topics': [TRANSFER_TOPIC, '0x' + '00' * 32, topic(RECIPIENT)], 'data': '0x' + '00' * 32},
+        # ERC721 transfer, the token id is indexed
+        {'address': LDO, 'topics': [TRANSFER_TOPIC, topic(AGENT), topic(RECIPIENT), '0x' + '00' * 32], 'data': '0x'},
+    ]
+    assert list(_transfer_parties(logs)) == [
+        (LDO, AGENT.lower()),
+        (LDO, RECIPIENT),
+        (LDO, RECIPIENT),
+    ]
+
+
+def test_collects_event_addresses():
+    events = [
+        {'name': 'VaultTransfer', 'address': AGENT, 'args': {'token': LDO, 'to': RECIPIENT, 'amount': 1}},
+        {'name': 'NewPeriod', 'address': AGENT, 'args': {'periodId': 2, 'reference': '0x1234'}},
+    ]
+    assert list(_event_addresses(events)) == [AGENT, LDO, RECIPIENT, AGENT]
+
+
+def test_formats_report():
+    report = {
+        'executor': AGENT,
+        'calls': [
+            {'to': LDO, 'function': 'transfer(address,uint256)', 'success': True, 'gas_used': 35000,
+             'error': None, 'events': [{'name': 'Transfer', 'address': LDO, 'args': {'value': 1}}]},
+            {'to': LDO, 'function': '0xdeadbeef', 'success': False, 'gas_used': None,
+             'error': 'revert', 'events': []},
+        ],
+        'balance_deltas': {LDO: {AGENT: -1, RECIPIENT: 1}},
+        'eth_deltas': {AGENT.lower(): -10**18, RECIPIENT: 10**18},
+    }
+    assert format_report(report).splitlines() == [
+        f'executor: {AGENT}',
+        f'#1 {LDO} transfer(address,uint256): ok, gas used 35000',
+        f"    Transfer @ {LDO}: {{'value': 1}}",
+        f'#2 {LDO} 0xdeadbeef: REVERTED: revert',
+        'balance deltas:',
+        f'    {LDO} {AGENT}: -1',
+        f'    {LDO} {RECIPIENT}: +1',
+        'ETH deltas:',
+        f'    {AGENT.lower()}: -1000000000000000000',
+        f'    {RECIPIENT}: +1000000000000000000',
+    ]
@@ -0,0 +1,138 @@
+import mmap
+
+import pytest
+
+from tooling.evm_script import (
+    EMPTY_CALLSCRIPT,
+    encode_call_script,
+    encode_call_script_bytes,
+    decode_call_script,
+    format_address
+)
+
+
+VOTING = '0x2e59A20f205bB85a89C53f1936454680651E618e'
+AGENT = '0x3e40D73EB977Dc6a537aF587D48316feE66E9C8c'
+
+
+def legacy_encode_call_script(actions, spec_id=1):
+    eth_abi = pytest.importorskip('eth_abi')
+    web3 = pytest.importorskip('web3')
+
+    result = '0x' + str(spec_id).zfill(8)
+    for to, calldata in actions:
+        addr_bytes = web3.Web3.toBytes(hexstr=to).hex()
+        calldata_bytes = calldata[2:] if calldata[0:2] == '0x' else calldata
+        length = eth_abi.encode_single('int256', len(calldata_bytes) // 2).hex()
+        result += addr_bytes + length[56:] + calldata_bytes
+    return result
+
+
+def test_empty_script():
+    assert encode_call_script([]) == EMPTY_CALLSCRIPT
+
+
+def test_single_action():
+    script = encode_call_script([(VOTING, '0xdeadbeef')])
+    assert script == (
+        '0x00000001'
+        '2e59a20f205bb85a89c53f1936454680651e618e'
+        '00000004'
+        'deadbeef'
+    )
+
+
+def test_multiple_actions_and_unprefixed_input():
+    script = encode_call_script([
+        (VOTING, 'aabb'),
+        (AGENT[2:], '0x'),
+        (bytearray.fromhex(VOTING[2:]), bytes(300)),
+    ])
+    assert script == (
+        '0x00000001'
+        + VOTING[2:].lower() + '00000002' + 'aabb'
+        + AGENT[2:].lower() + '00000000'
+        + VOTING[2:].lower() + '0000012c' + '00' * 300
+    )
+
+
+def test_bytes_and_hex_outputs_match():
+    actions = [(VOTING, '0x' + 'ab' * 68), (AGENT, '0x01')]
+    assert '0x' + encode_call_script_bytes(actions).hex() == encode_call_script(actions)
+
+
+def test_accepts_a_generator():
+    actions = ((VOTING, '0x' + f'{i:08x}') for i in range(3))
+    assert len(encode_call_script_bytes(actions)) == 4 + 3 * (24 + 4)
+
+
+def test_rejects_invalid_address():
+    with pytest.raises(ValueError):
+        encode_call_script([('0x1234', '0x')])
+
+
+def test_rejects_odd_length_calldata():
+    with pytest.raises(ValueError):
+        encode_call_script([(VOTING, '0xabc')])
+
+
+def test_matches_legacy_encoder():
+    actions = [
+        (VOTING, '0x' + bytes(range(i % 256)).hex())
+        for i in range(50)
+    ]
+    assert encode_call_script(actions) == legacy_encode_call_script(actions)
+
+
+def test_decode_round_trip():
+    actions = [(VOTING, '0xdeadbeef'), (AGENT, '0x'), (VOTING, '0x' + '01' * 100)]
+    spec_id, decoded = decode_call_script(encode_call_script(actions))
+    assert spec_id == 1
+    assert [(format_address(to), '0x' + bytes(calldata).hex()) for to, calldata in decoded] == [
+        (to.lower(), calldata) for to, calldata in actions
+    ]
+
+
+def test_decode_empty_script():
+    spec_id, decoded = decode_call_script(EMPTY_CALLSCRIPT)
+    assert spec_id == 1
+    assert list(decoded) == []
+
+
+def test_decode_does_not_copy():
+    script = bytearray(encode_call_script_bytes([(VOTING, '0xdeadbeef')]))
+    _, decoded = decode_call_script(script)
+    to, calldata = next(decoded)
+    assert isinstance(calldata, memoryview)
+    script[-1] = 0
+    assert bytes(calldata) == bytes.fromhex('deadbe00')
+
+
+def test_decode_is_lazy():
+    script = encode_call_script_bytes([(VOTING, '0xdeadbeef')]) + bytes(3)
+    _, decoded = decode_call_script(script)
+    assert bytes(next(decoded)[1]) == bytes.fromhex('deadbeef')
+    with pytest.raises(ValueError, match='truncated action header'):
+        next(decoded)
+
+
+def test_decode_rejects_short_header():
+    with pytest.raises(ValueError, match='too short'):
+        decode_call_script('0x000001')
+
+
+def test_decode_rejects_overlong_length_prefix():
+    script = bytearray(encode_call_script_bytes([(VOTING, '0xdeadbeef')]))
+    script[24:28] = (5).to_bytes(4, 'big')
+    _, decoded = decode_call_script(script)
+    with pytest.raises(ValueError, match='exceeds the remaining 4 bytes'):
+        list(decoded)
+
+
+def test_decode_mmap(tmp_path):
+    path = tmp_path / 'script.bin'
+    path.write_bytes(encode_call_script_bytes([(AGENT, bytes(1024))] * 1000))
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        spec_id, decoded = decode_call_script(mapped)
+        assert sum(len(calldata) for _, calldata in decoded) == 1024 * 1000
+        del decoded
@@ -0,0 +1,105 @@
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tooling.fork_state import ForkState, NotRecorded, StateProxy
+
+
+BLOCK = 12_000_000
+LDO = '0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32'
+
+
+class FakeMainnet(BaseHTTPRequestHandler):
+    calls = []
+
+    def do_POST(self):
+        call = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        FakeMainnet.calls.append((call['method'], call['params']))
+        results = {
+            'eth_blockNumber': hex(BLOCK + 5),
+            'eth_getCode': '0x6080',
+            'eth_getStorageAt': '0x' + '00' * 31 + '2a',
+            'net_version': '1',
+        }
+        body = json.dumps({'jsonrpc': '2.0', 'id': call['id'], 'result': results[call['method']]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+
+@pytest.fixture
+def mainnet():
+    FakeMainnet.calls = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeMainnet)
+    yield serve(server)
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, payload):
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def call(method, *params):
+    return {'jsonrpc': '2.0', 'id': 7, 'method': method, 'params': list(params)}
+
+
+def test_canonical_state_keys():
+    state = ForkState(BLOCK)
+    state.record('eth_getStorageAt', [LDO, '0x00', 'latest'], '0x01')
+    state.record('eth_getCode', [LDO, hex(BLOCK)], '0x6080')
+
+    assert state.lookup('eth_getStorageAt', [LDO.lower(), '0x0', hex(BLOCK)]) == '0x01'
+    assert state.lookup('eth_getCode', [LDO, 'latest']) == '0x6080'
+    assert state.accounts == {LDO.lower(): {'code': '0x6080', 'storage': {'0x0': '0x01'}}}
+    with pytest.raises(NotRecorded):
+        state.lookup('eth_getStorageAt', [LDO, '0x1', 'latest'])
+    # state at other blocks is kept apart from the fork block state
+    with pytest.raises(NotRecorded):
+        state.lookup('eth_getCode', [LDO, hex(BLOCK - 1)])
+
+
+def test_records_then_replays_offline(mainnet, tmp_path):
+    state = ForkState()
+    proxy = StateProxy(state, mainnet, ('127.0.0.1', 0))
+    url = serve(proxy)
+
+    assert state.block_number == BLOCK + 5
+    assert post(url, call('eth_blockNumber'))['result'] == hex(BLOCK + 5)
+    responses = post(url, [call('eth_getCode', LDO, 'latest'), call('eth_getStorageAt', LDO, '0x0', 'latest')])
+    assert [r['result'] for r in responses] == ['0x6080', '0x' + '00' * 31 + '2a']
+    assert post(url, call('net_version'))['result'] == '1'
+    proxy.shutdown()
+    proxy.server_close()
+
+    # block tags are pinned to the fork block when forwarded
+    assert ('eth_getCode', [LDO, hex(BLOCK + 5)]) in FakeMainnet.calls
+
+    path = str(tmp_path / 'state.json.gz')
+    state.save(path)
+    upstream_calls = len(FakeMainnet.calls)
+
+    replay = StateProxy(ForkState.load(path), address=('127.0.0.1', 0))
+    url = serve(replay)
+    assert post(url, call('eth_getCode', LDO, hex(BLOCK + 5)))['result'] == '0x6080'
+    assert post(url, call('net_version'))['result'] == '1'
+    error = post(url, call('eth_getBalance', LDO, 'latest'))['error']
+    assert 'was not recorded' in error['message']
+    replay.shutdown()
+    replay.server_close()
+
+    assert len(FakeMainnet.calls) == upstream_calls
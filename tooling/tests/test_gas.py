@@ -0,0 +1,109 @@
+import pytest
+
+from tooling.evm_script import encode_call_script
+from tooling.gas import (
+    TX_BASE_GAS,
+    assert_script_fits,
+    calldata_gas,
+    estimate_script_gas,
+    intrinsic_gas,
+    load_gas_table,
+    measure_gas_table
+)
+
+
+FINANCE = '0xB9E5CBB9CA5b0d659238807E84D0176930753d86'
+
+
+@pytest.fixture
+def table():
+    return {
+        'action_overhead_gas': 1_000,
+        'create_vote_base_gas': 200_000,
+        'default_action_gas': 50_000,
+        'execute_vote_base_gas': 100_000,
+        'selectors': {
+            '0xf6364846': {
+                'signature': 'newImmediatePayment(address,address,uint256,string)',
+                'gas': 90_000,
+            },
+        },
+    }
+
+
+def test_shipped_table_is_valid():
+    table = load_gas_table()
+    assert set(table) >= {'action_overhead_gas', 'default_action_gas', 'selectors'}
+
+
+def test_shipped_entries_record_their_source():
+    table = load_gas_table()
+    assert all(entry['measured_on'] for entry in table['selectors'].values())
+
+
+def test_calldata_gas():
+    assert calldata_gas('0x0001ff00') == 4 + 16 + 16 + 4
+
+
+def test_estimates_each_action(table):
+    script = encode_call_script([(FINANCE, '0xf6364846' + '00' * 32), (FINANCE, '0xdeadbeef')])
+    estimate = estimate_script_gas(script, table)
+
+    assert estimate.script_bytes == 4 + 24 + 36 + 24 + 4
+    assert estimate.intrinsic_gas == TX_BASE_GAS + calldata_gas(script)
+    assert estimate.create_gas == 200_000 + estimate.intrinsic_gas + 3 * 20_000
+    assert [(a.selector, a.gas, a.measured) for a in estimate.actions] == [
+        ('0xf6364846', 90_000, True),
+        ('0xdeadbeef', 50_000, False),
+    ]
+    assert estimate.execute_gas == 100_000 + 90_000 + 50_000 + 2 * 1_000
+
+
+def test_rejects_oversized_execution(table):
+    script = encode_call_script([(FINANCE, '0xf6364846')] * 140)
+    with pytest.raises(ValueError, match='executing the vote'):
+        assert_script_fits(script, gas_limit=12_000_000, table=table)
+    assert assert_script_fits(script, gas_limit=12_000_000 * 2, table=table)
+
+
+def test_rejects_oversized_script(table):
+    script = encode_call_script([(FINANCE, '0x' + 'ff' * 100_000)])
+    with pytest.raises(ValueError, match='creating the vote'):
+        assert_script_fits(script, gas_limit=12_000_000, table=table)
+
+
+def test_only_warns_about_unmeasured_execution(table):
+    script = encode_call_script([(FINANCE, '0xdeadbeef')] * 250)
+    with pytest.warns(UserWarning, match='0xdeadbeef'):
+        estimate = assert_script_fits(script, gas_limit=12_000_000, table=table)
+    assert estimate.execute_gas > 12_000_000
+
+
+class FakeEth:
+    def __init__(self, gas):
+        self.gas = gas
+
+    def estimate_gas(self, tx):
+        return intrinsic_gas(tx['data']) + self.gas
+
+
+class FakeWeb3:
+    def __init__(self, gas):
+        self.eth = FakeEth(gas)
+
+
+def test_measurements_merge_per_source(table, tmp_path):
+    path = str(tmp_path / 'gas_table.json')
+    action = (FINANCE, '0xf6364846' + '00' * 32, 'newImmediatePayment(address,address,uint256,string)')
+
+    measure_gas_table(FakeWeb3(95_000), FINANCE, [action], 'fork at block 1', table, path)
+    measure_gas_table(FakeWeb3(92_000), FINANCE, [action], 'fork at block 1', table, path)
+    assert load_gas_table(path)['selectors']['0xf6364846'] == {
+        'signature': 'newImmediatePayment(address,address,uint256,string)',
+        'gas': 95_000,
+        'measured_on': 'fork at block 1',
+    }
+
+    measure_gas_table(FakeWeb3(80_000), FINANCE, [action], 'fork at block 2', table, path)
+    entry = load_gas_table(path)['selectors']['0xf6364846']
+    assert (entry['gas'], entry['measured_on']) == (80_000, 'fork at block 2')
@@ -0,0 +1,81 @@
+import pytest
+
+from tooling.inprocess_evm import (
+    Event,
+    EventDict,
+    InProcessEVM,
+    VirtualMachineError,
+    reverts,
+    revert_reason,
+    to_wei,
+)
+
+
+LDO = '0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32'
+
+
+def test_to_wei():
+    assert to_wei(5) == 5
+    assert to_wei('1 ether') == 10 ** 18
+    assert to_wei('0.5 gwei') == 5 * 10 ** 8
+    assert to_wei('42') == 42
+
+
+def test_reverts_matches_the_revert_string():
+    with reverts('not permitted'):
+        raise VirtualMachineError('not permitted')
+    with reverts():
+        raise VirtualMachineError(None)
+
+    with pytest.raises(AssertionError, match='Unexpected revert string'):
+        with reverts('not permitted'):
+            raise VirtualMachineError('manager: rewards disabled')
+    with pytest.raises(AssertionError, match='did not revert'):
+        with reverts():
+            pass
+
+
+def test_revert_reason_decodes_error_string():
+    eth_abi = pytest.importorskip('eth_abi')
+    data = bytes.fromhex('08c379a0') + eth_abi.encode_single('string', 'not permitted')
+
+    assert revert_reason(Exception(data)) == 'not permitted'
+    assert revert_reason(Exception(Exception(data))) == 'not permitted'
+    assert revert_reason(Exception('not permitted')) == 'not permitted'
+    assert revert_reason(Exception(b'')) is None
+    assert revert_reason(Exception()) is None
+
+
+def test_events_by_position_and_name():
+    transfer = Event('Transfer', LDO, {'_from': 'a', '_to': 'b', '_value': 1})
+    approval = Event('Approval', LDO, {'_owner': 'a', '_spender': 'b', '_value': 2})
+    events = EventDict([transfer, approval, Event('Transfer', LDO, {'_from': 'b', '_to': 'c', '_value': 3})])
+
+    assert len(events) == 3
+    assert events[0].name == 'Transfer'
+    assert dict(events[1]) == {'_owner': 'a', '_spender': 'b', '_value': 2}
+    assert 'Approval' in events and 'Deposit' not in events
+    assert len(events['Transfer']) == 2
+    assert events['Transfer']['_value'] == 1
+    assert events['Transfer'][1]['_value'] == 3
+    with pytest.raises(KeyError):
+        events['Deposit']
+
+
+def test_accounts_and_time():
+    pytest.importorskip('eth_tester')
+    chain = InProcessEVM()
+    sender, recipient = chain.accounts[0], chain.accounts[1]
+    assert sender == sender.address.lower()
+
+    snapshot = chain.snapshot()
+    balance = recipient.balance()
+    sender.transfer(recipient, '1 ether')
+    assert recipient.balance() - balance == 10 ** 18
+
+    now = chain.time()
+    chain.sleep(3600)
+    assert chain.time() >= now + 3600
+
+    chain.revert(snapshot)
+    assert recipient.balance() == balance
@@ -0,0 +1,70 @@
+import json
+import os
+import time
+
+from tooling.parallel_build import CompileGroup, GroupResult, build, plan_groups, resolve_versions
+
+
+GROUP_SECONDS = 0.3
+
+
+def make_project(root, name, config):
+    path = root / name
+    (path / 'contracts').mkdir(parents=True)
+    (path / 'brownie-config.yaml').write_text(config)
+    (path / 'contracts' / 'Manager.vy').write_text('# @version 0.2.8\n')
+    (path / 'contracts' / 'Rewards.sol').write_text('pragma solidity 0.5.17;\n')
+    (path / 'contracts' / 'Old.sol').write_text('pragma solidity ^0.4.24;\n')
+    return str(path)
+
+
+def pragma_versions(path, language, sources):
+    versions = {}
+    for source in sources:
+        with open(os.path.join(path, source)) as f:
+            version = f.readline().split()[-1].strip(';^')
+        versions.setdefault(version, []).append(source)
+    return versions
+
+
+def sleepy_compile(group):
+    time.sleep(GROUP_SECONDS)
+    build_dir = os.path.join(group.path, 'build', 'contracts')
+    os.makedirs(build_dir, exist_ok=True)
+    names = []
+    for source in group.sources:
+        name = os.path.splitext(os.path.basename(source))[0]
+        with open(os.path.join(build_dir, f'{name}.json'), 'w') as f:
+            json.dump({'sourcePath': source, 'compiler': {'version': group.version}}, f)
+        names.append(name)
+    return GroupResult(group, names, GROUP_SECONDS)
+
+
+def test_groups_sources_by_language_and_version(tmp_path):
+    path = make_project(tmp_path, 'curve', 'networks: {}\n')
+    assert plan_groups([path], pragma_versions) == [
+        CompileGroup(path, 'Solidity', '0.4.24', ['contracts/Old.sol']),
+        CompileGroup(path, 'Solidity', '0.5.17', ['contracts/Rewards.sol']),
+        CompileGroup(path, 'Vyper', '0.2.8', ['contracts/Manager.vy']),
+    ]
+
+
+def test_pinned_versions_take_precedence(tmp_path):
+    path = make_project(tmp_path, 'sushi', 'compiler:\n  solc:\n    version: 0.5.17\n')
+    assert resolve_versions(path, 'Solidity', ['contracts/Rewards.sol', 'contracts/Old.sol']) == \
+        {'0.5.17': ['contracts/Old.sol', 'contracts/Rewards.sol']}
+
+
+def test_builds_groups_concurrently(tmp_path):
+    paths = [make_project(tmp_path, name, 'networks: {}\n') for name in ('curve', 'sushi')]
+    groups = plan_groups(paths, pragma_versions)
+
+    start = time.perf_counter()
+    results = build(groups, sleepy_compile)
+    wall_seconds = time.perf_counter() - start
+
+    assert len(results) == 6
+    assert wall_seconds < GROUP_SECONDS * len(groups) / 2
+    for path in paths:
+        assert sorted(os.listdir(os.path.join(path, 'build', 'contracts'))) == \
+            ['Manager.json', 'Old.json', 'Rewards.json']
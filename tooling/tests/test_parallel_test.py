@@ -0,0 +1,112 @@
+import json
+import time
+
+from tooling import parallel_test
+from tooling.parallel_test import CaseResult, ChainPool, Shard, format_results, parse_junit, plan_shards, run
+
+
+SHARD_SECONDS = 0.3
+
+JUNIT = '''<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="3">
+<testcase classname="tests.test_access" name="test_owner_is_deployer[deployed]" time="0.5"/>
+<testcase classname="tests.test_access" name="test_ownership_can_be_transferred[clone]" time="0.25">
+<failure message="assert False">assert False</failure></testcase>
+<testcase classname="tests.test_access" name="test_fork_only" time="0"><skipped message="no fork"/></testcase>
+</testsuite></testsuites>
+'''
+
+
+class FakeChain:
+    def __init__(self, port):
+        self.port = port
+        self.resets = 0
+
+    def start(self):
+        pass
+
+    def reset(self):
+        self.resets += 1
+
+    def stop(self):
+        pass
+
+
+def make_projects(root, modules):
+    for project, names in modules.items():
+        tests_dir = root / project / 'tests'
+        tests_dir.mkdir(parents=True)
+        (tests_dir / 'conftest.py').write_text('')
+        for name in names:
+            (tests_dir / name).write_text('')
+
+
+def test_shards_by_module_longest_first(tmp_path, monkeypatch):
+    make_projects(tmp_path, {
+        'curve': ['test_access.py', 'test_rewards.py', 'helpers.py'],
+        'sushi': ['staking_rewards_sushi_integration_test.py', 'test_access.py'],
+    })
+    monkeypatch.setattr(parallel_test, 'project_path', lambda name: str(tmp_path / name))
+
+    timings = {'curve/tests/test_access.py': 3.0, 'curve/tests/test_rewards.py': 40.0, 'sushi/tests/test_access.py': 5.0}
+    assert plan_shards(['curve', 'sushi'], timings) == [
+        Shard('sushi', 'tests/staking_rewards_sushi_integration_test.py'),
+        Shard('curve', 'tests/test_rewards.py'),
+        Shard('sushi', 'tests/test_access.py'),
+        Shard('curve', 'tests/test_access.py'),
+    ]
+
+
+def test_parses_junit_outcomes(tmp_path):
+    path = tmp_path / 'report.xml'
+    path.write_text(JUNIT)
+    assert parse_junit(str(path)) == [
+        CaseResult('tests.test_access::test_owner_is_deployer[deployed]', 'passed', 0.5),
+        CaseResult('tests.test_access::test_ownership_can_be_transferred[clone]', 'failed', 0.25),
+        CaseResult('tests.test_access::test_fork_only', 'skipped', 0.0),
+    ]
+    assert parse_junit(str(tmp_path / 'missing.xml')) == []
+
+
+def test_runs_shards_in_parallel_on_reset_chains(tmp_path):
+    shards = [Shard(project, f'tests/test_{i}.py') for project in ('curve', 'sushi') for i in range(2)]
+    networks = []
+
+    def execute(shard, network, junit_path, log):
+        networks.append(network)
+        time.sleep(SHARD_SECONDS)
+        with open(junit_path, 'w') as f:
+            f.write(JUNIT)
+        return 1
+
+    chains = [FakeChain(port) for port in (8610, 8611, 8612, 8613)]
+    start = time.perf_counter()
+    with ChainPool(chains) as pool:
+        results = run(shards, pool, str(tmp_path), execute)
+    wall_seconds = time.perf_counter() - start
+
+    assert wall_seconds < 2 * SHARD_SECONDS
+    assert sorted(result.shard for result in results) == sorted(shards)
+    assert sum(chain.resets for chain in chains) == len(shards)
+    assert sorted(networks) == [f'parallel-{port}' for port in (8610, 8611, 8612, 8613)]
+
+    report = format_results(results, wall_seconds)
+    assert 'curve/tests/test_0.py: 1 failed, 1 passed, 1 skipped in ' in report
+    assert 'FAILED curve tests.test_access::test_ownership_can_be_transferred[clone]' in report
+    assert report.splitlines()[-1].startswith('total: 4 failed, 4 passed, 4 skipped;')
+
+
+def test_reports_shards_failing_without_test_results(tmp_path):
+    with ChainPool([FakeChain(8610)]) as pool:
+        results = run([Shard('curve', 'tests/test_broken.py')], pool, str(tmp_path), lambda *args: 4)
+    report = format_results(results, 1.0)
+    assert 'ERROR curve/tests/test_broken.py exited with 4' in report
+    assert 'total: no tests;' in report
+
+
+def test_keeps_timings_of_earlier_runs(tmp_path):
+    path = str(tmp_path / 'timings.json')
+    (tmp_path / 'timings.json').write_text(json.dumps({'arcx/tests/test_rewards.py': 12.0}))
+    results = [parallel_test.ShardResult(Shard('curve', 'tests/test_access.py'), 0, 2.5, [], None)]
+    parallel_test.save_timings(results, path)
+    assert parallel_test.load_timings(path) == {'arcx/tests/test_rewards.py': 12.0, 'curve/tests/test_access.py': 2.5}
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tooling.pipeline import PipelinedTx, contract_address, create_address_preimage, send_pipelined
+
+
+SENDER = '0x6ac7ea33f8831ea9dcc53393aaa88b25a785dbf0'
+
+
+@pytest.mark.parametrize('nonce, preimage', [
+    (0, 'd694' + SENDER[2:] + '80'),
+    (1, 'd694' + SENDER[2:] + '01'),
+    (0x7f, 'd694' + SENDER[2:] + '7f'),
+    (0x80, 'd794' + SENDER[2:] + '8180'),
+    (0x1234, 'd894' + SENDER[2:] + '821234'),
+])
+def test_create_address_preimage(nonce, preimage):
+    assert create_address_preimage(SENDER, nonce).hex() == preimage
+
+
+def test_contract_address():
+    pytest.importorskip('eth_utils')
+    # well-known vectors for the sender above
+    assert contract_address(SENDER, 0) == '0xcd234A471b72ba2F1Ccf0A70FCABA648a5eeCD8d'
+    assert contract_address(SENDER, 1) == '0x343c43A37D37dfF08AE8C4A11544c718AbB4fCF8'
+
+
+class FakeEth:
+    chain_id = 1
+    block_number = 10
+
+    def __init__(self):
+        self.sent = []
+
+    def get_transaction_count(self, sender):
+        raise AssertionError('the nonce was passed in')
+
+    def send_transaction(self, params):
+        self.sent.append(params)
+        return bytes([len(self.sent)])
+
+    def wait_for_transaction_receipt(self, tx_hash, timeout):
+        return {'status': 1, 'blockNumber': 10, 'transactionHash': tx_hash}
+
+
+def test_send_pipelined_starts_at_the_given_nonce():
+    web3 = SimpleNamespace(eth=FakeEth())
+    txs = [PipelinedTx(None, '0x00', 100_000), PipelinedTx(SENDER, '0x01', 50_000)]
+
+    receipts = send_pipelined(web3, SENDER, txs, gas_price=1, nonce=7)
+
+    assert [params['nonce'] for params in web3.eth.sent] == [7, 8]
+    assert 'to' not in web3.eth.sent[0]
+    assert [r['transactionHash'] for r in receipts] == [b'\x01', b'\x02']
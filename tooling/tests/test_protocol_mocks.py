@@ -0,0 +1,57 @@
+import re
+
+import pytest
+
+from tooling.protocol_mocks import (
+    MAINNET_ADDRESSES,
+    SOURCE_PATH,
+    STAND_IN_CONTRACTS,
+    StandIns,
+    UnsupportedNode,
+    set_code,
+)
+
+
+class FakeProvider:
+    def __init__(self, supported):
+        self.supported = supported
+        self.requests = []
+
+    def make_request(self, method, params):
+        self.requests.append((method, params))
+        if method == self.supported:
+            return {'jsonrpc': '2.0', 'id': 1, 'result': True}
+        return {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32601, 'message': f'Method {method} not supported'}}
+
+
+class FakeWeb3:
+    def __init__(self, supported):
+        self.provider = FakeProvider(supported)
+
+
+def test_every_stand_in_has_a_contract():
+    with open(SOURCE_PATH) as f:
+        contracts = set(re.findall(r'^contract (\w+)', f.read(), re.MULTILINE))
+    assert set(STAND_IN_CONTRACTS) == set(MAINNET_ADDRESSES) == set(StandIns._fields)
+    assert set(STAND_IN_CONTRACTS.values()) <= contracts
+
+
+def test_addresses_are_checksummed():
+    pytest.importorskip('eth_utils')
+    from eth_utils import to_checksum_address
+
+    for address in MAINNET_ADDRESSES.values():
+        assert to_checksum_address(address) == address
+
+
+def test_set_code_uses_the_first_supported_method():
+    web3 = FakeWeb3('hardhat_setCode')
+    assert set_code(web3, MAINNET_ADDRESSES['ldo'], '0x6080') == 'hardhat_setCode'
+    assert [method for method, _ in web3.provider.requests] == ['evm_setAccountCode', 'hardhat_setCode']
+    assert web3.provider.requests[-1][1] == [MAINNET_ADDRESSES['ldo'], '0x6080']
+
+
+def test_set_code_on_a_node_without_it():
+    with pytest.raises(UnsupportedNode) as exc_info:
+        set_code(FakeWeb3(None), MAINNET_ADDRESSES['ldo'], '0x6080')
+    assert 'anvil_setCode: Method anvil_setCode not supported' in str(exc_info.value)
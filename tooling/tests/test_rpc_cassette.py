@@ -0,0 +1,152 @@
+from types import SimpleNamespace
+
+import pytest
+
+from tooling.rpc_cassette import CassetteMiss, RpcCassette, use_cassette
+
+
+LDO = '0x5A98FcBEA516Cf06857215779Fd812CA3beF1B32'
+BALANCE_OF = '0x70a08231' + '00' * 12 + LDO[2:].lower()
+
+
+class FakeProvider:
+    def __init__(self, time=1_600_000_000):
+        self.calls = []
+        self.block = 100
+        self.balance = 7
+        self.time = time
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        if method == 'eth_getBlockByNumber':
+            # mined blocks store their timestamp, so their state root differs between chains
+            timestamp = 0 if self.block == 100 else self.time
+            result = {'number': hex(self.block), 'stateRoot': f'0x{self.block:032x}{timestamp:032x}'}
+        elif method == 'eth_call':
+            result = hex(self.balance)
+        elif method == 'eth_sendTransaction':
+            self.block += 1
+            self.balance += 1
+            result = '0x' + '11' * 32
+        elif method == 'evm_increaseTime':
+            self.time += params[0]
+            result = self.time
+        else:
+            result = '0x1'
+        return {'jsonrpc': '2.0', 'id': 1, 'result': result}
+
+
+def balance_of(web3):
+    return web3.provider.make_request('eth_call', [{'to': LDO, 'data': BALANCE_OF}, 'latest'])['result']
+
+
+def test_records_and_replays_reads_in_the_same_state(tmp_path):
+    path = str(tmp_path / 'cassette.json.gz')
+    web3 = SimpleNamespace(provider=FakeProvider())
+
+    with use_cassette(web3, path, 'record') as cassette:
+        assert balance_of(web3) == '0x7'
+        assert balance_of(web3) == '0x7'
+        web3.provider.make_request('eth_sendTransaction', [{'from': LDO}])
+        assert balance_of(web3) == '0x8'
+    assert (cassette.recorded, cassette.hits) == (2, 1)
+    assert 'make_request' not in vars(web3.provider)
+
+    web3 = SimpleNamespace(provider=FakeProvider())
+    with use_cassette(web3, path, 'replay') as cassette:
+        # checksummed or not, the request is the same
+        request = [{'to': LDO.lower(), 'data': BALANCE_OF.upper().replace('0X', '0x')}, 'latest']
+        assert web3.provider.make_request('eth_call', request)['result'] == '0x7'
+        web3.provider.make_request('eth_sendTransaction', [{'from': LDO}])
+        assert balance_of(web3) == '0x8'
+    assert cassette.hits == 2
+    assert web3.provider.calls.count('eth_call') == 0
+
+
+def test_replay_fails_on_reads_not_recorded(tmp_path):
+    path = str(tmp_path / 'cassette.json')
+    web3 = SimpleNamespace(provider=FakeProvider())
+    with use_cassette(web3, path, 'record'):
+        balance_of(web3)
+
+    web3 = SimpleNamespace(provider=FakeProvider())
+    web3.provider.block = 101
+    with use_cassette(web3, path, 'replay'):
+        with pytest.raises(CassetteMiss, match='eth_call'):
+            balance_of(web3)
+        # anything else goes to the node
+        assert web3.provider.make_request('eth_chainId', [])['result'] == '0x1'
+
+
+def test_replay_needs_a_cassette(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RpcCassette.load(str(tmp_path / 'missing.json.gz'), 'replay')
+    with pytest.raises(ValueError):
+        RpcCassette('rewind')
+
+
+def test_replay_reports_a_different_start_block(tmp_path):
+    path = str(tmp_path / 'cassette.json')
+    web3 = SimpleNamespace(provider=FakeProvider())
+    with use_cassette(web3, path, 'record'):
+        balance_of(web3)
+
+    web3 = SimpleNamespace(provider=FakeProvider())
+    web3.provider.block = 99
+    with use_cassette(web3, path, 'replay'):
+        with pytest.raises(CassetteMiss, match='pin the fork block'):
+            balance_of(web3)
+
+
+def test_replay_misses_after_a_transaction_with_other_arguments(tmp_path):
+    path = str(tmp_path / 'cassette.json')
+
+    def run_tests(web3, start_date):
+        web3.provider.make_request('eth_sendTransaction', [{'from': LDO, 'data': hex(start_date)}])
+        return balance_of(web3)
+
+    web3 = SimpleNamespace(provider=FakeProvider())
+    with use_cassette(web3, path, 'record'):
+        run_tests(web3, 1_600_000_000)
+
+    web3 = SimpleNamespace(provider=FakeProvider())
+    with use_cassette(web3, path, 'replay'):
+        with pytest.raises(CassetteMiss, match='wall clock'):
+            run_tests(web3, 1_600_000_001)
+
+
+def test_round_trip_across_fresh_chains(tmp_path):
+    # the second chain runs later, so every block it mines has other timestamps
+    path = str(tmp_path / 'cassette.json.gz')
+
+    def run_tests(web3):
+        results = [balance_of(web3)]
+        web3.provider.make_request('eth_sendTransaction', [{'from': LDO}])
+        web3.provider.make_request('evm_increaseTime', [3600])
+        results.append(balance_of(web3))
+        web3.provider.make_request('eth_getTransactionReceipt', ['0x' + '11' * 32])
+        results.append(balance_of(web3))
+        return results
+
+    web3 = SimpleNamespace(provider=FakeProvider(time=1_600_000_000))
+    with use_cassette(web3, path, 'record') as cassette:
+        recorded = run_tests(web3)
+    assert cassette.recorded == 2
+
+    web3 = SimpleNamespace(provider=FakeProvider(time=1_700_000_000))
+    with use_cassette(web3, path, 'replay') as cassette:
+        assert run_tests(web3) == recorded
+    assert cassette.hits == 3
+    assert web3.provider.calls.count('eth_call') == 0
+
+
+def test_state_is_the_start_block_and_the_state_changes_since():
+    provider = FakeProvider()
+    cassette = RpcCassette('record')
+    make_request = cassette.wrap(provider.make_request)
+    for method in ('eth_call', 'eth_getCode', 'eth_blockNumber', 'eth_getBalance', 'evm_revert', 'eth_call'):
+        make_request(method, [LDO, 'latest'])
+    assert provider.calls.count('eth_getBlockByNumber') == 1
+    # the eth_call after evm_revert ran in another state
+    assert provider.calls.count('eth_call') == 2
+    assert cassette.recorded == 4
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+from tooling import setup_timing
+from tooling.setup_timing import format_comparison, load_timings, save_timings
+
+
+def report(nodeid, when, duration):
+    return SimpleNamespace(nodeid=nodeid, when=when, duration=duration)
+
+
+def test_records_setup_durations_when_enabled(tmp_path, monkeypatch):
+    path = str(tmp_path / 'timings.json')
+    monkeypatch.setattr(setup_timing, '_setup_seconds', {})
+
+    setup_timing.pytest_runtest_logreport(report('tests/test_access.py::test_owner', 'setup', 1.5))
+    assert setup_timing._setup_seconds == {}
+
+    monkeypatch.setenv('SETUP_TIMINGS', path)
+    setup_timing.pytest_runtest_logreport(report('tests/test_access.py::test_owner', 'setup', 1.5))
+    setup_timing.pytest_runtest_logreport(report('tests/test_access.py::test_owner', 'call', 0.2))
+    session = SimpleNamespace(config=SimpleNamespace(rootdir=str(tmp_path / 'projects' / 'curve')))
+    setup_timing.pytest_sessionfinish(session)
+
+    assert load_timings(path) == {'curve': {'tests/test_access.py::test_owner': 1.5}}
+
+
+def test_projects_share_a_timings_file(tmp_path):
+    path = str(tmp_path / 'timings.json')
+    save_timings(path, 'curve', {'a': 1.0})
+    save_timings(path, 'sushi', {'b': 2.0})
+    save_timings(path, 'curve', {'c': 3.0})
+    assert load_timings(path) == {'curve': {'c': 3.0}, 'sushi': {'b': 2.0}}
+
+
+def test_compares_setup_per_project():
+    before = {'arcx': {'a': 4.0, 'b': 2.0}, 'curve': {'a': 1.0}}
+    after = {'arcx': {'a': 4.0, 'b': 0.0}, '1inch': {'a': 0.5}}
+    lines = format_comparison(before, after).splitlines()
+    assert lines[1] == '1inch: only measured after'
+    assert lines[2] == 'arcx: 2 -> 2 tests, 3.000s / 3.000s / 4.00s -> 2.000s / 2.000s / 4.00s, 6.0s -> 4.0s'
+    assert lines[3] == 'curve: only measured before'
@@ -0,0 +1,127 @@
+import os
+import stat
+import threading
+import time
+from collections import namedtuple
+
+import pytest
+
+from tooling.signing_agent import AgentError, AgentSigner, InsecureAgentDirectory, serve
+
+
+Signed = namedtuple('Signed', ['rawTransaction', 'hash'])
+
+
+class FakeAccount:
+    address = '0x' + '11' * 20
+
+    def __init__(self):
+        self.signed = []
+
+    def sign_transaction(self, tx):
+        self.signed.append(tx)
+        return Signed(b'\x02' + tx['data'].encode(), b'\xaa' * 32)
+
+
+@pytest.fixture
+def agent(tmp_path):
+    # AF_UNIX paths are limited to ~100 characters
+    path = os.path.join('/tmp', f'agent-test-{os.getpid()}-{time.monotonic_ns()}', 'test.sock')
+    account = FakeAccount()
+    thread = threading.Thread(target=serve, args=(account, path, 30), daemon=True)
+    thread.start()
+    while not os.path.exists(path):
+        time.sleep(0.01)
+    yield path, account, thread
+    if thread.is_alive():
+        AgentSigner(path).stop()
+    thread.join(5)
+
+
+def test_signs_for_clients(agent):
+    path, account, _ = agent
+    signer = AgentSigner(path)
+
+    assert signer.address == account.address
+    signed = signer.sign_transaction({'nonce': 1, 'data': b'\x12\x34', 'gas': 21000})
+
+    assert account.signed == [{'nonce': 1, 'data': '0x1234', 'gas': 21000}]
+    assert signed.rawTransaction == b'\x02' + b'0x1234'
+    assert signed.hash == b'\xaa' * 32
+
+
+def test_socket_is_private(agent):
+    path, _, _ = agent
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+
+
+def test_client_refuses_a_directory_others_can_open(agent):
+    path, account, _ = agent
+    os.chmod(os.path.dirname(path), 0o755)
+    try:
+        with pytest.raises(InsecureAgentDirectory, match='mode 0700'):
+            AgentSigner(path).address
+    finally:
+        os.chmod(os.path.dirname(path), 0o700)
+    assert AgentSigner(path).address == account.address
+
+
+def test_client_refuses_a_directory_of_another_user(agent, monkeypatch):
+    path, _, _ = agent
+    uid = os.getuid()
+    monkeypatch.setattr(os, 'getuid', lambda: uid + 1)
+    with pytest.raises(InsecureAgentDirectory, match=f'uid {uid + 1}'):
+        AgentSigner(path).address
+
+
+def test_server_refuses_a_directory_others_can_open():
+    directory = os.path.join('/tmp', f'agent-test-{os.getpid()}-shared')
+    os.makedirs(directory, exist_ok=True)
+    os.chmod(directory, 0o777)
+    try:
+        with pytest.raises(InsecureAgentDirectory):
+            serve(FakeAccount(), os.path.join(directory, 'test.sock'), ttl=0.2)
+        assert not os.path.exists(os.path.join(directory, 'test.sock'))
+    finally:
+        os.rmdir(directory)
+
+
+def test_stop_removes_the_socket(agent):
+    path, _, thread = agent
+    AgentSigner(path).stop()
+    thread.join(5)
+
+    assert not os.path.exists(path)
+    with pytest.raises(AgentError, match='no signing agent'):
+        AgentSigner(path).address
+
+
+def test_expires_after_ttl(tmp_path):
+    path = os.path.join('/tmp', f'agent-test-{os.getpid()}-ttl', 'test.sock')
+    started = time.time()
+    serve(FakeAccount(), path, ttl=0.2)
+
+    assert time.time() - started < 2
+    assert not os.path.exists(path)
+
+
+def test_reports_signing_errors(agent):
+    path, _, _ = agent
+    with pytest.raises(AgentError, match='KeyError'):
+        AgentSigner(path).sign_transaction({'nonce': 1})
+
+
+def test_agent_account_is_a_brownie_account(agent, monkeypatch):
+    pytest.importorskip('brownie')
+    from brownie.network.account import Account
+    from tooling import signing_agent
+
+    path, account, _ = agent
+    monkeypatch.setattr(signing_agent, 'socket_path', lambda account_id: path if account_id == 'deployer' else path + '.none')
+
+    assert signing_agent.agent_account('nobody') is None
+    agent_account = signing_agent.agent_account('deployer')
+    assert isinstance(agent_account, Account)
+    assert agent_account.address.lower() == account.address
+    assert agent_account.signer.path == path
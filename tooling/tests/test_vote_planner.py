@@ -0,0 +1,99 @@
+import json
+from collections import namedtuple
+
+import pytest
+
+from tooling.evm_script import decode_call_script
+from tooling.gas import assert_script_fits
+from tooling.vote_planner import create_votes, plan_votes, split_actions
+
+
+FINANCE = '0xB9E5CBB9CA5b0d659238807E84D0176930753d86'
+PAYMENT = '0xf6364846'
+
+Tx = namedtuple('Tx', ['txid'])
+
+
+@pytest.fixture
+def table():
+    return {
+        'action_overhead_gas': 0,
+        'create_vote_base_gas': 0,
+        'default_action_gas': 10_000,
+        'execute_vote_base_gas': 0,
+        'selectors': {PAYMENT: {'signature': 'newImmediatePayment()', 'gas': 100_000}},
+    }
+
+
+def payments(count):
+    return [(FINANCE, PAYMENT + f'{i:064x}') for i in range(count)]
+
+
+def test_keeps_a_fitting_list_in_one_vote(table):
+    assert split_actions(payments(10), 10_000_000, table) == [(0, 10)]
+
+
+def test_splits_by_execution_gas(table):
+    assert split_actions(payments(25), 1_000_000, table) == [(0, 10), (10, 20), (20, 25)]
+
+
+def test_splits_by_script_size(table):
+    actions = [(FINANCE, '0x' + 'ff' * 2000)] * 4
+    ranges = split_actions(actions, 3_000_000, table)
+    assert ranges == [(0, 2), (2, 4)]
+
+
+def test_unmeasured_actions_do_not_split(table):
+    # mostly selectors without a measurement: at the default gas this would
+    # need two votes, but only the measured payments count against the limit
+    table['default_action_gas'] = 150_000
+    actions = [(FINANCE, '0xdeadbeef' + f'{i:064x}') for i in range(90)] + payments(10)
+    assert split_actions(actions, 12_000_000, table) == [(0, 100)]
+
+    with pytest.warns(UserWarning, match='unmeasured selectors 0xdeadbeef'):
+        plans = plan_votes(actions, 12_000_000, table)
+    assert [(plan.start, plan.end) for plan in plans] == [(0, 100)]
+    assert plans[0].estimate.execute_gas > 12_000_000
+
+
+def test_measured_gas_for_a_selector_splits(table):
+    table['default_action_gas'] = 150_000
+    table['selectors']['0xdeadbeef'] = {'signature': 'payout()', 'gas': 150_000}
+    actions = [(FINANCE, '0xdeadbeef' + f'{i:064x}') for i in range(90)] + payments(10)
+    assert split_actions(actions, 12_000_000, table) == [(0, 80), (80, 100)]
+
+
+def test_empty_list(table):
+    assert split_actions([], 1_000_000, table) == []
+
+
+def test_rejects_an_action_over_the_limit(table):
+    with pytest.raises(ValueError, match='action #1'):
+        split_actions(payments(1) + [(FINANCE, '0x' + 'ff' * 100_000)], 1_000_000, table)
+
+
+def test_plans_fit_and_preserve_order(table):
+    actions = payments(33)
+    plans = plan_votes(actions, 1_000_000, table)
+
+    decoded = []
+    for plan in plans:
+        assert_script_fits(plan.script, 1_000_000, table)
+        decoded += [bytes(calldata).hex() for _, calldata in decode_call_script(plan.script)[1]]
+    assert decoded == [calldata[2:] for _, calldata in actions]
+
+
+def test_create_votes_writes_a_manifest(table, tmp_path):
+    created = []
+
+    def create_vote(voting, token_manager, vote_desc, evm_script, tx_params):
+        created.append(vote_desc)
+        return 100 + len(created), Tx(f'0x{len(created):064x}')
+
+    manifest_path = str(tmp_path / 'manifest.json')
+    create_votes(create_vote, None, None, 'Payouts', payments(15), {}, manifest_path, 1_000_000, table)
+
+    assert created == ['Payouts (part 1 of 2)', 'Payouts (part 2 of 2)']
+    manifest = json.loads(open(manifest_path).read())
+    assert manifest['actions'] == 15
+    assert [(v['vote_id'], v['start'], v['end']) for v in manifest['votes']] == [(101, 0, 10), (102, 10, 15)]
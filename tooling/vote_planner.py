@@ -0,0 +1,146 @@
+"""
+Splitting of action lists that don't fit into a single vote.
+
+`plan_votes` packs `(to, calldata)` actions, in order, into the fewest call
+scripts whose vote creation and execution both fit into a gas budget, and
+`create_votes` starts a vote per script with a project's `create_vote`,
+writing a manifest that links each vote ID to its range of actions.
+"""
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+from tooling.evm_script import (
+    ACTION_HEADER_LENGTH,
+    EXECUTOR_ID_LENGTH,
+    encode_call_script_bytes
+)
+from tooling.gas import (
+    BLOCK_GAS_LIMIT,
+    TX_BASE_GAS,
+    assert_script_fits,
+    calldata_gas,
+    estimate_action_gas,
+    load_gas_table,
+    storage_gas
+)
+
+
+# `start` and `end` index the planned action list, `end` is exclusive
+VotePlan = namedtuple('VotePlan', ['start', 'end', 'script', 'estimate'])
+
+
+def split_actions(actions, gas_limit=BLOCK_GAS_LIMIT, table=None):
+    """
+    Returns `(start, end)` ranges of `actions` such that each range encodes to
+    a script that fits into `gas_limit`. Ranges are filled greedily in order,
+    which gives the fewest scripts for a fixed order.
+
+    As in `tooling.gas.assert_script_fits`, only measured execution gas splits
+    a range: actions whose selector is not in `table` count just their
+    overhead, and `plan_votes` warns if the default would exceed the limit.
+    Pass a `table` with the selector's gas to split on it anyway.
+    """
+    table = table or load_gas_table()
+    executor_id = encode_call_script_bytes([])
+
+    def fits(size, calldata_cost, execute_gas):
+        create_gas = table['create_vote_base_gas'] + TX_BASE_GAS + calldata_cost + storage_gas(size)
+        return create_gas <= gas_limit and execute_gas <= gas_limit
+
+    ranges = []
+    start = None
+    for index, (to, calldata) in enumerate(actions):
+        record = encode_call_script_bytes([(to, calldata)])[EXECUTOR_ID_LENGTH:]
+        record_calldata_gas = calldata_gas(record)
+        action = estimate_action_gas(to, record[ACTION_HEADER_LENGTH:], table)
+        action_gas = (action.gas if action.measured else 0) + table['action_overhead_gas']
+
+        if start is not None:
+            if fits(size + len(record), calldata_cost + record_calldata_gas, execute_gas + action_gas):
+                size += len(record)
+                calldata_cost += record_calldata_gas
+                execute_gas += action_gas
+                continue
+            ranges.append((start, index))
+
+        start = index
+        size = len(executor_id) + len(record)
+        calldata_cost = calldata_gas(executor_id) + record_calldata_gas
+        execute_gas = table['execute_vote_base_gas'] + action_gas
+        if not fits(size, calldata_cost, execute_gas):
+            raise ValueError(f'action #{index} to {to} alone exceeds the {gas_limit} gas limit')
+
+    if start is not None:
+        ranges.append((start, index + 1))
+    return ranges
+
+
+def plan_votes(actions, gas_limit=BLOCK_GAS_LIMIT, table=None):
+    table = table or load_gas_table()
+    actions = list(actions)
+    plans = []
+    for start, end in split_actions(actions, gas_limit, table):
+        script = '0x' + encode_call_script_bytes(actions[start:end]).hex()
+        plans.append(VotePlan(start, end, script, assert_script_fits(script, gas_limit, table)))
+    return plans
+
+
+def script_hash(script):
+    return hashlib.sha256(bytes.fromhex(script[2:])).hexdigest()
+
+
+def write_manifest(manifest, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def create_votes(
+    create_vote,
+    voting,
+    token_manager,
+    vote_desc,
+    actions,
+    tx_params,
+    manifest_path,
+    gas_limit=BLOCK_GAS_LIMIT,
+    table=None
+):
+    """
+    Creates one vote per planned script using a project's
+    `create_vote(voting, token_manager, vote_desc, evm_script, tx_params)`.
+
+    The manifest is rewritten after every vote, so it stays accurate if a
+    later vote fails to be created.
+    """
+    plans = plan_votes(actions, gas_limit, table)
+    manifest = {
+        'description': vote_desc,
+        'actions': plans[-1].end if plans else 0,
+        'votes': [],
+    }
+
+    for number, plan in enumerate(plans, start=1):
+        desc = vote_desc if len(plans) == 1 else f'{vote_desc} (part {number} of {len(plans)})'
+        vote_id, tx = create_vote(
+            voting=voting,
+            token_manager=token_manager,
+            vote_desc=desc,
+            evm_script=plan.script,
+            tx_params=tx_params
+        )
+        manifest['votes'].append({
+            'vote_id': int(vote_id),
+            'start': plan.start,
+            'end': plan.end,
+            'script_sha256': script_hash(plan.script),
+            'estimated_execute_gas': plan.estimate.execute_gas,
+            'tx': str(tx.txid),
+        })
+        write_manifest(manifest, manifest_path)
+
+    return manifest